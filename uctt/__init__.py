@@ -19,6 +19,7 @@ from configerus import new_config as configerus_new_config
 from configerus.config import Config
 
 from .environment import Environment
+from .registry import RegistryManifest, registry_cache_path
 
 logger = logging.getLogger('uctt')
 
@@ -146,6 +147,166 @@ def get_environment(name: str = DEFAULT_ENVIRONMENT_NAME) -> Environment:
 UCTT_BOOTSTRAP_ENTRYPOINT = 'uctt.bootstrap'
 """ SetupTools entry_point used for UCTT bootstrap """
 
+_bootstrap_entrypoints = None
+""" Process wide cache of uctt.bootstrap entry_points keyed by name """
+_bootstrap_functions = {}
+""" Process wide cache of loaded bootstrap functions keyed by name """
+_registry_manifest = None
+""" Persistent registry manifest, loaded on first use @see .registry """
+
+
+def registry_manifest() -> RegistryManifest:
+    """ Retrieve the persistent registry manifest
+
+    The manifest is loaded from disk on first use, @see .registry for details.
+
+    Returns:
+    --------
+
+    The RegistryManifest, or None if the registry cache has been disabled.
+
+    """
+    global _registry_manifest
+
+    path = registry_cache_path()
+    if not path:
+        return None
+    if _registry_manifest is None or not _registry_manifest.path == path:
+        _registry_manifest = RegistryManifest(path)
+        _registry_manifest.load()
+    return _registry_manifest
+
+
+def bootstrap_entrypoints() -> Dict[str, metadata.EntryPoint]:
+    """ Retrieve all of the uctt.bootstrap entry_points keyed by name
+
+    Scanning the installed distributions for entry_points is expensive, so the
+    scan is done once and kept for the process, and is also kept in the
+    persistent registry manifest so that later processes can skip it.  If
+    distributions are installed or removed while running, then use
+    invalidate_bootstrap_cache()
+
+    Returns:
+    --------
+
+    Dict of setuptools entry_points for UCTT bootstrapping, keyed by name
+
+    """
+    global _bootstrap_entrypoints
+
+    if _bootstrap_entrypoints is None:
+        manifest = registry_manifest()
+
+        if manifest is not None and manifest.entrypoints() is not None:
+            entrypoints = {name: metadata.EntryPoint(name=name, value=value, group=UCTT_BOOTSTRAP_ENTRYPOINT)
+                           for name, value in manifest.entrypoints().items()}
+        else:
+            logger.debug("Scanning for uctt bootstrap entrypoints")
+            eps = metadata.entry_points()
+            if hasattr(eps, 'select'):
+                eps = eps.select(group=UCTT_BOOTSTRAP_ENTRYPOINT)
+            else:
+                eps = eps.get(UCTT_BOOTSTRAP_ENTRYPOINT, [])
+
+            entrypoints = {}
+            for ep in eps:
+                # keep the first entry_point found, as the old scan did
+                entrypoints.setdefault(ep.name, ep)
+
+            if manifest is not None:
+                manifest.set_entrypoints(
+                    {name: ep.value for name, ep in entrypoints.items()})
+
+        _bootstrap_entrypoints = entrypoints
+
+    return _bootstrap_entrypoints
+
+
+def invalidate_bootstrap_cache():
+    """ Forget any cached bootstrap entry_points, so that they are rescanned
+
+    The persistent registry manifest is also reset.
+
+    """
+    global _bootstrap_entrypoints, _bootstrap_functions
+
+    _bootstrap_entrypoints = None
+    _bootstrap_functions = {}
+    if _registry_manifest is not None:
+        _registry_manifest.invalidate()
+
+
+def load_bootstraps(bootstraps: List[str] = []) -> Dict[str, Any]:
+    """ Load a number of UCTT bootstrap functions in one pass
+
+    All of the requested bootstrap ids are matched against one scan of the
+    entry_points, and then imported.  Already loaded bootstraps are re-used.
+    If any of the ids cannot be found then the entry_points are rescanned once,
+    in case something was installed since the last scan.
+
+    If the registry manifest knows that a bootstrap only registers plugin
+    factories, then the bootstrap is not imported at all.  Its factories are
+    registered as deferred factories instead, which import the module when a
+    plugin is first created. @see .registry
+
+    Parameters:
+    -----------
+
+    bootstraps (List[str]) : a list of string bootstrapper entry_points names
+        for the ucct.bootstrap entry_points.
+
+    Returns:
+    --------
+
+    Dict of loaded bootstrap functions keyed by bootstrap id, in the order
+    requested.  An id which is requested more than once is only in the Dict
+    once; bootstrap() still runs it for each time that it was requested.
+
+    Raises:
+    -------
+
+    Raises a KeyError in cases of a bootstrap ID that cannot be found.
+
+    """
+    missing = [bootstrap_id for bootstrap_id in bootstraps
+               if bootstrap_id not in bootstrap_entrypoints()]
+    if missing:
+        invalidate_bootstrap_cache()
+        for bootstrap_id in missing:
+            if bootstrap_id not in bootstrap_entrypoints():
+                raise KeyError(
+                    "Bootstrap not found {}:{}".format(
+                        UCTT_BOOTSTRAP_ENTRYPOINT,
+                        bootstrap_id))
+
+    manifest = registry_manifest()
+
+    functions = {}
+    for bootstrap_id in bootstraps:
+        if bootstrap_id not in _bootstrap_functions:
+            if manifest is not None and manifest.is_registration_only(
+                    bootstrap_id):
+                logger.debug(
+                    "Deferring registration only bootstrap: %s", bootstrap_id)
+                manifest.defer_bootstrap(bootstrap_id)
+                _bootstrap_functions[bootstrap_id] = _deferred_bootstrap
+            else:
+                ep = bootstrap_entrypoints()[bootstrap_id]
+                function = ep.load()
+                if manifest is not None:
+                    manifest.record_bootstrap(bootstrap_id, ep.value, function)
+                _bootstrap_functions[bootstrap_id] = function
+        functions[bootstrap_id] = _bootstrap_functions[bootstrap_id]
+
+    if manifest is not None:
+        manifest.save()
+    return functions
+
+
+def _deferred_bootstrap(environment: Environment):
+    """ Stand in for a registration only bootstrap which was not imported """
+    pass
+
 
 def bootstrap(environment: Environment, bootstraps=[]):
     """ BootStrap some UCTT distributions
@@ -165,6 +326,10 @@ def bootstrap(environment: Environment, bootstraps=[]):
         plugins
     2. add source/formatter/validator plugins to the passed config object.
 
+    All of the requested bootstraps are found and loaded before any of them
+    are run, and then they are run in the order requested, including any
+    repeated ids. @see load_bootstraps
+
     Parameters:
     -----------
 
@@ -190,16 +355,7 @@ def bootstrap(environment: Environment, bootstraps=[]):
     Bootstrappers themselves may raise an exception.
 
     """
+    functions = load_bootstraps(bootstraps)
     for bootstrap_id in bootstraps:
         logger.info("Running uctt bootstrap entrypoint: %s", bootstrap_id)
-        eps = metadata.entry_points()[UCTT_BOOTSTRAP_ENTRYPOINT]
-        for ep in eps:
-            if ep.name == bootstrap_id:
-                plugin = ep.load()
-                plugin(environment)
-                break
-        else:
-            raise KeyError(
-                "Bootstrap not found {}:{}".format(
-                    UCTT_BOOTSTRAP_ENTRYPOINT,
-                    bootstrap_id))
+        functions[bootstrap_id](environment)
@@ -9,6 +9,7 @@ from typing import Any
 from configerus.loaded import LOADED_KEY_ROOT
 
 from uctt.plugin import Factory, Type
+from uctt.registry import registration_only
 from uctt.environment import Environment
 
 from .provisioner import AnsibleProvisionerPlugin, ANSIBLE_PROVISIONER_CONFIG_LABEL
@@ -39,6 +40,7 @@ def uctt_ansible_factory_cli_ansible(
 """ SetupTools EntryPoint UCTT BootStrapping """
 
 
+@registration_only
 def bootstrap(environment: Environment):
     """ UCTT_Ansible bootstrap
 
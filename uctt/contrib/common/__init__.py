@@ -7,6 +7,7 @@ from typing import Dict, Any
 
 from configerus.loaded import LOADED_KEY_ROOT
 from uctt.plugin import Factory, Type
+from uctt.registry import registration_only
 from uctt.environment import Environment
 
 from .dict_output import DictOutputPlugin
@@ -50,6 +51,7 @@ def uctt_plugin_factory_provisioner_combo(
 """ SetupTools EntryPoint BootStrapping """
 
 
+@registration_only
 def bootstrap(environment: Environment):
     """ UCTT Bootstrapper - don't actually do anything """
     pass
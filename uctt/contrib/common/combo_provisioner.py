@@ -4,6 +4,9 @@ A provisioner that combines multiple provisioners
 
 """
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED, FIRST_EXCEPTION
 from typing import Dict, List, Any
 
 from configerus.loaded import LOADED_KEY_ROOT
@@ -17,10 +20,63 @@ COMBO_PROVISIONER_CONFIG_LABEL = 'provisioner'
 """ Configerus label for loading config to set up this provisioner plugin """
 COMBO_PROVISIONER_CONFIG_BACKENDS_KEY = 'backends'
 """ Config key for backends list """
+COMBO_PROVISIONER_CONFIG_CONCURRENCY_KEY = 'concurrency'
+""" Config key for how many backends can be run at the same time """
+COMBO_PROVISIONER_CONFIG_FAIL_FAST_KEY = 'fail_fast'
+""" Config key for stopping at the first backend failure """
+COMBO_PROVISIONER_CONFIG_BACKEND_INSTANCEID_KEY = 'instance_id'
+""" Backend config key for the backend provisioner fixture instance_id """
+COMBO_PROVISIONER_CONFIG_BACKEND_PRIORITY_KEY = 'priority'
+""" Backend config key for overriding the backend priority in the combo """
+COMBO_PROVISIONER_CONFIG_BACKEND_DEPENDS_ON_KEY = 'depends_on'
+""" Backend config key for a list of backend instance_ids that must be applied first """
+
+
+class ComboProvisionerError(Exception):
+    """ One or more combo provisioner backends failed """
+
+    def __init__(self, operation: str, errors: Dict[str, Exception]):
+        """
+
+        Parameters:
+        -----------
+
+        operation (str) : the provisioner operation that was run
+
+        errors (Dict[str, Exception]) : the exception raised by each backend
+            that failed, keyed by backend instance_id
+
+        """
+        self.operation = operation
+        self.errors = errors
+        """ exceptions keyed by backend instance_id """
+        super().__init__("{} combo backend(s) failed to {}: {}".format(len(errors), operation, "; ".join(
+            "[{}] {}".format(instance_id, error) for instance_id, error in errors.items())))
 
 
 class ComboProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
-    "Combo Provisioner plugin class"
+    """ Combo Provisioner plugin class
+
+    Runs provisioner operations across a list of backend provisioners, which
+    are existing provisioner fixtures:
+
+    ```
+    backends:
+    - instance_id: network
+      priority: 60
+    - instance_id: cluster
+      depends_on:
+      - network
+    concurrency: 4
+    fail_fast: true
+    ```
+
+    Backends are grouped in waves, each backend in the wave after its last
+    dependency.  Waves are applied in order, and destroyed in reverse order.
+    With concurrency above 1, the backends in a wave run at the same time,
+    otherwise they run one at a time from low to high priority.
+
+    """
 
     def __init__(self, environment, instance_id,
                  label: str = COMBO_PROVISIONER_CONFIG_LABEL, base: Any = LOADED_KEY_ROOT):
@@ -47,24 +103,207 @@ class ComboProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
             raise ValueError(
                 "Combo provisioner could not understand the backend list.")
 
+        self.concurrency = self.combo_config.get(
+            [base, COMBO_PROVISIONER_CONFIG_CONCURRENCY_KEY], exception_if_missing=False)
+        """ how many backends can run at the same time """
+        if not self.concurrency:
+            self.concurrency = 1
+        self.fail_fast = self.combo_config.get(
+            [base, COMBO_PROVISIONER_CONFIG_FAIL_FAST_KEY], exception_if_missing=False)
+        """ stop at the first failure, or run every backend that can run """
+        if self.fail_fast is None:
+            self.fail_fast = True
+
+        self.dependencies = {}
+        """ backend instance_ids that each backend depends on """
         for backend in self.backends:
-            backend_instance_id = backend['instance_id']
+            backend_instance_id = backend[COMBO_PROVISIONER_CONFIG_BACKEND_INSTANCEID_KEY]
             fixture = self.environment.fixtures.get_fixture(
                 type=Type.PROVISIONER, instance_id=backend_instance_id)
 
-            if hasattr(backend, "priority"):
-                fixture.priority = backend['priority']
+            if COMBO_PROVISIONER_CONFIG_BACKEND_PRIORITY_KEY in backend:
+                # Don't change the environment fixture, as that would break
+                # its sorting, but add a combo fixture for the same plugin.
+                fixture = Fixture(
+                    plugin=None,
+                    type=fixture.type,
+                    plugin_id=fixture.plugin_id,
+                    instance_id=fixture.instance_id,
+                    priority=backend[COMBO_PROVISIONER_CONFIG_BACKEND_PRIORITY_KEY],
+                    plugin_builder=lambda fixture=fixture: fixture.plugin)
 
             self.fixtures.add_fixture(fixture)
+            self.dependencies[backend_instance_id] = list(
+                backend.get(COMBO_PROVISIONER_CONFIG_BACKEND_DEPENDS_ON_KEY, []))
+
+        self._ordered_backends = {
+            False: self._order_backend_fixtures(high_to_low=False),
+            True: self._order_backend_fixtures(high_to_low=True)}
+        """ backend fixture lists in both priority orders """
+        self._fixtures_version = self.fixtures.version
+        """ backend set version that the ordered lists were made from """
+
+        self._view_lock = threading.Lock()
+        self._view_state = None
+        """ backend fixture sets and versions that the merged view was made from """
+        self._view_fixtures = None
+        """ merged Fixtures from all of the backends """
+        self._view_lookups = {}
+        """ get_fixture results keyed by (type, plugin_id, instance_id) """
+
+        self.waves = self._backend_waves()
+        """ lists of backend fixtures which can run together, in apply order """
+        self.timings = {}
+        """ seconds taken by each backend for each operation """
+
+    def _backend_waves(self) -> List[List[Fixture]]:
+        """ group the backends into waves which can run concurrently
+
+        Each backend is in the wave after the last of its dependencies, so
+        backends without dependencies are in the first wave.  Inside a wave
+        backends are ordered from low to high priority.
+
+        Raises:
+        -------
+
+        ValueError if a backend depends on an unknown backend or if the
+        dependencies are circular.
+
+        """
+        for instance_id, depends_on in self.dependencies.items():
+            for dependency in depends_on:
+                if dependency not in self.dependencies:
+                    raise ValueError("Combo backend '{}' depends on unknown backend '{}'".format(
+                        instance_id, dependency))
+
+        levels = {}
+        """ wave index for each backend instance_id """
+        remaining = dict(self.dependencies)
+        while remaining:
+            ready = [instance_id for instance_id, depends_on in remaining.items() if all(
+                dependency in levels for dependency in depends_on)]
+            if not ready:
+                raise ValueError("Combo backends have circular dependencies: {}".format(
+                    ", ".join(remaining.keys())))
+            for instance_id in ready:
+                levels[instance_id] = max(
+                    [levels[dependency] + 1 for dependency in remaining.pop(instance_id)] + [0])
+
+        waves = [[] for index in range(max(levels.values()) + 1)] if levels else []
+        for fixture in self._get_ordered_backend_fixtures():
+            waves[levels[fixture.instance_id]].append(fixture)
+        return waves
 
     def _get_ordered_backend_fixtures(self, high_to_low: bool = False):
         """ helper to get the sorted backend fixtures from lowest priority to highest, reversed if requested """
+        if self.fixtures.version != self._fixtures_version:
+            self._ordered_backends = {
+                False: self._order_backend_fixtures(high_to_low=False),
+                True: self._order_backend_fixtures(high_to_low=True)}
+            self._fixtures_version = self.fixtures.version
+        return list(self._ordered_backends[high_to_low])
+
+    def _order_backend_fixtures(self, high_to_low: bool = False):
+        """ sort the backend fixtures @see _get_ordered_backend_fixtures """
         backend_fixtures = self.fixtures.get_fixtures(
             type=Type.PROVISIONER).to_list()
         if not high_to_low:
-            backend_fixtures.reverse
+            # stable sort, so equal priorities stay in declaration order
+            backend_fixtures.sort(key=lambda fixture: fixture.priority)
         return backend_fixtures
 
+    def _run_backends(self, operation: str, reverse: bool = False):
+        """ run a provisioner operation on all of the backends, wave by wave
+
+        Backends in a wave run concurrently, up to the combo concurrency.  With
+        fail_fast, no new backends are started after a failure; otherwise every
+        backend whose dependencies succeeded is run.
+
+        Parameters:
+        -----------
+
+        operation (str) : provisioner method to run on each backend
+
+        reverse (bool) : run the waves in reverse, from high to low priority,
+            so that dependent backends go first (for destroy)
+
+        Raises:
+        -------
+
+        ComboProvisionerError with the exception for each failed backend
+
+        """
+        if reverse:
+            waves = [list(reversed(wave)) for wave in reversed(self.waves)]
+        else:
+            waves = self.waves
+
+        errors = {}
+        """ exceptions for failed backends keyed by instance_id """
+        skipped = set()
+        """ backends that were not run because something they need failed """
+
+        def run(fixture: Fixture):
+            logger.info("--> running backend {}: {}".format(
+                operation, fixture.instance_id))
+            start = time.perf_counter()
+            try:
+                getattr(fixture.plugin, operation)()
+            finally:
+                duration = time.perf_counter() - start
+                self.timings.setdefault(fixture.instance_id, {})[
+                    operation] = duration
+                logger.info("<-- backend {} {} took {:.1f}s".format(
+                    operation, fixture.instance_id, duration))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+            for wave in waves:
+                runnable = []
+                for fixture in wave:
+                    if reverse:
+                        # on the way down, wait for the backends that depend
+                        # on us
+                        blockers = [instance_id for instance_id, depends_on in self.dependencies.items()
+                                    if fixture.instance_id in depends_on]
+                    else:
+                        blockers = self.dependencies[fixture.instance_id]
+                    if any(blocker in errors or blocker in skipped for blocker in blockers):
+                        logger.warning("skipping backend {} {} as a backend it needs failed".format(
+                            operation, fixture.instance_id))
+                        skipped.add(fixture.instance_id)
+                    else:
+                        runnable.append(fixture)
+
+                if self.concurrency <= 1:
+                    for fixture in runnable:
+                        try:
+                            run(fixture)
+                        except Exception as e:
+                            errors[fixture.instance_id] = e
+                            if self.fail_fast:
+                                break
+                else:
+                    futures = {executor.submit(
+                        run, fixture): fixture for fixture in runnable}
+                    done, not_done = wait(futures.keys(), return_when=(
+                        FIRST_EXCEPTION if self.fail_fast else ALL_COMPLETED))
+                    if not_done:
+                        # fail fast: let running backends finish, but don't
+                        # start any more
+                        for future in not_done:
+                            future.cancel()
+                        wait(not_done)
+                    for future, fixture in futures.items():
+                        if not future.cancelled() and future.exception() is not None:
+                            errors[fixture.instance_id] = future.exception()
+
+                if errors and self.fail_fast:
+                    break
+
+        if errors:
+            raise ComboProvisionerError(
+                operation, errors) from next(iter(errors.values()))
+
     def info(self):
         """ return structured data about self. """
 
@@ -88,63 +327,110 @@ class ComboProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
             backends_info.append(backend_info)
 
         return {
-            'backends': backends_info
+            'backends': backends_info,
+            'waves': [[fixture.instance_id for fixture in wave] for wave in self.waves],
+            'timings': self.timings
         }
 
     def prepare(self, label: str = '', base: str = ''):
         """ Prepare the provisioner to apply resources """
-        for backend_fixture in self._get_ordered_backend_fixtures():
-            logger.info(
-                "--> running backend prepare: [Low->High] {}".format(backend_fixture.instance_id))
-            backend_fixture.plugin.prepare()
+        self._run_backends('prepare')
 
     def apply(self):
         """ bring a cluster to the configured state """
-        for backend_fixture in self._get_ordered_backend_fixtures():
-            logger.info(
-                "--> running backend apply: [Low->High] {}".format(backend_fixture.instance_id))
-            backend_fixture.plugin.apply()
+        self._run_backends('apply')
 
     def destroy(self):
         """ remove all resources created for the cluster """
-        for backend_fixture in self._get_ordered_backend_fixtures(
-                high_to_low=True):
-            logger.info(
-                "--> running backend destroy: [High->Low] {}".format(backend_fixture.instance_id))
-            backend_fixture.plugin.destroy()
+        self._run_backends('destroy', reverse=True)
 
     """ Fixture management """
 
+    def _backend_view_state(self):
+        """ identify the current state of the backend fixture sets
+
+        Returns:
+        --------
+
+        A list of (Fixtures, version) for the backends which hold fixtures, or
+        None if a backend has fixtures that we can't track, in which case the
+        merged view can't be kept.
+
+        """
+        state = []
+        for backend_fixture in self._get_ordered_backend_fixtures():
+            plugin = backend_fixture.plugin
+            if not hasattr(plugin, 'get_fixtures'):
+                continue
+            fixtures = getattr(plugin, 'fixtures', None)
+            if not isinstance(fixtures, Fixtures):
+                return None
+            state.append((fixtures, fixtures.version))
+        return state
+
+    def _merged_view(self) -> Fixtures:
+        """ Return the merged backend Fixtures, rebuilding it if needed
+
+        The merged view is kept until a backend fixture set changes, either by
+        having fixtures added or by the backend replacing its set (as the
+        terraform provisioner does on destroy).  Cached get_fixture() results
+        are kept with the view.
+
+        """
+        state = self._backend_view_state()
+        with self._view_lock:
+            if state is None or self._view_state is None or len(state) != len(self._view_state) or any(
+                    fixtures is not view_fixtures or version != view_version
+                    for (fixtures, version), (view_fixtures, view_version) in zip(state, self._view_state)):
+                merged = Fixtures()
+                for backend_fixture in self._get_ordered_backend_fixtures():
+                    plugin = backend_fixture.plugin
+                    if hasattr(plugin, 'get_fixtures'):
+                        merged.merge_fixtures(plugin.get_fixtures())
+                self._view_fixtures = merged
+                self._view_lookups = {}
+                self._view_state = state
+            return self._view_fixtures
+
     def get_fixtures(self, type: Type = None, instance_id: str = '',
                      plugin_id: str = '') -> Fixtures:
         """ retrieve any matching fixtures from any of the backends """
-        matches = Fixtures()
-        for backend_fixture in self._get_ordered_backend_fixtures():
-            plugin = backend_fixture.plugin
-            if hasattr(plugin, 'get_fixtures'):
-                for match in plugin.get_fixtures(
-                        type=type, plugin_id=plugin_id, instance_id=instance_id).to_list():
-                    matches.add_fixture(match)
-        return matches
+        return self._merged_view().get_fixtures(
+            type=type, plugin_id=plugin_id, instance_id=instance_id)
 
     def get_fixture(self, type: Type = None, instance_id: str = '',
                     plugin_id: str = '', exception_if_missing: bool = True) -> Fixture:
         """ retrieve the first matching fixture fomr backend in high-to-low order """
-
-        for backend_fixture in self._get_ordered_backend_fixtures(
-                high_to_low=True):
-            plugin = backend_fixture.plugin
-            if hasattr(plugin, 'get_fixture'):
-                fixture = plugin.get_fixture(
-                    type=type,
-                    plugin_id=plugin_id,
-                    instance_id=instance_id,
-                    exception_if_missing=exception_if_missing)
-                if fixture is not None:
-                    return fixture
-
-        if exception_if_missing:
+        self._merged_view()
+        key = (type, plugin_id, instance_id)
+        """ lookup cache key, the results are reset with the merged view """
+
+        with self._view_lock:
+            # a rebuilt view gets a new lookups dict, so we keep using this
+            # one, and a result from before a rebuild never lands in the new
+            lookups = self._view_lookups
+            cached = key in lookups
+            fixture = lookups.get(key)
+
+        if not cached:
+            fixture = None
+            for backend_fixture in self._get_ordered_backend_fixtures(
+                    high_to_low=True):
+                plugin = backend_fixture.plugin
+                if hasattr(plugin, 'get_fixture'):
+                    fixture = plugin.get_fixture(
+                        type=type,
+                        plugin_id=plugin_id,
+                        instance_id=instance_id,
+                        exception_if_missing=False)
+                    if fixture is not None:
+                        break
+            with self._view_lock:
+                lookups[key] = fixture
+
+        if fixture is None and exception_if_missing:
             raise KeyError("No matching fixture was found")
+        return fixture
 
     def get_plugin(self, type: Type = None, plugin_id: str = '',
                    instance_id: str = '', exception_if_missing: bool = True) -> UCTTPlugin:
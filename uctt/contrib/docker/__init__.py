@@ -5,14 +5,18 @@ MTT Docker
 MTT contrib package for docker functionality, specifically for registering
 a Docker client plugin.
 
+The docker SDK is only imported when a docker client plugin is first created,
+so registering the plugins here stays cheap.  The DockerClientPlugin class is
+still available from this package, but it is imported on first access.
+
 """
 
 from typing import Any
 
 from uctt.plugin import Factory, Type
+from uctt.registry import registration_only
 from uctt.environment import Environment
 
-from .client import DockerClientPlugin
 from .run_workload import DockerRunWorkloadPlugin, DOCKER_RUN_WORKLOAD_CONFIG_LABEL, DOCKER_RUN_WORKLOAD_CONFIG_BASE
 
 UCTT_PLUGIN_ID_DOCKER_CLIENT = 'uctt_docker'
@@ -22,10 +26,17 @@ UCTT_PLUGIN_ID_DOCKER_CLIENT = 'uctt_docker'
 @Factory(type=Type.CLIENT, plugin_id=UCTT_PLUGIN_ID_DOCKER_CLIENT)
 def uctt_plugin_factory_client_docker(
     environment: Environment, instance_id: str = '', host: str = '', cert_path: str = '', tls_verify: bool = True,
-        compose_tls_version: str = 'TLSv1_2', version: str = 'auto'):
-    """ create an mtt client dict plugin """
+        compose_tls_version: str = 'TLSv1_2', version: str = 'auto', pool_size: int = 10, shared: bool = True):
+    """ create an mtt client dict plugin
+
+    Clients share a process wide pool of docker api clients unless shared is
+    False.  Pass a concrete api version to skip version negotiation.
+
+    """
+    from .client import DockerClientPlugin
     return DockerClientPlugin(environment, instance_id=instance_id,
-                              host=host, cert_path=cert_path, tls_verify=tls_verify, compose_tls_version=compose_tls_version, version=version)
+                              host=host, cert_path=cert_path, tls_verify=tls_verify, compose_tls_version=compose_tls_version, version=version,
+                              pool_size=pool_size, shared=shared)
 
 
 UCTT_PLUGIN_ID_DOCKER_RUN_WORKLOAD = 'uctt_docker_run'
@@ -40,9 +51,19 @@ def uctt_plugin_factory_workload_docker_run(
         environment, instance_id, label=label, base=base)
 
 
+def __getattr__(name: str):
+    """ Import the docker SDK dependent client class only when it is asked for """
+    if name == 'DockerClientPlugin':
+        from .client import DockerClientPlugin
+        return DockerClientPlugin
+    raise AttributeError(
+        "module '{}' has no attribute '{}'".format(__name__, name))
+
+
 """ SetupTools EntryPoint UCTT BootStrapping """
 
 
+@registration_only
 def bootstrap(environment: Environment):
     """ UCTT_Docker bootstrap
 
@@ -1,11 +1,106 @@
 
 from uctt.client import ClientBase
-from docker import DockerClient
+from docker import DockerClient, APIClient
+from docker.constants import DEFAULT_MAX_POOL_SIZE
+from typing import Dict, Tuple
 import logging
 import os
+import threading
 
 logger = logging.getLogger('uctt.contrib.docker.client')
 
+DOCKER_API_VERSION_AUTO = 'auto'
+""" docker api version value which asks the client to negotiate with the daemon """
+
+_api_clients: Dict[Tuple[str, str, str, str], APIClient] = {}
+""" process wide pool of docker api clients, keyed on the connection args """
+_api_clients_lock = threading.Lock()
+""" guards the api client pool; clients are created outside of it """
+
+
+def _new_api_client(host: str, cert_path: str, tls_verify: str, version: str,
+                    compose_tls_version: str, pool_size: int) -> APIClient:
+    """ Create a docker APIClient from docker ENV variables
+
+    We create a throwaway DockerClient, which also picks up any other docker
+    env variables that are in scope, and keep its api client.
+
+    """
+    env = os.environ.copy()
+    env['DOCKER_HOST'] = host
+    env['DOCKER_CERT_PATH'] = cert_path
+    env['DOCKER_TLS_VERIFY'] = tls_verify
+    env['COMPOSE_TLS_VERSION'] = compose_tls_version
+
+    throwaway = DockerClient.from_env(
+        environment=env, version=version, max_pool_size=pool_size)
+    return throwaway.api
+
+
+def shared_api_client(host: str, cert_path: str, tls_verify: str, version: str,
+                      compose_tls_version: str = 'TLSv1_2', pool_size: int = DEFAULT_MAX_POOL_SIZE) -> APIClient:
+    """ Get a docker APIClient from the process wide pool, creating it if needed
+
+    Clients are keyed on (host, cert_path, tls_verify, version) so all plugins
+    which point at the same daemon share one HTTP adapter/connection pool, and
+    api version negotiation only runs once per daemon.
+
+    Parameters:
+    -----------
+
+    host, cert_path, tls_verify, compose_tls_version (str) : converted to the
+        related docker ENV variables, as with DockerClient.from_env
+
+    version (str) : docker api version.  "auto" negotiates the version with the
+        daemon; any other value pins it and skips the negotiation request.
+
+    pool_size (int) : max number of connections kept in the client HTTP pool.
+        The size is decided by the first plugin that creates the client for a
+        key; later requests for a different size only log a warning.
+
+    Clients are created without holding the pool lock, as version negotiation
+    makes a request to the daemon, so that a slow daemon doesn't hold up
+    clients for other daemons.  If two threads create a client for the same
+    key at once, then the first one into the pool is kept and the other closed.
+
+    Returns:
+    --------
+
+    A shared docker APIClient
+
+    """
+    key = (host, cert_path, tls_verify, version)
+
+    with _api_clients_lock:
+        api = _api_clients.get(key)
+
+    if api is None:
+        logger.debug(
+            "Creating pooled docker api client for host:%s (version:%s, pool size:%s)", host, version, pool_size)
+        created = _new_api_client(host=host, cert_path=cert_path, tls_verify=tls_verify,
+                                  version=version, compose_tls_version=compose_tls_version, pool_size=pool_size)
+        created._uctt_pool_size = pool_size
+        with _api_clients_lock:
+            api = _api_clients.setdefault(key, created)
+        if api is created:
+            return api
+        # another thread pooled a client for this key first
+        created.close()
+
+    if getattr(api, '_uctt_pool_size', pool_size) != pool_size:
+        logger.warning(
+            "Pooled docker api client for host:%s already exists with pool size %s; ignoring requested size %s",
+            host, api._uctt_pool_size, pool_size)
+    return api
+
+
+def close_api_clients():
+    """ Close and forget all pooled docker api clients """
+    with _api_clients_lock:
+        for api in _api_clients.values():
+            api.close()
+        _api_clients.clear()
+
 
 class DockerClientPlugin(ClientBase, DockerClient):
     """ MTT Client plugin for docker
@@ -15,7 +110,8 @@ class DockerClientPlugin(ClientBase, DockerClient):
     """
 
     def __init__(self, environment, instance_id, host: str, cert_path: str, tls_verify: bool = True,
-                 compose_tls_version: str = 'TLSv1_2', version: str = 'auto'):
+                 compose_tls_version: str = 'TLSv1_2', version: str = DOCKER_API_VERSION_AUTO,
+                 pool_size: int = DEFAULT_MAX_POOL_SIZE, shared: bool = True):
         """ Run the super constructor but also set class properties
 
         In order to decorate this existing class as a DockerClient, without using the
@@ -27,6 +123,9 @@ class DockerClientPlugin(ClientBase, DockerClient):
         This also lets us easily include any other env variables that might be in
         scope.
 
+        By default the ApiClient comes from a process wide pool, so plugins which
+        point at the same daemon share connections.
+
         Parameters:
         -----------
 
@@ -39,7 +138,11 @@ class DockerClientPlugin(ClientBase, DockerClient):
         tls_verify (bool) [DOCKER_TLS_VERIFY] should the client pursue TLS verification
         compose_tls_version (str) [COMPOSE_TLS_VERSION] what TLS version should
             the Docker client use for docker compose.
-
+        version (str) docker api version to use.  Pin a version (e.g. "1.41")
+            to skip the version negotiation with the daemon.
+        pool_size (int) max number of HTTP connections kept to the daemon
+        shared (bool) use the process wide api client pool.  If False then
+            this plugin gets its own api client.
 
         """
         super(ClientBase, self).__init__(environment, instance_id)
@@ -51,15 +154,22 @@ class DockerClientPlugin(ClientBase, DockerClient):
         self.cert_path = cert_path
         self.tls_verify = '1' if tls_verify else '0'
         self.compose_tls_version = compose_tls_version
-
-        env = os.environ.copy()
-        env['DOCKER_HOST'] = self.host
-        env['DOCKER_CERT_PATH'] = self.cert_path
-        env['DOCKER_TLS_VERIFY'] = self.tls_verify
-        env['COMPOSE_TLS_VERSION'] = self.compose_tls_version
-
-        throwaway = DockerClient.from_env(environment=env, version=version)
-        self.api = throwaway.api
+        self.api_version_pin = version
+        """ requested docker api version, kept apart from the DockerClient.version() method """
+        self.pool_size = pool_size
+        self.shared = shared
+
+        if shared:
+            self.api = shared_api_client(host=self.host, cert_path=self.cert_path, tls_verify=self.tls_verify,
+                                         version=self.api_version_pin, compose_tls_version=self.compose_tls_version, pool_size=self.pool_size)
+        else:
+            self.api = _new_api_client(host=self.host, cert_path=self.cert_path, tls_verify=self.tls_verify,
+                                       version=self.api_version_pin, compose_tls_version=self.compose_tls_version, pool_size=self.pool_size)
+
+    def close(self):
+        """ Close the api client, unless it is shared with other plugins """
+        if not self.shared:
+            self.api.close()
 
     def info(self):
         """ Return dict data about this plugin for introspection """
@@ -68,6 +178,10 @@ class DockerClientPlugin(ClientBase, DockerClient):
                 'host': self.host,
                 'cert_path': self.cert_path,
                 'tls_verify': self.tls_verify,
-                'compose_tls_version': self.compose_tls_version
+                'compose_tls_version': self.compose_tls_version,
+                'version': self.api_version_pin,
+                'api_version': self.api.api_version,
+                'pool_size': self.pool_size,
+                'shared': self.shared
             }
         }
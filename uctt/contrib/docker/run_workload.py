@@ -3,13 +3,20 @@
 Docker workloads plugin
 
 """
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Iterator, AsyncIterator, Tuple
+import asyncio
+import collections
+import inspect
 import logging
+import threading
+import time
 
 from uctt.plugin import Type
 from uctt.environment import Environment
-from uctt.fixtures import Fixtures
+from uctt.fixtures import Fixtures, Fixture, UCCTFixturesPlugin
 from uctt.workload import WorkloadBase
+from uctt.contrib.common import UCTT_PLUGIN_ID_OUTPUT_DICT
 
 logger = logging.getLogger('uctt.contrib.docker.workload.run')
 
@@ -17,10 +24,220 @@ DOCKER_RUN_WORKLOAD_CONFIG_LABEL = 'docker'
 """ Configerus label for retrieving docker run workloads """
 DOCKER_RUN_WORKLOAD_CONFIG_BASE = 'workload.run'
 """ Configerus get base for retrieving the default run workload """
+DOCKER_RUN_WORKLOAD_CONFIG_RUN_KEY = 'run'
+""" Config key for the containers.run() arguments """
+DOCKER_RUN_WORKLOAD_CONFIG_REPLICAS_KEY = 'replicas'
+""" Config key for how many containers to run """
+DOCKER_RUN_WORKLOAD_CONFIG_CONCURRENCY_KEY = 'concurrency'
+""" Config key for how many containers can be launched/removed at the same time """
+DOCKER_RUN_WORKLOAD_DEFAULT_CONCURRENCY = 8
+""" Default launch concurrency, kept below the default docker client pool size """
+DOCKER_RUN_WORKLOAD_CONFIG_RETENTION_KEY = 'retention'
+""" Config key for how many log lines and stats samples to keep per container """
+DOCKER_RUN_WORKLOAD_CONFIG_EXPORT_STATS_KEY = 'export_stats'
+""" Config key for exporting stats samples to a dict output fixture when a stats stream ends """
+DOCKER_RUN_WORKLOAD_CONFIG_EXPORT_INTERVAL_KEY = 'export_interval'
+""" Config key for also exporting stats every N seconds while a stats stream runs """
+DOCKER_RUN_WORKLOAD_CONFIG_IMAGES_KEY = 'images'
+""" Config key for a list of additional images for prepare() to pull """
+DOCKER_RUN_WORKLOAD_CONFIG_DIGESTS_KEY = 'digests'
+""" Config key for a Dict of expected repo digests by image """
+DOCKER_RUN_WORKLOAD_CONFIG_PULL_KEY = 'pull'
+""" Config key for the prepare() pull policy """
+DOCKER_RUN_WORKLOAD_PULL_MISSING = 'missing'
+""" pull policy: only pull images which are not already on the daemon """
+DOCKER_RUN_WORKLOAD_PULL_ALWAYS = 'always'
+""" pull policy: always pull images, to pick up tag changes """
+DOCKER_RUN_WORKLOAD_STATS_OUTPUT_SUFFIX = 'stats'
+""" instance_id suffix for the stats dict output fixture """
 
 
-class DockerRunWorkloadPlugin(WorkloadBase):
-    """ Docker Run workload class """
+def stats_sample(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """ Reduce a docker stats api result to CPU/memory/IO numbers
+
+    CPU percent is calculated the same way that the docker cli does it, from
+    the difference to the previous read, which the daemon includes in each
+    stats result.
+
+    Parameters:
+    -----------
+
+    stats (Dict) : decoded docker container stats result
+
+    Returns:
+    --------
+
+    Dict of sample values
+
+    """
+    cpu_stats = stats.get('cpu_stats', {})
+    precpu_stats = stats.get('precpu_stats', {})
+    cpu_delta = cpu_stats.get('cpu_usage', {}).get(
+        'total_usage', 0) - precpu_stats.get('cpu_usage', {}).get('total_usage', 0)
+    system_delta = cpu_stats.get(
+        'system_cpu_usage', 0) - precpu_stats.get('system_cpu_usage', 0)
+    online_cpus = cpu_stats.get('online_cpus') or len(
+        cpu_stats.get('cpu_usage', {}).get('percpu_usage') or []) or 1
+    cpu_percent = 0.0
+    if cpu_delta > 0 and system_delta > 0:
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100.0
+
+    memory_stats = stats.get('memory_stats', {})
+    memory_cache = memory_stats.get('stats', {}).get(
+        'inactive_file', memory_stats.get('stats', {}).get('cache', 0))
+    memory_usage = memory_stats.get('usage', 0) - memory_cache
+    memory_limit = memory_stats.get('limit', 0)
+
+    io_read = io_write = 0
+    for io in (stats.get('blkio_stats', {}).get('io_service_bytes_recursive') or []):
+        if io.get('op', '').lower() == 'read':
+            io_read += io.get('value', 0)
+        elif io.get('op', '').lower() == 'write':
+            io_write += io.get('value', 0)
+
+    networks = (stats.get('networks') or {}).values()
+
+    return {
+        'read': stats.get('read', ''),
+        'cpu_percent': cpu_percent,
+        'memory_usage': memory_usage,
+        'memory_limit': memory_limit,
+        'memory_percent': memory_usage / memory_limit * 100.0 if memory_limit else 0.0,
+        'io_read_bytes': io_read,
+        'io_write_bytes': io_write,
+        'net_rx_bytes': sum(network.get('rx_bytes', 0) for network in networks),
+        'net_tx_bytes': sum(network.get('tx_bytes', 0) for network in networks)
+    }
+
+
+def image_repository_tag(image_name: str) -> Tuple[str, str]:
+    """ Split an image name into a repository and a tag (or digest) to pull
+
+    Untagged names get the "latest" tag, because pulling a repository without
+    a tag can pull every tag of it.  A registry port is not a tag.
+
+    Returns:
+    --------
+
+    (repository, tag) tuple, where tag may be a "sha256:..." digest
+
+    """
+    if '@' in image_name:
+        repository, digest = image_name.split('@', 1)
+        return repository, digest
+    repository, separator, tag = image_name.rpartition(':')
+    if separator and '/' not in tag:
+        return repository, tag
+    return image_name, 'latest'
+
+
+def _stream_closer(stream: Any) -> Callable:
+    """ get a function which closes a docker stream from another thread
+
+    Docker log streams (CancellableStream) can be closed while a read is
+    blocked, which ends the read.  Plain generators (e.g. stats streams)
+    can't be closed while they run, so for them we return None.
+
+    """
+    if inspect.isgenerator(stream) or not hasattr(stream, 'close'):
+        return None
+    return stream.close
+
+
+async def _async_iterate(iterator: Iterator,
+                         cancel: Callable = None) -> AsyncIterator:
+    """ iterate a blocking iterator from a worker thread, without blocking the loop
+
+    If the consumer is cancelled while a read is pending in the thread, then
+    cancel() is called to close the underlying stream, and we wait for the
+    read to return before closing the iterator, as a running generator can't
+    be closed.  Without cancel(), the wait lasts until the next item arrives.
+
+    """
+    done = object()
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = None
+    try:
+        while True:
+            pending = executor.submit(next, iterator, done)
+            item = await asyncio.wrap_future(pending)
+            pending = None
+            if item is done:
+                break
+            yield item
+    finally:
+        if pending is not None:
+            if cancel is not None and not pending.done():
+                cancel()
+            try:
+                await asyncio.wrap_future(pending)
+            except BaseException:
+                # the read failing on a closed stream, or another cancel;
+                # whatever ended the iteration is still raised after this
+                pass
+        if (pending is None or pending.done()) and hasattr(iterator, 'close'):
+            iterator.close()
+        executor.shutdown(wait=False)
+
+
+class DockerRunWorkloadError(Exception):
+    """ One or more workload containers failed to run or be removed """
+
+    def __init__(self, operation: str, errors: Dict[int, Exception]):
+        """
+
+        Parameters:
+        -----------
+
+        operation (str) : the workload operation that was run
+
+        errors (Dict[Any, Exception]) : the exception raised for each replica
+            that failed, keyed by replica index (or by image for pulls)
+
+        """
+        self.operation = operation
+        self.errors = errors
+        """ exceptions keyed by replica index or image """
+        super().__init__("{} docker container(s) failed to {}: {}".format(len(errors), operation, "; ".join(
+            "[{}] {}".format(index, error) for index, error in errors.items())))
+
+
+class DockerRunWorkloadPlugin(WorkloadBase, UCCTFixturesPlugin):
+    """ Docker Run workload class
+
+    Config for the workload is:
+
+    ```
+    workload:
+      run:
+        run:
+          image: nginx
+          detach: true
+        replicas: 10
+        concurrency: 8
+        retention: 100
+        export_stats: true
+        export_interval: 10
+        images:
+        - busybox:latest
+        digests:
+          nginx: sha256:...
+        pull: missing
+    ```
+
+    `run` is passed to the docker client containers.run().  If `replicas` is
+    set, that many containers are run, up to `concurrency` at a time.
+
+    Running containers can be observed with the logs() and stats() streams
+    (or their async equivalents).  With `retention`, the last log lines and
+    stats samples are kept per container.  With `export_stats`, the stats
+    samples are exported to a dict output fixture on this plugin when a stats
+    stream ends, and every `export_interval` seconds if that is set.
+
+    prepare() pulls the run image and any other `images` ahead of apply(), so
+    that apply() doesn't pay for image pulls.
+
+    """
 
     def __init__(self, environment: Environment, instance_id: str,
                  label: str = DOCKER_RUN_WORKLOAD_CONFIG_LABEL, base: Any = DOCKER_RUN_WORKLOAD_CONFIG_BASE):
@@ -37,6 +254,7 @@ class DockerRunWorkloadPlugin(WorkloadBase):
 
         """
         WorkloadBase.__init__(self, environment, instance_id)
+        UCCTFixturesPlugin.__init__(self)
 
         logger.info("Preparing Docker run setting")
 
@@ -51,6 +269,25 @@ class DockerRunWorkloadPlugin(WorkloadBase):
         self.docker_client_fixture = None
         """ This workload needs only a docker client fixture/plugin """
 
+        self.containers = []
+        """ containers.run() results for the running replicas, by replica index """
+
+        self.retention = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_RETENTION_KEY], exception_if_missing=False)
+        """ how many log lines and stats samples to keep per container """
+        self.log_lines = collections.defaultdict(
+            lambda: collections.deque(maxlen=self.retention))
+        """ retained log lines, by container index """
+        self.stats_samples = collections.defaultdict(
+            lambda: collections.deque(maxlen=self.retention))
+        """ retained stats samples, by container index """
+        self.images = {}
+        """ prepared image details (id, repo digests, pull seconds), by image """
+
+        self.latest_stats = {}
+        """ newest stats sample, by container index """
+        self._export_lock = threading.Lock()
+
     def set_fixtures(self, fixtures: Fixtures):
         """ Retrieve fixtures from a set of Fixtures
 
@@ -65,11 +302,134 @@ class DockerRunWorkloadPlugin(WorkloadBase):
         self.docker_client_fixture = fixtures.get_fixture(
             type=Type.CLIENT, plugin_id='uctt_docker')
 
+    def _run_config(self) -> Dict[str, Any]:
+        """ get the containers.run() arguments from config """
+        run = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_RUN_KEY])
+
+        assert 'image' in run, "Run command had no image"
+
+        return run
+
+    def _concurrency(self) -> int:
+        """ get the launch concurrency from config """
+        concurrency = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_CONCURRENCY_KEY], exception_if_missing=False)
+        if not concurrency:
+            concurrency = DOCKER_RUN_WORKLOAD_DEFAULT_CONCURRENCY
+        return concurrency
+
+    def _images(self) -> List[str]:
+        """ get all of the configured images, run image first """
+        images = [self._run_config()['image']]
+        for image in self.loaded_config.get([self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_IMAGES_KEY], exception_if_missing=False) or []:
+            if image not in images:
+                images.append(image)
+        return images
+
+    def prepare(self):
+        """ Pull all of the workload images, so that apply() needs no network
+
+        Images are pulled in parallel, up to the workload concurrency.  With
+        the default "missing" pull policy, images which are already on the
+        daemon are not pulled again; with "always" every image is pulled.
+
+        Each image is checked against its expected digest, if one is in the
+        `digests` config, or if the image is referenced by digest
+        (image@sha256:...).  Image ids, digests and pull times are kept in
+        .images
+
+        @NOTE Needs a docker client fixture to run.  Use .set_fixtures() first
+
+        Raises:
+        -------
+
+        DockerRunWorkloadError if any image failed to pull or verify, keyed
+        by image.
+
+        """
+        if self.docker_client_fixture is None:
+            raise ValueError(
+                "No docker client was attached to the workload before prepare()")
+
+        client = self.docker_client_fixture.plugin
+        images = self._images()
+        digests = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_DIGESTS_KEY], exception_if_missing=False) or {}
+        policy = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_PULL_KEY], exception_if_missing=False) or DOCKER_RUN_WORKLOAD_PULL_MISSING
+
+        def prepare_image(image_name: str):
+            start = time.perf_counter()
+            image = None
+            pulled = False
+            if policy != DOCKER_RUN_WORKLOAD_PULL_ALWAYS:
+                try:
+                    image = client.images.get(image_name)
+                except Exception as e:
+                    # docker.errors.ImageNotFound, without importing the docker SDK
+                    if getattr(e, 'status_code', None) != 404:
+                        raise
+            if image is None:
+                logger.info("Pulling docker image {}".format(image_name))
+                repository, tag = image_repository_tag(image_name)
+                image = client.images.pull(repository, tag=tag)
+                pulled = True
+            duration = time.perf_counter() - start
+
+            repo_digests = image.attrs.get('RepoDigests') or []
+            expected = digests.get(image_name, '')
+            if not expected and '@' in image_name:
+                expected = image_name.split('@', 1)[1]
+            if expected and not any(repo_digest.split('@', 1)[-1] == expected for repo_digest in repo_digests):
+                raise ValueError("Docker image {} digests {} do not match expected digest {}".format(
+                    image_name, repo_digests, expected))
+
+            logger.info("Prepared docker image {} in {:.1f}s ({})".format(
+                image_name, duration, 'pulled' if pulled else 'cached'))
+            return {
+                'id': image.id,
+                'digests': repo_digests,
+                'pulled': pulled,
+                'seconds': duration
+            }
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self._concurrency(), len(images)))) as executor:
+            futures = {image: executor.submit(prepare_image, image)
+                       for image in images}
+            for image, future in futures.items():
+                try:
+                    self.images[image] = future.result()
+                except Exception as e:
+                    errors[image] = e
+
+        if errors:
+            raise DockerRunWorkloadError(
+                'pull', errors) from next(iter(errors.values()))
+
     def apply(self):
         """ Run the workload
 
         @NOTE Needs a docker client fixture to run.  Use .set_fixtures() first
 
+        Run prepare() first to pull the images, otherwise the daemon pulls the
+        image as part of the first container run.  Prepared images are run by
+        image id, so the daemon can't pull, and runs the verified image.
+
+        Returns:
+        --------
+
+        If replicas is not configured, then the containers.run() result for
+        the single container, otherwise a list of the results (container
+        handles when detached) for every replica.
+
+        Raises:
+        -------
+
+        DockerRunWorkloadError if any replica failed to run.  Replicas which
+        did run are kept, so that destroy() can remove them.
+
         """
 
         if self.docker_client_fixture is None:
@@ -77,18 +437,277 @@ class DockerRunWorkloadPlugin(WorkloadBase):
                 "No docker client was attached to the workload before exec()")
 
         client = self.docker_client_fixture.plugin
-        run = self.loaded_config.get([self.config_base, 'run'])
+        run = self._run_config()
+        if run['image'] in self.images:
+            run = dict(run, image=self.images[run['image']]['id'])
 
-        assert 'image' in run, "Run command had no image"
+        replicas = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_REPLICAS_KEY], exception_if_missing=False)
+        if replicas is None:
+            container = client.containers.run(**run)
+            self.containers.append(container)
+            return container
+
+        def run_replica(index: int):
+            replica_run = dict(run)
+            if 'name' in replica_run:
+                replica_run['name'] = '{}-{}'.format(replica_run['name'], index)
+            return client.containers.run(**replica_run)
+
+        logger.info("Running {} docker containers for image {}".format(
+            replicas, run['image']))
+
+        results = [None] * replicas
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self._concurrency(), replicas))) as executor:
+            futures = [executor.submit(run_replica, index)
+                       for index in range(replicas)]
+            for index, future in enumerate(futures):
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors[index] = e
+
+        containers = [results[index]
+                      for index in range(replicas) if index not in errors]
+        self.containers.extend(containers)
+
+        if errors:
+            raise DockerRunWorkloadError(
+                'run', errors) from next(iter(errors.values()))
+
+        return containers
+
+    def _container(self, index: int):
+        """ get a running container handle """
+        try:
+            container = self.containers[index]
+        except IndexError as e:
+            raise ValueError(
+                "Docker workload has no container {}; has apply() been run?".format(index)) from e
+        if not hasattr(container, 'logs'):
+            raise ValueError(
+                "Docker workload container {} is not a container handle; use a detached run".format(index))
+        return container
+
+    def logs(self, index: int = 0, follow: bool = True, **kwargs) -> Iterator[str]:
+        """ Stream log lines from a workload container
+
+        Parameters:
+        -----------
+
+        index (int) : replica index of the container
+
+        follow (bool) : keep streaming until the container stops, otherwise
+            stop at the end of the current logs
+
+        Any other kwargs are passed to the docker container logs() call (e.g.
+        since, tail, timestamps)
+
+        Returns:
+        --------
+
+        Generator of str log lines.  If retention is configured then lines are
+        also kept in .log_lines[index]
+
+        """
+        return self._read_logs(index, self._container(index).logs(
+            stream=True, follow=follow, **kwargs))
+
+    def _read_logs(self, index: int, stream: Iterator) -> Iterator[str]:
+        """ turn a docker log stream into lines @see logs() """
+        retain = self.log_lines[index] if self.retention else None
+
+        # keep the partial line as bytes, so that a multi-byte character
+        # split across chunks is decoded whole
+        partial = b''
+        for chunk in stream:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            lines = (partial + chunk).split(b'\n')
+            partial = lines.pop()
+            for line in lines:
+                line = line.decode('utf-8', errors='replace')
+                if retain is not None:
+                    retain.append(line)
+                yield line
+        if partial:
+            line = partial.decode('utf-8', errors='replace')
+            if retain is not None:
+                retain.append(line)
+            yield line
+
+    def stats(self, index: int = 0, follow: bool = True) -> Iterator[Dict[str, Any]]:
+        """ Stream CPU/memory/IO samples from a workload container
+
+        @see stats_sample for the sample contents
+
+        Parameters:
+        -----------
+
+        index (int) : replica index of the container
+
+        follow (bool) : keep streaming samples (about one per second from the
+            daemon) until the container stops, otherwise return one sample
+
+        Returns:
+        --------
+
+        Generator of Dict samples.  If retention is configured then samples
+        are also kept in .stats_samples[index], and if export_stats is
+        configured then they are exported to the stats output fixture when
+        the stream ends (and every export_interval seconds, if configured).
+
+        """
+        container = self._container(index)
+        if follow:
+            results = container.stats(stream=True, decode=True)
+        else:
+            results = iter([container.stats(stream=False)])
+        return self._read_stats(index, results)
+
+    def _read_stats(self, index: int, results: Iterator) -> Iterator[Dict[str, Any]]:
+        """ turn docker stats results into samples @see stats() """
+        export = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_EXPORT_STATS_KEY], exception_if_missing=False)
+        export_interval = self.loaded_config.get(
+            [self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_EXPORT_INTERVAL_KEY], exception_if_missing=False)
+
+        last_export = time.monotonic()
+        try:
+            for result in results:
+                sample = stats_sample(result)
+                self.latest_stats[index] = sample
+                if self.retention:
+                    self.stats_samples[index].append(sample)
+                if export and export_interval and time.monotonic() - last_export >= export_interval:
+                    self.export_stats()
+                    last_export = time.monotonic()
+                yield sample
+        finally:
+            # exporting copies every retained sample, so don't do it per sample
+            if export:
+                self.export_stats()
+
+    def alogs(self, index: int = 0, follow: bool = True, **kwargs) -> AsyncIterator[str]:
+        """ Async iterator version of logs(), which reads the stream in a thread
+
+        Cancelling the consumer closes the docker log stream.
+
+        """
+        stream = self._container(index).logs(
+            stream=True, follow=follow, **kwargs)
+        return _async_iterate(self._read_logs(index, stream),
+                              cancel=_stream_closer(stream))
+
+    def astats(self, index: int = 0, follow: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """ Async iterator version of stats(), which reads the stream in a thread
+
+        The docker stats stream can't be interrupted, so cancelling the
+        consumer waits for the next sample (about a second) before the stream
+        is closed.
+
+        """
+        return _async_iterate(self.stats(index=index, follow=follow))
+
+    def export_stats(self) -> Fixture:
+        """ Export the stats samples to a dict output fixture
+
+        The output is added to this plugin's fixtures (and the environment) as
+        a dict output with instance_id "{instance_id}-stats", and contains:
+
+        ```
+        samples:
+          {index}: [ {sample}, ... ]  # retained samples
+        latest:
+          {index}: {sample}
+        ```
+
+        Container indexes are used as string keys, so that the output can be
+        navigated with a get key like "latest.0.cpu_percent"
+
+        Returns:
+        --------
+
+        The stats dict output Fixture
+
+        """
+        instance_id = '{}-{}'.format(self.instance_id,
+                                     DOCKER_RUN_WORKLOAD_STATS_OUTPUT_SUFFIX)
+
+        with self._export_lock:
+            fixture = self.fixtures.get_fixture(
+                type=Type.OUTPUT, instance_id=instance_id, exception_if_missing=False)
+
+            data = {
+                'samples': {str(index): list(samples) for index, samples in self.stats_samples.items()},
+                'latest': {str(index): dict(sample) for index, sample in self.latest_stats.items()}
+            }
+
+            if fixture is None:
+                fixture = self.environment.add_fixture(
+                    type=Type.OUTPUT,
+                    plugin_id=UCTT_PLUGIN_ID_OUTPUT_DICT,
+                    instance_id=instance_id,
+                    priority=self.environment.plugin_priority(delta=5),
+                    arguments={'data': data})
+                self.fixtures.add_fixture(fixture)
+            else:
+                fixture.plugin.set_data(data)
+
+        return fixture
+
+    def destroy(self):
+        """ Remove the containers that apply() ran
+
+        Containers are force removed concurrently.  Only detached runs leave
+        container handles; any other run results are just dropped.
+
+        Raises:
+        -------
+
+        DockerRunWorkloadError if any container could not be removed.  Those
+        containers are kept so that destroy() can be retried.
+
+        """
+        containers = [container for container in self.containers if hasattr(
+            container, 'remove')]
+        self.containers = []
+
+        def remove(container):
+            try:
+                container.remove(force=True)
+            except Exception as e:
+                # docker.errors.NotFound, without importing the docker SDK
+                if getattr(e, 'status_code', None) != 404:
+                    raise
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self._concurrency(), len(containers) or 1))) as executor:
+            futures = [executor.submit(remove, container)
+                       for container in containers]
+            for index, future in enumerate(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[index] = e
 
-        return client.containers.run(**run)
+        if errors:
+            self.containers = [containers[index] for index in errors]
+            raise DockerRunWorkloadError(
+                'remove', errors) from next(iter(errors.values()))
 
     def info(self):
         """ Return dict data about this plugin for introspection """
         return {
             'workload': {
                 'run': {
-                    'run': self.loaded_config.get([self.config_base, 'run'])
+                    'run': self.loaded_config.get([self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_RUN_KEY]),
+                    'replicas': self.loaded_config.get([self.config_base, DOCKER_RUN_WORKLOAD_CONFIG_REPLICAS_KEY], exception_if_missing=False),
+                    'concurrency': self._concurrency(),
+                    'containers': len(self.containers),
+                    'retention': self.retention,
+                    'images': self.images
                 },
                 'required_fixtures': {
                     'docker': {
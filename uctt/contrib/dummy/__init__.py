@@ -13,6 +13,7 @@ from typing import Any, Dict
 from configerus.loaded import LOADED_KEY_ROOT
 
 from uctt.plugin import Factory, Type
+from uctt.registry import registration_only
 from uctt.environment import Environment
 from uctt.provisioner import UCTT_PROVISIONER_CONFIG_PROVISIONER_LABEL
 
@@ -48,6 +49,7 @@ def uctt_plugin_factory_workload_dummy(
 """ SetupTools EntryPoint UCTT BootStrapping """
 
 
+@registration_only
 def bootstrap(environment: Environment):
     """ UCTT_Dummy bootstrap
 
@@ -5,16 +5,21 @@ MTT Kubernetes
 MTT contrib functionality for Kubernetes.  In particular to provide plugins for
 kubernetes clients and kubernetes workloads.
 
+The kubernetes SDK is only imported by the plugins when they need it, and not
+when this package is imported, as it is slow to import.
+
 """
 
 import os
 from typing import List, Any
 
 from uctt.plugin import Factory, Type
+from uctt.registry import registration_only
 from uctt.environment import Environment
 
 from .client import KubernetesClientPlugin
 from .deployment_workload import KubernetesDeploymentWorkloadPlugin, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_LABEL, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_BASE
+from .manifest_workload import KubernetesManifestsWorkloadPlugin, KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_LABEL, KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_BASE
 
 UCTT_PLUGIN_ID_KUBERNETES_CLIENT = 'uctt_kubernetes'
 """ client plugin_id for the mtt dummy plugin """
@@ -22,9 +27,10 @@ UCTT_PLUGIN_ID_KUBERNETES_CLIENT = 'uctt_kubernetes'
 
 @Factory(type=Type.CLIENT, plugin_id=UCTT_PLUGIN_ID_KUBERNETES_CLIENT)
 def uctt_plugin_factory_client_kubernetes(
-        environment: Environment, instance_id: str = '', kube_config_file: str = ''):
+        environment: Environment, instance_id: str = '', kube_config_file: str = '', connection_pool_maxsize: int = 0, per_thread: bool = False):
     """ create an mtt kubernetes client plugin """
-    return KubernetesClientPlugin(environment, instance_id, kube_config_file)
+    return KubernetesClientPlugin(environment, instance_id, kube_config_file,
+                                  connection_pool_maxsize=connection_pool_maxsize, per_thread=per_thread)
 
 
 UCTT_PLUGIN_ID_KUBERNETES_DEPLOYMENT_WORKLAOD = 'uctt_kubernetes_deployment'
@@ -40,9 +46,23 @@ def uctt_plugin_factory_workload_kubernetes_deployment(
         environment, instance_id, label=label, base=base)
 
 
+UCTT_PLUGIN_ID_KUBERNETES_MANIFESTS_WORKLOAD = 'uctt_kubernetes_manifests'
+""" workload plugin_id for the mtt_kubernetes manifest set plugin """
+
+
+@Factory(type=Type.WORKLOAD,
+         plugin_id=UCTT_PLUGIN_ID_KUBERNETES_MANIFESTS_WORKLOAD)
+def uctt_plugin_factory_workload_kubernetes_manifests(
+        environment: Environment, instance_id: str = '', label: str = KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_LABEL, base: Any = KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_BASE):
+    """ create an mtt kubernetes manifest set workload plugin """
+    return KubernetesManifestsWorkloadPlugin(
+        environment, instance_id, label=label, base=base)
+
+
 """ SetupTools EntryPoint UCTT BootStrapping """
 
 
+@registration_only
 def bootstrap(environment: Environment):
     """ UCTT_Kubernetes bootstrap
 
@@ -1,9 +1,12 @@
 
-import kubernetes
 import logging
+import threading
+from typing import Any, Dict
 
 from uctt.client import ClientBase
 
+from .informer import Informer
+
 logger = logging.getLogger('uctt.contrib.kubernetes.client')
 
 
@@ -49,6 +52,12 @@ class KubernetesClientPlugin(ClientBase):
     print("NS: {}".format(ns))
     ```
 
+    Typed API clients (CoreV1Api, AppsV1Api ...) are cached, so use
+    get_api() or the get_*_client() methods instead of wrapping .api_client
+    yourself.  All typed clients share the one api client connection pool,
+    which can be sized with connection_pool_maxsize.  For heavily threaded
+    use, per_thread gives each thread its own api client (and pool).
+
     Why use this:
     -------------
 
@@ -61,7 +70,8 @@ class KubernetesClientPlugin(ClientBase):
 
     """
 
-    def __init__(self, environment, instance_id, kube_config_file: str = ''):
+    def __init__(self, environment, instance_id, kube_config_file: str = '',
+                 connection_pool_maxsize: int = 0, per_thread: bool = False):
         """ Run the super constructor but also set class properties
 
         This implements the args part of the client interface.
@@ -75,26 +85,227 @@ class KubernetesClientPlugin(ClientBase):
 
         config_file (str): String path to the kubernetes config file to use
 
+        connection_pool_maxsize (int) : max number of urllib3 connections kept
+            to the API server per api client.  If 0 then the kubernetes SDK
+            default is used.  Set this to at least the number of threads which
+            share an api client.
+
+        per_thread (bool) : if True then each thread gets its own api client
+            and typed api clients, instead of sharing one across threads.
+
         """
         super(ClientBase, self).__init__(environment, instance_id)
 
+        # the kubernetes SDK is slow to import, so we only import it once a
+        # client is actually created.
+        import kubernetes
+
         logger.debug("Creating Kuberentes client from config file")
-        self.api_client = kubernetes.config.new_client_from_config(
-            config_file=kube_config_file)
+        self.configuration = kubernetes.client.Configuration()
+        """ kubernetes client configuration shared by all api clients """
+        kubernetes.config.load_kube_config(
+            config_file=kube_config_file, client_configuration=self.configuration)
+        if connection_pool_maxsize:
+            self.configuration.connection_pool_maxsize = connection_pool_maxsize
 
         self.config_file = kube_config_file
+        self.connection_pool_maxsize = self.configuration.connection_pool_maxsize
+        self.per_thread = per_thread
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        """ per thread api client and typed api clients, when per_thread """
+        self._api_client = None
+        self._apis = {}
+        """ typed api clients by class name, when not per_thread """
+        if not per_thread:
+            self._api_client = kubernetes.client.ApiClient(
+                configuration=self.configuration)
+
+        self._informers_lock = threading.Lock()
+        self._informers = {}
+        """ started informers by (api, resource, namespace, label_selector) """
+
+    @property
+    def api_client(self):
+        """ The kubernetes ApiClient (for this thread if per_thread) """
+        if not self.per_thread:
+            return self._api_client
+
+        api_client = getattr(self._local, 'api_client', None)
+        if api_client is None:
+            import kubernetes
+
+            logger.debug(
+                "Creating kubernetes api client for thread %s", threading.current_thread().name)
+            api_client = kubernetes.client.ApiClient(
+                configuration=self.configuration)
+            self._local.api_client = api_client
+            self._local.apis = {}
+        return api_client
+
+    @api_client.setter
+    def api_client(self, api_client):
+        """ Replace the kubernetes ApiClient (for this thread if per_thread)
+
+        Cached typed api clients wrap the old api client, so they are dropped
+        and created again for the new one.
+
+        """
+        with self._lock:
+            if self.per_thread:
+                self._local.api_client = api_client
+                self._local.apis = {}
+            else:
+                self._api_client = api_client
+                self._apis = {}
+
+    def get_api(self, name: str) -> Any:
+        """ Get a cached typed kubernetes api client
+
+        Parameters:
+        -----------
+
+        name (str) : kubernetes.client api class name, e.g. "CoreV1Api"
+
+        Returns:
+        --------
+
+        The kubernetes.client api object, wrapping the api client.  The same
+        object is returned for every call (from the same thread if per_thread)
+
+        """
+        if self.per_thread:
+            api_client = self.api_client
+            apis = self._local.apis
+        else:
+            api_client = self._api_client
+            apis = self._apis
+
+        api = apis.get(name)
+        if api is None:
+            import kubernetes
+
+            with self._lock:
+                api = apis.get(name)
+                if api is None:
+                    logger.debug(
+                        "Creating kubernetes %s client from api_client", name)
+                    if name == 'DynamicClient':
+                        api = kubernetes.dynamic.DynamicClient(api_client)
+                    else:
+                        api = getattr(kubernetes.client, name)(api_client)
+                    apis[name] = api
+        return api
+
+    def get_dynamic_client(self):
+        """ Get a cached kubernetes DynamicClient
+
+        The dynamic client discovers the cluster api resources when it is
+        created, so caching it means that discovery runs only once.
+
+        """
+        return self.get_api('DynamicClient')
 
     def get_CoreV1Api_client(self):
         """ Get a CoreV1Api client """
-        assert self.api_client, "You must run the arguments() method before using this client"
+        return self.get_api('CoreV1Api')
+
+    def get_AppsV1Api_client(self):
+        """ Get an AppsV1Api client """
+        return self.get_api('AppsV1Api')
+
+    def get_informer(self, resource: str, api: str = 'CoreV1Api', namespace: str = '',
+                     label_selector: str = '', sync_timeout: float = 60.0) -> Informer:
+        """ Get a shared, started informer cache for a resource type
+
+        Informers are shared by all users of this client, so a resource type
+        in a namespace is only listed and watched once.
+
+        ```
+        pods = client.get_informer('pod', namespace='default')
+        pod = pods.get('my-pod', namespace='default')
+        web = pods.list(labels={'app': 'web'})
+        deployments = client.get_informer('deployment', api='AppsV1Api')
+        ```
+
+        Parameters:
+        -----------
+
+        resource (str) : snake case resource name used in the api list
+            methods, e.g. "pod", "deployment", "config_map", "node"
+
+        api (str) : kubernetes.client api class name for the resource
+
+        namespace (str) : only cache objects in this namespace.  If empty then
+            all namespaces are cached.
+
+        label_selector (str) : only cache objects which match the selector
+
+        sync_timeout (float) : seconds to wait for the first list
+
+        Returns:
+        --------
+
+        A started Informer
+
+        Raises:
+        -------
+
+        TimeoutError if the first list did not complete in time
+
+        """
+        key = (api, resource, namespace, label_selector)
+        with self._informers_lock:
+            informer = self._informers.get(key)
+            if informer is None:
+                if self.per_thread:
+                    # informers run in their own thread, so they shouldn't
+                    # use the api client of the calling thread
+                    import kubernetes
+                    typed_api = getattr(kubernetes.client, api)(
+                        kubernetes.client.ApiClient(configuration=self.configuration))
+                else:
+                    typed_api = self.get_api(api)
+
+                list_kwargs = {}
+                if label_selector:
+                    list_kwargs['label_selector'] = label_selector
+                if namespace:
+                    list_function_name = 'list_namespaced_{}'.format(resource)
+                    list_kwargs['namespace'] = namespace
+                else:
+                    list_function_name = 'list_{}_for_all_namespaces'.format(
+                        resource)
+                if not hasattr(typed_api, list_function_name):
+                    # cluster scoped resources (node, namespace ...)
+                    list_function_name = 'list_{}'.format(resource)
+
+                informer = Informer(list_function=getattr(typed_api, list_function_name),
+                                    list_kwargs=list_kwargs)
+                informer.start()
+                self._informers[key] = informer
+
+        if not informer.wait_synced(sync_timeout):
+            raise TimeoutError("Kubernetes {} informer did not sync in {}s".format(
+                resource, sync_timeout))
+        return informer
 
-        logger.debug("Retrieving kubernetes CoreV1Api client from api_client")
-        return kubernetes.client.CoreV1Api(self.api_client)
+    def stop_informers(self):
+        """ Stop and forget all informers """
+        with self._informers_lock:
+            informers = list(self._informers.values())
+            self._informers = {}
+        for informer in informers:
+            informer.stop()
 
     def info(self):
         """ Return dict data about this plugin for introspection """
         return {
             'kubernetes': {
-                'config_file': self.config_file
+                'config_file': self.config_file,
+                'connection_pool_maxsize': self.connection_pool_maxsize,
+                'per_thread': self.per_thread,
+                'informers': ['/'.join(part for part in key if part) for key in self._informers]
             }
         }
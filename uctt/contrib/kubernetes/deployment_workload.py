@@ -5,16 +5,13 @@ Kubernetes workload plugins
 """
 
 import logging
+import time
 from typing import List, Any
 
-import kubernetes
-
 from uctt.plugin import Type
 from uctt.fixtures import Fixtures
 from uctt.workload import WorkloadBase
 
-from .client import KubernetesClientPlugin
-
 logger = logging.getLogger('uctt.contrib.kubernetes.workload.deployment')
 
 KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_LABEL = 'kubernetes'
@@ -23,6 +20,21 @@ KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_BASE = 'workload.deployment'
 KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_NAMESPACE = "namespace"
 KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_BODY = "body"
 
+KUBERNETES_WATCH_GONE_STATUS = 410
+""" API status for a watch resourceVersion which is too old to resume from """
+
+
+def deployment_ready(deployment) -> bool:
+    """ is a kubernetes V1Deployment rolled out, with all replicas available """
+    replicas = deployment.spec.replicas if deployment.spec.replicas is not None else 1
+    status = deployment.status
+    if status is None:
+        return False
+    if (status.observed_generation or 0) < (deployment.metadata.generation or 0):
+        # the controller hasn't seen the latest spec yet
+        return False
+    return (status.available_replicas or 0) == replicas and (status.updated_replicas or 0) == replicas
+
 
 class KubernetesDeploymentWorkloadPlugin(WorkloadBase):
     """ Kubernetes workload class """
@@ -85,38 +97,121 @@ class KubernetesDeploymentWorkloadPlugin(WorkloadBase):
         body = workload_config.get(
             [self.config_base, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_BODY])
 
-        k8s_apps_v1 = kubernetes.client.AppsV1Api(
-            self.kubernetes_client_fixture.plugin.api_client)
+        k8s_apps_v1 = self.kubernetes_client_fixture.plugin.get_AppsV1Api_client()
         self.deployment = k8s_apps_v1.create_namespaced_deployment(
             body=body, namespace=namespace)
 
         return self.deployment
 
+    def _deployment_name(self, workload_config) -> str:
+        """ get the deployment name, from the created deployment or from config """
+        # if we have a deployment registered, pull its name directly, otherwise assume that
+        # the config metadata name is correct (we could be cleaning up previous
+        # runs)
+        if self.deployment is not None:
+            return self.deployment.metadata.name
+        return workload_config.get(
+            [self.config_base, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_BODY, 'metadata.name'])
+
+    def wait_ready(self, timeout: int = 300):
+        """ Wait until the deployment has all of its replicas available
+
+        Instead of polling the deployment status, we keep one watch stream
+        open on the deployment.  If the API server ends the stream, we resume
+        the watch from the last resourceVersion that we saw, and if that
+        version has expired we re-read the deployment and watch from there.
+
+        Parameters:
+        -----------
+
+        timeout (int) : seconds to wait for the deployment
+
+        Returns:
+        --------
+
+        The ready V1Deployment
+
+        Raises:
+        -------
+
+        TimeoutError if the deployment wasn't ready in time
+
+        RuntimeError if the deployment was deleted while we waited
+
+        """
+        if self.kubernetes_client_fixture is None:
+            raise ValueError(
+                "No kubernetes client was attached to the workload before wait_ready()")
+        import kubernetes
+
+        workload_config = self.environment.config.load(self.config_label)
+        name = self._deployment_name(workload_config)
+        namespace = workload_config.get(
+            [self.config_base, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_NAMESPACE])
+
+        k8s_apps_v1 = self.kubernetes_client_fixture.plugin.get_AppsV1Api_client()
+        deadline = time.monotonic() + timeout
+
+        resource_version = None
+        while True:
+            if resource_version is None:
+                # (re)list: read the current state and watch from its version
+                deployment = k8s_apps_v1.read_namespaced_deployment(
+                    name=name, namespace=namespace)
+                if deployment_ready(deployment):
+                    return deployment
+                resource_version = deployment.metadata.resource_version
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Kubernetes deployment {}/{} was not ready after {}s".format(
+                    namespace, name, timeout))
+
+            watch = kubernetes.watch.Watch()
+            try:
+                for event in watch.stream(k8s_apps_v1.list_namespaced_deployment,
+                                          namespace=namespace,
+                                          field_selector='metadata.name={}'.format(
+                                              name),
+                                          resource_version=resource_version,
+                                          timeout_seconds=max(1, int(remaining))):
+                    deployment = event['object']
+                    resource_version = deployment.metadata.resource_version
+
+                    if event['type'] == 'DELETED':
+                        raise RuntimeError("Kubernetes deployment {}/{} was deleted while waiting for it".format(
+                            namespace, name))
+                    if deployment_ready(deployment):
+                        return deployment
+                    if time.monotonic() >= deadline:
+                        break
+            except kubernetes.client.rest.ApiException as e:
+                if e.status != KUBERNETES_WATCH_GONE_STATUS:
+                    raise
+                logger.debug(
+                    "Kubernetes watch version expired for deployment %s/%s, re-reading", namespace, name)
+                resource_version = None
+            finally:
+                watch.stop()
+
     def destroy(self):
         """ destroy any created resources """
 
         if self.kubernetes_client_fixture is None:
             raise ValueError(
                 "No kubernetes client was attached to the workload before exec()")
+        import kubernetes
 
         workload_config = self.environment.config.load(self.config_label)
 
-        # if we have a deployment registered, pull its name directly, otherwise assume that
-        # the config metadata name is correct (we could be cleaning up previous
-        # runs)
-        if self.deployment is not None:
-            name = self.deployment.metadata.name
-        else:
-            name = workload_config.get(
-                [self.config_base, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_BODY, 'metadata.name'])
+        name = self._deployment_name(workload_config)
         namespace = workload_config.get(
             [self.config_base, KUBERNETES_DEPLOYMENT_WORKLOAD_CONFIG_KEY_NAMESPACE])
         body = kubernetes.client.V1DeleteOptions(
             propagation_policy='Foreground',
             grace_period_seconds=5)
 
-        k8s_apps_v1 = kubernetes.client.AppsV1Api(
-            self.kubernetes_client_fixture.plugin.api_client)
+        k8s_apps_v1 = self.kubernetes_client_fixture.plugin.get_AppsV1Api_client()
         self.status = k8s_apps_v1.delete_namespaced_deployment(
             name=name, namespace=namespace, body=body)
 
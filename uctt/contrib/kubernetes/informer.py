@@ -0,0 +1,281 @@
+"""
+
+Kubernetes informer cache
+
+An informer keeps a local copy of all of the objects of one resource type (in
+a namespace, or in all namespaces) by listing them once and then following a
+watch stream.  Reads come from memory, indexed by namespace/name and by label,
+so tests that check cluster state repeatedly don't make an API round-trip per
+check.
+
+Use KubernetesClientPlugin.get_informer() to get a shared, started informer.
+
+"""
+
+import functools
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger('uctt.contrib.kubernetes.informer')
+
+KUBERNETES_INFORMER_WATCH_TIMEOUT = 30
+""" seconds before the API server ends a watch stream, which we then resume
+
+Resuming a watch is one cheap request, and this bounds how long the watch
+thread can stay blocked after stop(), if closing the stream didn't end it.
+"""
+KUBERNETES_INFORMER_RETRY_INTERVAL = 1.0
+""" seconds to wait before relisting after a watch error """
+KUBERNETES_INFORMER_GONE_STATUS = 410
+""" API status for a watch resourceVersion which is too old to resume from """
+
+
+class Informer:
+    """ List+watch cache for one kubernetes resource type
+
+    The informer runs a background thread which lists the objects, then
+    watches for changes from the list resourceVersion.  Watches which end are
+    resumed from the last seen resourceVersion, and if that version has
+    expired the objects are listed again.
+
+    Objects are kept as returned by the kubernetes SDK (e.g. V1Pod), and
+    should be treated as read only.
+
+    """
+
+    def __init__(self, list_function: Callable, list_kwargs: Dict[str, Any] = None,
+                 watch_factory: Callable = None, watch_timeout: int = KUBERNETES_INFORMER_WATCH_TIMEOUT):
+        """
+
+        Parameters:
+        -----------
+
+        list_function (Callable) : kubernetes SDK list function for the
+            resource, e.g. CoreV1Api.list_namespaced_pod
+
+        list_kwargs (Dict) : arguments for the list function, e.g. namespace
+            or label_selector
+
+        watch_factory (Callable) : creates a watch object with a stream()
+            method.  Defaults to kubernetes.watch.Watch
+
+        watch_timeout (int) : seconds before the API server ends each watch
+            stream.  stop() waits up to this long for the thread to end.
+
+        """
+        self.list_function = list_function
+        self.list_kwargs = dict(list_kwargs or {})
+        self.watch_factory = watch_factory
+        self.watch_timeout = watch_timeout
+
+        self.resource_version = ''
+        """ last resourceVersion seen """
+
+        self._lock = threading.RLock()
+        self._objects = {}
+        """ objects by "namespace/name" key """
+        self._label_index = {}
+        """ object keys by (label, value) """
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._watch = None
+        self._response = None
+        """ http response of the current watch stream """
+
+    @staticmethod
+    def key(name: str, namespace: str = '') -> str:
+        """ store key for an object """
+        return '{}/{}'.format(namespace or '', name)
+
+    def start(self):
+        """ Start the list+watch background thread """
+        if self._thread is not None:
+            if not self._stopped.is_set():
+                return
+            # a previous stop() timed out, so let that thread finish first
+            self._thread.join()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='uctt-informer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """ Stop the background thread
+
+        Watch.stop() only takes effect on the next event, so we also close
+        the watch http response, which ends a blocked read.
+
+        Parameters:
+        -----------
+
+        timeout (float) : seconds to wait for the thread to end.  Defaults to
+            a little over the watch timeout.
+
+        """
+        self._stopped.set()
+        watch = self._watch
+        if watch is not None:
+            watch.stop()
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except Exception as e:
+                logger.debug("Informer watch response close failed: %s", e)
+
+        if self._thread is not None:
+            if timeout is None:
+                timeout = self.watch_timeout + KUBERNETES_INFORMER_RETRY_INTERVAL
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    "Informer thread did not stop within %ss", timeout)
+            else:
+                self._thread = None
+
+    def wait_synced(self, timeout: float = 60.0) -> bool:
+        """ Wait until the first list has been stored
+
+        Returns:
+        --------
+
+        True if the informer synced in time
+
+        """
+        return self._synced.wait(timeout)
+
+    def has_synced(self) -> bool:
+        """ has the first list been stored """
+        return self._synced.is_set()
+
+    def get(self, name: str, namespace: str = '') -> Any:
+        """ get an object from the cache, or None if there isn't one """
+        with self._lock:
+            return self._objects.get(self.key(name, namespace))
+
+    def list(self, namespace: str = None,
+             labels: Dict[str, str] = None) -> List[Any]:
+        """ list objects from the cache
+
+        Parameters:
+        -----------
+
+        namespace (str) : only objects in this namespace, if not None
+
+        labels (Dict[str, str]) : only objects with all of these labels
+
+        Returns:
+        --------
+
+        List of objects, ordered by namespace/name
+
+        """
+        with self._lock:
+            if labels:
+                keys = None
+                for label in labels.items():
+                    label_keys = self._label_index.get(label, set())
+                    keys = label_keys if keys is None else keys & label_keys
+            else:
+                keys = self._objects.keys()
+
+            if namespace is not None:
+                prefix = '{}/'.format(namespace)
+                keys = [key for key in keys if key.startswith(prefix)]
+
+            return [self._objects[key] for key in sorted(keys)]
+
+    def _store(self, obj: Any):
+        """ add or replace an object in the store and indexes """
+        key = self.key(obj.metadata.name, obj.metadata.namespace)
+        with self._lock:
+            self._remove(key)
+            self._objects[key] = obj
+            for label in (obj.metadata.labels or {}).items():
+                self._label_index.setdefault(label, set()).add(key)
+
+    def _remove(self, key: str):
+        """ remove an object from the store and indexes """
+        with self._lock:
+            old = self._objects.pop(key, None)
+            if old is not None:
+                for label in (old.metadata.labels or {}).items():
+                    keys = self._label_index.get(label)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del self._label_index[label]
+
+    def _list(self):
+        """ replace the store with a fresh list """
+        result = self.list_function(**self.list_kwargs)
+        with self._lock:
+            self._objects = {}
+            self._label_index = {}
+            for obj in result.items or []:
+                self._store(obj)
+            self.resource_version = result.metadata.resource_version
+        self._synced.set()
+        logger.debug("Informer listed %s objects at version %s",
+                     len(self._objects), self.resource_version)
+
+    def _watch_stream(self):
+        """ follow a watch stream from the current resourceVersion """
+        if self.watch_factory is None:
+            import kubernetes
+            self.watch_factory = kubernetes.watch.Watch
+
+        list_function = self.list_function
+
+        @functools.wraps(list_function)
+        def watch_function(*args, **kwargs):
+            """ keep the watch response, so that stop() can close it """
+            response = list_function(*args, **kwargs)
+            self._response = response
+            return response
+
+        self._watch = self.watch_factory()
+        try:
+            for event in self._watch.stream(watch_function,
+                                            resource_version=self.resource_version,
+                                            timeout_seconds=self.watch_timeout,
+                                            allow_watch_bookmarks=True,
+                                            **self.list_kwargs):
+                if self._stopped.is_set():
+                    break
+                obj = event['object']
+                if event['type'] == 'DELETED':
+                    self._remove(
+                        self.key(obj.metadata.name, obj.metadata.namespace))
+                elif event['type'] in ['ADDED', 'MODIFIED']:
+                    self._store(obj)
+                # BOOKMARK events only move the resourceVersion on
+                self.resource_version = obj.metadata.resource_version
+        finally:
+            self._watch.stop()
+            self._watch = None
+            self._response = None
+
+    def _run(self):
+        """ list, then keep watching until stopped """
+        relist = True
+        while not self._stopped.is_set():
+            try:
+                if relist:
+                    self._list()
+                    relist = False
+                self._watch_stream()
+            except Exception as e:
+                if self._stopped.is_set():
+                    # stop() closed the stream under us
+                    break
+                if getattr(e, 'status', None) == KUBERNETES_INFORMER_GONE_STATUS:
+                    logger.debug(
+                        "Informer watch version expired, relisting")
+                else:
+                    logger.warning(
+                        "Informer list/watch failed, relisting: %s", e)
+                    self._stopped.wait(KUBERNETES_INFORMER_RETRY_INTERVAL)
+                relist = True
@@ -0,0 +1,364 @@
+"""
+
+Kubernetes manifest set workload plugin
+
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable
+
+import yaml
+
+from uctt.plugin import Type
+from uctt.fixtures import Fixtures
+from uctt.workload import WorkloadBase
+
+logger = logging.getLogger('uctt.contrib.kubernetes.workload.manifests')
+
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_LABEL = 'kubernetes'
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_BASE = 'workload.manifests'
+
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_MANIFESTS = 'manifests'
+""" Config key for a list of manifest dicts """
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_PATH = 'path'
+""" Config key for a manifest file, or directory of manifest files """
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_NAMESPACE = 'namespace'
+""" Config key for the namespace of namespaced manifests which have none """
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_CONCURRENCY = 'concurrency'
+""" Config key for how many manifests can be applied/deleted at the same time """
+KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_FIELD_MANAGER = 'field_manager'
+""" Config key for the server side apply field manager """
+
+KUBERNETES_MANIFESTS_WORKLOAD_DEFAULT_CONCURRENCY = 8
+KUBERNETES_MANIFESTS_WORKLOAD_DEFAULT_FIELD_MANAGER = 'uctt'
+KUBERNETES_MANIFESTS_WORKLOAD_FILE_EXTENSIONS = ['.yaml', '.yml', '.json']
+""" manifest file extensions read from a manifest directory """
+
+KUBERNETES_KIND_LEVELS = [
+    ['Namespace', 'CustomResourceDefinition',
+        'PriorityClass', 'StorageClass', 'IngressClass'],
+    ['ServiceAccount', 'ClusterRole', 'Role', 'ConfigMap', 'Secret',
+        'PersistentVolume', 'LimitRange', 'ResourceQuota'],
+    ['ClusterRoleBinding', 'RoleBinding', 'PersistentVolumeClaim', 'Service'],
+    ['Deployment', 'StatefulSet', 'DaemonSet',
+        'ReplicaSet', 'Job', 'CronJob', 'Pod'],
+    ['Ingress', 'HorizontalPodAutoscaler', 'PodDisruptionBudget', 'NetworkPolicy']
+]
+""" dependency levels of kinds: each level only needs kinds from earlier levels
+
+Kinds which are not listed (e.g. custom resources) go in a final level.
+"""
+
+
+class KubernetesManifestsWorkloadError(Exception):
+    """ One or more manifests failed to apply or delete """
+
+    def __init__(self, operation: str, errors: Dict[str, Exception]):
+        """
+
+        Parameters:
+        -----------
+
+        operation (str) : the workload operation that was run
+
+        errors (Dict[str, Exception]) : the exception raised for each
+            manifest that failed, keyed by "Kind/namespace/name"
+
+        """
+        self.operation = operation
+        self.errors = errors
+        """ exceptions keyed by manifest key """
+        super().__init__("{} kubernetes manifest(s) failed to {}: {}".format(len(errors), operation, "; ".join(
+            "[{}] {}".format(key, error) for key, error in errors.items())))
+
+
+def load_manifests(path: str) -> List[Dict[str, Any]]:
+    """ Read manifests from a yaml/json file, or a directory of them
+
+    Files are read in name order, and can contain multiple yaml documents.
+    Kubernetes "List" documents are expanded into their items.
+
+    Parameters:
+    -----------
+
+    path (str) : manifest file or directory path
+
+    Returns:
+    --------
+
+    List of manifest dicts
+
+    """
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                 if os.path.splitext(name)[1] in KUBERNETES_MANIFESTS_WORKLOAD_FILE_EXTENSIONS]
+    else:
+        paths = [path]
+
+    manifests = []
+    for manifest_path in paths:
+        with open(manifest_path) as manifest_file:
+            for document in yaml.safe_load_all(manifest_file):
+                if not document:
+                    continue
+                if document.get('kind', '').endswith('List') and 'items' in document:
+                    manifests.extend(document['items'])
+                else:
+                    manifests.append(document)
+    return manifests
+
+
+def manifest_levels(manifests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """ Group manifests into kind dependency levels
+
+    @see KUBERNETES_KIND_LEVELS
+
+    Returns:
+    --------
+
+    List of manifest lists, in apply order, without empty levels.  Manifest
+    order is kept inside a level.
+
+    """
+    kind_level = {kind: index for index, kinds in enumerate(
+        KUBERNETES_KIND_LEVELS) for kind in kinds}
+    levels = [[] for index in range(len(KUBERNETES_KIND_LEVELS) + 1)]
+    for manifest in manifests:
+        levels[kind_level.get(manifest.get('kind'), len(
+            KUBERNETES_KIND_LEVELS))].append(manifest)
+    return [level for level in levels if level]
+
+
+class KubernetesManifestsWorkloadPlugin(WorkloadBase):
+    """ Kubernetes manifest set workload class
+
+    Applies a set of kubernetes manifests of any kind:
+
+    ```
+    workload:
+      manifests:
+        namespace: my-test
+        path: path/to/manifests
+        manifests:
+        - apiVersion: v1
+          kind: ConfigMap
+          ...
+        concurrency: 8
+    ```
+
+    Manifests come from the `manifests` list and/or the `path` file or
+    directory.  They are grouped by kind into dependency levels (namespaces
+    before config before services before workloads), and each level is
+    applied concurrently using server side apply.  destroy() deletes the
+    levels in reverse order.
+
+    """
+
+    def __init__(self, environment, instance_id,
+                 label: str = KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_LABEL, base: Any = KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_BASE):
+        """ Run the super constructor but also set class properties
+
+        Parameters:
+        -----------
+
+        label (str) : configerus load label for the workload config
+
+        base (str|List) : configerus get key for the workload config
+
+        """
+        WorkloadBase.__init__(self, environment, instance_id)
+
+        self.config_label = label
+        """ configerus load label that should contain all of the config """
+        self.config_base = base
+        """ configerus get key that should contain all of the workload config """
+
+        self.kubernetes_client_fixture = None
+        self.applied = []
+        """ applied objects, in apply order """
+
+    def set_fixtures(self, fixtures: Fixtures):
+        """ Retrieve fixtures from a set of Fixtures
+
+        Parameters:
+        -----------
+
+        fixtures (Fixtures) : a set of fixtures that this workload will use to
+            retrieve a kubernetes client plugin.
+
+        """
+
+        self.kubernetes_client_fixture = fixtures.get_fixture(
+            type=Type.CLIENT, plugin_id='uctt_kubernetes')
+
+    def _config(self, key: str, default: Any = None) -> Any:
+        """ get an optional workload config value """
+        workload_config = self.environment.config.load(self.config_label)
+        value = workload_config.get(
+            [self.config_base, key], exception_if_missing=False)
+        return default if value is None else value
+
+    def manifests(self) -> List[Dict[str, Any]]:
+        """ get all of the configured manifests """
+        manifests = list(self._config(
+            KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_MANIFESTS, []))
+        path = self._config(KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_PATH)
+        if path:
+            manifests.extend(load_manifests(path))
+        return manifests
+
+    def _manifest_key(self, manifest: Dict[str, Any]) -> str:
+        """ readable Kind/namespace/name key for a manifest """
+        metadata = manifest.get('metadata', {})
+        return '/'.join(part for part in [manifest.get('kind', ''), metadata.get(
+            'namespace', ''), metadata.get('name', '')] if part)
+
+    def _run_levels(self, operation: str, levels: List[List[Dict[str, Any]]], run,
+                    done: Callable[[Dict[str, Any]], Any] = None) -> List[Any]:
+        """ run an operation on each manifest, a level at a time
+
+        Manifests in a level run concurrently.  If any manifest in a level
+        fails, the following levels are not run.
+
+        done(manifest) is called from this thread for each manifest which
+        succeeded, in manifest order, before the next level starts.
+
+        Returns:
+        --------
+
+        List of the operation results, in manifest order
+
+        Raises:
+        -------
+
+        KubernetesManifestsWorkloadError for the failed manifests
+
+        """
+        concurrency = self._config(KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_CONCURRENCY,
+                                   KUBERNETES_MANIFESTS_WORKLOAD_DEFAULT_CONCURRENCY)
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for level in levels:
+                futures = [(manifest, executor.submit(run, manifest))
+                           for manifest in level]
+                errors = {}
+                for manifest, future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        errors[self._manifest_key(manifest)] = e
+                        continue
+                    if done is not None:
+                        done(manifest)
+                if errors:
+                    raise KubernetesManifestsWorkloadError(
+                        operation, errors) from next(iter(errors.values()))
+        return results
+
+    def _resource(self, dynamic, manifest: Dict[str, Any]):
+        """ find the dynamic api resource and namespace for a manifest """
+        resource = dynamic.resources.get(
+            api_version=manifest['apiVersion'], kind=manifest['kind'])
+        namespace = None
+        if resource.namespaced:
+            namespace = manifest.get('metadata', {}).get('namespace') or self._config(
+                KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_NAMESPACE, 'default')
+        return resource, namespace
+
+    def apply(self):
+        """ Apply all of the manifests
+
+        @NOTE Needs a kubernetes client fixture to run.  Use .set_fixtures() first
+
+        Returns:
+        --------
+
+        List of the applied objects (as dicts), in apply order
+
+        """
+        if self.kubernetes_client_fixture is None:
+            raise ValueError(
+                "No kubernetes client was attached to the workload before exec()")
+
+        dynamic = self.kubernetes_client_fixture.plugin.get_dynamic_client()
+        field_manager = self._config(KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_FIELD_MANAGER,
+                                     KUBERNETES_MANIFESTS_WORKLOAD_DEFAULT_FIELD_MANAGER)
+
+        def server_side_apply(manifest: Dict[str, Any]):
+            resource, namespace = self._resource(dynamic, manifest)
+            name = manifest['metadata']['name']
+            logger.debug("Applying kubernetes manifest %s",
+                         self._manifest_key(manifest))
+            # call the api directly, as not all kubernetes SDK versions can
+            # make apply patches.  JSON is valid yaml for the apply body.
+            applied = dynamic.client.call_api(
+                resource.path(name=name, namespace=namespace), 'PATCH',
+                query_params=[('fieldManager', field_manager),
+                              ('force', 'true')],
+                header_params={'Content-Type': 'application/apply-patch+yaml',
+                               'Accept': 'application/json'},
+                body=json.dumps(manifest),
+                auth_settings=['BearerToken'],
+                response_type='object',
+                _return_http_data_only=True)
+            return applied
+
+        # applied is kept in manifest order, not completion order, so that
+        # destroy() deletes in reverse level order
+        return self._run_levels(
+            'apply', manifest_levels(self.manifests()), server_side_apply, done=self.applied.append)
+
+    def destroy(self):
+        """ Delete the manifest objects, in reverse level order
+
+        If nothing was applied by this plugin, then the configured manifests
+        are deleted (we could be cleaning up previous runs).  Objects which
+        are already gone are ignored.
+
+        """
+        if self.kubernetes_client_fixture is None:
+            raise ValueError(
+                "No kubernetes client was attached to the workload before exec()")
+
+        dynamic = self.kubernetes_client_fixture.plugin.get_dynamic_client()
+        manifests = self.applied if self.applied else self.manifests()
+
+        def delete(manifest: Dict[str, Any]):
+            resource, namespace = self._resource(dynamic, manifest)
+            logger.debug("Deleting kubernetes manifest %s",
+                         self._manifest_key(manifest))
+            try:
+                return resource.delete(name=manifest['metadata']['name'], namespace=namespace,
+                                       body={'propagationPolicy': 'Foreground'})
+            except Exception as e:
+                # kubernetes NotFound, without importing the kubernetes SDK
+                if getattr(e, 'status', None) != 404:
+                    raise
+
+        levels = [list(reversed(level))
+                  for level in reversed(manifest_levels(manifests))]
+        results = self._run_levels('delete', levels, delete)
+        self.applied = []
+        return results
+
+    def info(self):
+        """ Return dict data about this plugin for introspection """
+        return {
+            'workload': {
+                'manifests': {
+                    'namespace': self._config(KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_NAMESPACE),
+                    'path': self._config(KUBERNETES_MANIFESTS_WORKLOAD_CONFIG_KEY_PATH),
+                    'levels': [[self._manifest_key(manifest) for manifest in level] for level in manifest_levels(self.manifests())],
+                    'applied': len(self.applied)
+                },
+                'required_fixtures': {
+                    'kubernetes': {
+                        'type': Type.CLIENT.value,
+                        'plugin_id': 'uctt_kubernetes'
+                    }
+                }
+            }
+        }
@@ -4,11 +4,23 @@ Terraform UCTT provisioner plugin
 
 """
 
+import asyncio
+import collections
+import copy
+import fcntl
+import hashlib
+import inspect
 import logging
 import json
 import os
+import re
+import shutil
+import stat
 import subprocess
-from typing import Dict, List, Any
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable
 
 from configerus.loaded import LOADED_KEY_ROOT
 from configerus.contrib.jsonschema.validate import PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL
@@ -38,6 +50,15 @@ TERRAFORM_PROVISIONER_DEFAULT_VARS_FILE = 'uctt_terraform.tfvars.json'
 """ Default vars file if none was specified """
 TERRAFORM_PROVISIONER_DEFAULT_STATE_SUBPATH = 'mtt-state'
 """ Default vars file if none was specified """
+TERRAFORM_PROVISIONER_CONFIG_PLUGIN_CACHE_ENABLED_KEY = 'plugin_cache.enabled'
+""" config key to turn on the shared terraform provider plugin cache """
+TERRAFORM_PROVISIONER_CONFIG_PLUGIN_CACHE_PATH_KEY = 'plugin_cache.path'
+""" config key for the shared terraform provider plugin cache path """
+TERRAFORM_PROVISIONER_DEFAULT_PLUGIN_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join('~', '.cache')),
+    'uctt',
+    'terraform-plugins')
+""" Default shared plugin cache path if the cache is enabled without a path """
 
 TERRAFORM_VALIDATE_JSONSCHEMA = {
     'type': 'object',
@@ -69,6 +90,13 @@ TERRAFORM_VALIDATE_JSONSCHEMA = {
         },
         'vars': {
             'type': 'object'
+        },
+        'plugin_cache': {
+            'type': 'object',
+            'properties': {
+                'enabled': {'type': 'boolean'},
+                'path': {'type': 'string'}
+            }
         }
     }
 }
@@ -108,6 +136,13 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
     You can override where Terraform vars/state files are written to allow sharing
     of a plan across test suites.
 
+    ### Provider plugin cache
+
+    Many provisioners, or many jobs sharing a plan, can share a single
+    terraform provider plugin cache (TF_PLUGIN_CACHE_DIR) so that providers are
+    only downloaded once.  Set `plugin_cache.path` in config, or set
+    `plugin_cache.enabled` to use a default path in the user cache.
+
     """
 
     def __init__(self, environment, instance_id,
@@ -192,13 +227,27 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
                 vars_path = os.path.join(self.root_path, vars_path)
             vars_path = os.path.abspath(vars_path)
 
+        plugin_cache_path = self.terraform_config.get([self.terraform_config_base, TERRAFORM_PROVISIONER_CONFIG_PLUGIN_CACHE_PATH_KEY],
+                                                      exception_if_missing=False)
+        """ shared terraform provider plugin cache path """
+        if not plugin_cache_path and self.terraform_config.get([self.terraform_config_base, TERRAFORM_PROVISIONER_CONFIG_PLUGIN_CACHE_ENABLED_KEY],
+                                                               exception_if_missing=False):
+            plugin_cache_path = os.path.expanduser(
+                TERRAFORM_PROVISIONER_DEFAULT_PLUGIN_CACHE_PATH)
+        if plugin_cache_path and not os.path.isabs(plugin_cache_path):
+            if self.root_path:
+                plugin_cache_path = os.path.join(
+                    self.root_path, plugin_cache_path)
+            plugin_cache_path = os.path.abspath(plugin_cache_path)
+
         logger.info("Creating Terraform client")
 
         self.tf = TerraformClient(
             working_dir=os.path.realpath(self.working_dir),
             state_path=os.path.realpath(state_path),
             vars_path=os.path.realpath(vars_path),
-            variables=self.vars)
+            variables=self.vars,
+            plugin_cache_dir=os.path.realpath(plugin_cache_path) if plugin_cache_path else '')
         """ TerraformClient instance """
 
         # if the cluster is already provisioned then we can get outputs from it
@@ -216,13 +265,15 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
         info['plugin'] = {
             'terraform_config_label': plugin.terraform_config_label,
             'terraform_config_base': plugin.terraform_config_base
-        },
+        }
         info['client'] = {
             'vars': client.vars,
+            'vars_hash': client.vars_hash(),
             'working_dir': client.working_dir,
             'state_path': client.state_path,
             'vars_path': client.vars_path,
-            'terraform_bin': client.terraform_bin
+            'terraform_bin': client.terraform_bin,
+            'plugin_cache': client.plugin_cache_stats()
         }
 
         fixtures = {}
@@ -239,7 +290,7 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
                 plugin_info = fixture.plugin.info()
                 if isinstance(plugin_info, dict):
                     fixture_info.update(plugin_info)
-            fixtures[fixture.instance_id] = plugin_info
+            fixtures[fixture.instance_id] = fixture_info
         info['fixtures'] = fixtures
 
         info['helper'] = {
@@ -280,7 +331,7 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
         """ Remove terraform run resources from the plan """
         logger.info("Running Terraform CLEAN")
         dot_terraform = os.path.join(self.working_dir, '.terraform')
-        if os.isdir(dot_terraform):
+        if os.path.isdir(dot_terraform):
             shutil.rmtree(dot_terraform)
 
     """ Cluster Interaction """
@@ -322,10 +373,12 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
             # we only know how to create 2 kinds of outputs
             output_sensitive = bool(output_struct['sensitive'])
             """ Whether or not the output contains sensitive data """
-            output_type = output_struct['type'][0]
-            """ String output primitive type (usually string|object|number) """
-            output_spec = output_struct['type'][1]
-            """ A structured spec for the type """
+            # primitive types are a string, complex types are [type, spec]
+            if isinstance(output_struct['type'], list):
+                output_type, output_spec = output_struct['type']
+            else:
+                output_type, output_spec = output_struct['type'], None
+            """ String output primitive type (usually string|object|number) and spec """
             output_value = output_struct['value']
             """ output value """
 
@@ -358,11 +411,129 @@ class TerraformProvisionerPlugin(ProvisionerBase, UCCTFixturesPlugin):
                     fixture.plugin.set_text(str(output_value))
 
 
-class TerraformClient:
-    """ Shell client for running terraform using subprocess """
+TERRAFORM_CLIENT_DEFAULT_PLAN_FILE = 'uctt.tfplan'
+""" Default saved plan file name, kept next to the state """
+TERRAFORM_CLIENT_STATE_VERSION = 4
+""" terraform state file format version which we can read outputs from """
+TERRAFORM_CLIENT_INIT_LOCK_FILE = '.terraform.uctt.init.lock'
+""" lock file in the plan folder used to serialize terraform init """
+TERRAFORM_CLIENT_INIT_MARKER_FILE = 'uctt_init.json'
+""" marker file in the plan .terraform folder recording a successful init """
+TERRAFORM_CLIENT_PLUGIN_CACHE_LOCK_FILE = '.uctt.lock'
+""" lock file in the plugin cache used to serialize inits which write to it """
+TERRAFORM_CLIENT_PLUGIN_CACHE_PATTERNS = {
+    'hits': re.compile(r'^- Using \S+ v\S+ from the shared cache directory'),
+    'misses': re.compile(r'^- Installing \S+ v\S+'),
+    'reused': re.compile(r'^- Using previously-installed \S+ v\S+')
+}
+""" terraform init output patterns for provider installation from the cache """
+TERRAFORM_CLIENT_INIT_LOCK_TIMEOUT = 600
+""" Default seconds to wait for another job to finish running init """
+TERRAFORM_CLIENT_LOCK_POLL_INTERVAL = 0.2
+""" seconds between attempts to acquire a busy lock """
+TERRAFORM_CLIENT_STREAM_BUFFER_LINES = 1000
+""" Default number of output lines buffered for an output stream consumer """
+TERRAFORM_CLIENT_READ_CHUNK_SIZE = 65536
+""" bytes read from the terraform subprocess pipes at a time """
+TERRAFORM_CLIENT_STDERR_TAIL_LINES = 100
+""" number of stderr lines kept to report when a terraform command fails """
+
+
+def print_output_handler(stream: str, line: str):
+    """ Pass terraform subprocess output through to our stdout/stderr
+
+    This is the default output handler, which keeps terraform output on the
+    console as if terraform had been run directly.
+
+    """
+    print(line, file=sys.stderr if stream == 'stderr' else sys.stdout, flush=True)
+
+
+class TerraformFileLock:
+    """ Advisory file lock shared across processes, as an async context manager
+
+    ```
+    async with TerraformFileLock(path, exclusive=True, timeout=300):
+        ...
+    ```
+
+    Uses fcntl.flock, so any number of shared holders or one exclusive holder
+    can hold the lock.  The lock is released if the holding process dies, so
+    there are no stale lock files to clean up, and the lock file is never
+    removed.  Acquiring polls, so that the event loop is not blocked.
+
+    """
+
+    def __init__(self, path: str, exclusive: bool = True,
+                 timeout: float = TERRAFORM_CLIENT_INIT_LOCK_TIMEOUT):
+        """
+
+        Parameters:
+        -----------
+
+        path (str) : lock file path, which will be created if needed
+
+        exclusive (bool) : take an exclusive lock instead of a shared lock
+
+        timeout (float) : seconds to wait for the lock before giving up
+
+        """
+        self.path = path
+        self.exclusive = exclusive
+        self.timeout = timeout
+        self.lock_file = None
+
+    async def __aenter__(self):
+        """ acquire the lock
+
+        Raises:
+        -------
+
+        A BlockingIOError if the lock could not be acquired before the timeout
+
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.lock_file = open(self.path, 'a')
+        operation = (fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while True:
+            try:
+                fcntl.flock(self.lock_file.fileno(), operation)
+                return self
+            except BlockingIOError:
+                if loop.time() >= deadline:
+                    self.lock_file.close()
+                    self.lock_file = None
+                    raise BlockingIOError(
+                        "Timed out waiting for terraform lock: {}".format(self.path))
+                await asyncio.sleep(TERRAFORM_CLIENT_LOCK_POLL_INTERVAL)
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        """ release the lock """
+        fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+        self.lock_file.close()
+        self.lock_file = None
+
+
+class AsyncTerraformClient:
+    """ asyncio shell client for running terraform as a subprocess
+
+    All of the terraform commands are coroutines, so a long running apply or
+    destroy can run alongside other work in the same event loop.
+
+    Terraform stdout/stderr is read line by line as it is produced and passed
+    to an output handler, called as handler(stream, line) where stream is
+    either 'stdout' or 'stderr' and line has no line ending.  If the handler
+    returns an awaitable then it is awaited before any more output is read, so
+    a slow consumer holds back terraform instead of output piling up in memory.
+
+    """
 
     def __init__(self, working_dir: str, state_path: str,
-                 vars_path: str, variables: Dict[str, str]):
+                 vars_path: str, variables: Dict[str, str], output_handler: Callable[[str, str], Any] = None,
+                 plugin_cache_dir: str = '', plan_path: str = ''):
         """
 
         Parameters:
@@ -378,74 +549,319 @@ class TerraformClient:
         variables (Dict[str,str]) : terraform variables dict which will be
             written to a vars file.
 
+        output_handler (Callable[[str, str], Any]) : default handler for
+            terraform command output.  If omitted then output is printed to
+            stdout/stderr.
+
+        plugin_cache_dir (str) : optional shared provider plugin cache path,
+            passed to terraform as TF_PLUGIN_CACHE_DIR.  The path is created
+            if needed.
+
+        plan_path (str) : path where .plan() saves the plan for .apply().
+            Defaults to a file next to the state file.
+
         """
         self.vars = variables
         self.working_dir = working_dir
         self.state_path = state_path
         self.vars_path = vars_path
+        self.plan_path = plan_path if plan_path else os.path.join(
+            os.path.dirname(state_path), TERRAFORM_CLIENT_DEFAULT_PLAN_FILE)
+        """ saved plan file path @see plan """
+        self.output_handler = output_handler if output_handler is not None else print_output_handler
+        """ default handler for terraform command output """
 
         self.terraform_bin = 'terraform'
-        pass
+
+        self._state_outputs_cache = None
+        """ (state file (mtime, size), outputs) parsed from the state file """
+        self.init_lock_timeout = TERRAFORM_CLIENT_INIT_LOCK_TIMEOUT
+        """ seconds to wait for another job running init on the same plan """
+
+        self.plugin_cache_dir = plugin_cache_dir
+        """ shared provider plugin cache path, if any """
+        self._plugin_cache_stats = None
+        """ plugin cache use counted from our last init """
+
+        self._vars_file_cache = None
+        """ (vars file (mtime, size), content hash) for the vars file on disk """
 
     def state(self):
         """ return the terraform state contents """
         try:
-            with open(os.path.join(self.working_dir, 'terraform.tfstate')) as json_file:
+            with open(self.state_path) as json_file:
                 return json.load(json_file)
         except FileNotFoundError:
             logger.debug("Terraform client found no state file")
             return None
 
-    def init(self):
+    def state_outputs(self):
+        """ Read the root module outputs directly from the local state file
+
+        This avoids running `terraform output`, which has to load the
+        providers.  The parsed outputs are cached until the state file mtime or
+        size changes.
+
+        Returns:
+        --------
+
+        Dict of outputs in the `terraform output -json` format, which is empty
+        if there is no state yet, or None if the outputs cannot be read from
+        local state because the state is kept in a remote backend or the state
+        file is in a format that we don't know.
+
+        """
+        if self._remote_backend():
+            return None
+
+        try:
+            state_stat = os.stat(self.state_path)
+        except FileNotFoundError:
+            logger.debug("Terraform client found no state file")
+            return {}
+        state_key = (state_stat.st_mtime_ns, state_stat.st_size)
+        """ state file version used to validate the cache """
+
+        if self._state_outputs_cache is None or self._state_outputs_cache[0] != state_key:
+            try:
+                with open(self.state_path) as json_file:
+                    state = json.load(json_file)
+            except (OSError, ValueError) as e:
+                logger.debug("Terraform client could not read state: %s", e)
+                return None
+
+            if not isinstance(state, dict) or state.get(
+                    'version') != TERRAFORM_CLIENT_STATE_VERSION:
+                logger.debug("Terraform client doesn't know the state format")
+                return None
+
+            self._state_outputs_cache = (state_key, {
+                name: {
+                    'sensitive': bool(output.get('sensitive', False)),
+                    'type': output.get('type'),
+                    'value': output.get('value')
+                } for name, output in state.get('outputs', {}).items()})
+
+        return copy.deepcopy(self._state_outputs_cache[1])
+
+    def _remote_backend(self) -> bool:
+        """ Is the plan initialized with a remote state backend
+
+        Terraform init records the configured backend in .terraform in the
+        plan, in which case the local state path is not used.
+
+        """
+        try:
+            with open(os.path.join(self.working_dir, '.terraform', 'terraform.tfstate')) as json_file:
+                backend = json.load(json_file).get('backend') or {}
+        except (OSError, ValueError, AttributeError):
+            return False
+        return backend.get('type', 'local') != 'local'
+
+    async def init(self, output_handler: Callable[[str, str], Any] = None, force: bool = False):
         """ run terraform init
 
         init is something that can be run once for a number of jobs in parallel
-        we lock the process. If a lock is in place, then we just wait for an
-        unlock and return.
-        Other terraform actions lock themselves, and we want to fail if the
-        operation is locked, but here we just want to skip it.
+        sharing a plan, so we only run it if the plan is not already
+        initialized (@see is_initialized) and we hold an exclusive lock on the
+        plan while running it.  Jobs which find init running wait for it, and
+        then skip their own init.
+
+        Parameters:
+        -----------
+
+        output_handler (Callable[[str, str], Any]) : handler for the command
+            output.  Defaults to the client output handler.
+
+        force (bool) : run init even if the plan is already initialized
+
+        Raises:
+        -------
+
+        A BlockingIOError if the init lock could not be acquired before the
+        client init_lock_timeout.
 
         """
+        lock_path = os.path.join(
+            self.working_dir, TERRAFORM_CLIENT_INIT_LOCK_FILE)
+
         try:
-            lockfile = os.path.join(
-                os.path.dirname(
-                    self.state_path),
-                '.terraform.mtt_mirantis.init.lock')
-            if os.path.exists(lockfile):
-                logger.info(
-                    "terraform .init lock file found.  Skipping init, but waiting for it to finish")
-                time_to_wait = 120
-                time_counter = 0
-                while not os.path.exists(lockfile):
-                    time.sleep(5)
-                    time_counter += 5
-                    if time_counter > time_to_wait:
-                        raise BlockingIOError(
-                            "Timed out when waiting for init lock to go away")
-            else:
-                os.makedirs(
-                    os.path.dirname(
-                        os.path.abspath(lockfile)),
-                    exist_ok=True)
-                with open(lockfile, 'w') as lockfile_object:
-                    lockfile_object.write(
-                        "{} is running init".format(str(os.getpid())))
-                try:
-                    self._run(['init'], with_vars=False, with_state=False)
-                finally:
-                    os.remove(lockfile)
+            if not force:
+                async with TerraformFileLock(lock_path, exclusive=False, timeout=self.init_lock_timeout):
+                    if self.is_initialized():
+                        logger.info(
+                            "terraform plan is already initialized, skipping init")
+                        return
+
+            async with TerraformFileLock(lock_path, exclusive=True, timeout=self.init_lock_timeout):
+                # someone else may have run init while we waited for the lock
+                if not force and self.is_initialized():
+                    logger.info(
+                        "terraform plan was initialized while we waited, skipping init")
+                    return
+
+                if self.plugin_cache_dir:
+                    # terraform does not make plugin cache writes safe for
+                    # concurrent inits, so we serialize them.
+                    async with TerraformFileLock(os.path.join(self.plugin_cache_dir, TERRAFORM_CLIENT_PLUGIN_CACHE_LOCK_FILE),
+                                                 exclusive=True, timeout=self.init_lock_timeout):
+                        await self._run(['init'], with_vars=False, with_state=False,
+                                        output_handler=self._plugin_cache_counter(output_handler))
+                else:
+                    await self._run(['init'], with_vars=False, with_state=False, output_handler=output_handler)
+                self._write_init_marker()
         except subprocess.CalledProcessError as e:
             logger.error(
                 "Terraform client failed to run init in %s: %s",
                 self.working_dir,
-                e.output)
+                e.stderr)
             raise Exception("Terraform client failed to run init") from e
 
-    def apply(self):
-        """ Apply a terraform plan """
+    def plugin_cache_stats(self) -> Dict[str, Any]:
+        """ Report shared provider plugin cache use for the last init
+
+        The counts are for providers found in the cache (hits), providers which
+        had to be downloaded (misses) and providers which were already
+        installed in the plan (reused).  If this client has not run init then
+        the counts from the init recorded in the plan marker are used.
+
+        Returns:
+        --------
+
+        Dict with the plugin cache path and counts, or just the empty path if
+        no plugin cache is used.
+
+        """
+        stats = {'path': self.plugin_cache_dir}
+        if not self.plugin_cache_dir:
+            return stats
+
+        counts = self._plugin_cache_stats
+        if counts is None:
+            try:
+                with open(os.path.join(self.working_dir, '.terraform', TERRAFORM_CLIENT_INIT_MARKER_FILE)) as marker_file:
+                    counts = json.load(marker_file).get('plugin_cache')
+            except (OSError, ValueError, AttributeError):
+                counts = None
+        stats.update(counts or {'hits': 0, 'misses': 0, 'reused': 0})
+        return stats
+
+    def _plugin_cache_counter(self, output_handler: Callable[[str, str], Any] = None):
+        """ wrap an init output handler to count plugin cache hits/misses """
+        if output_handler is None:
+            output_handler = self.output_handler
+        counts = {'hits': 0, 'misses': 0, 'reused': 0}
+        self._plugin_cache_stats = counts
+
+        def handler(stream: str, line: str):
+            if stream == 'stdout':
+                for key, pattern in TERRAFORM_CLIENT_PLUGIN_CACHE_PATTERNS.items():
+                    if pattern.search(line):
+                        counts[key] += 1
+                        break
+            return output_handler(stream, line)
+        return handler
+
+    def _env(self):
+        """ environment for terraform subprocesses, None to inherit ours """
+        if not self.plugin_cache_dir:
+            return None
+        os.makedirs(self.plugin_cache_dir, exist_ok=True)
+        env = os.environ.copy()
+        env['TF_PLUGIN_CACHE_DIR'] = self.plugin_cache_dir
+        return env
+
+    def is_initialized(self) -> bool:
+        """ Has terraform init been run for the current plan
+
+        After a successful init we keep a marker in the plan .terraform folder
+        with a fingerprint of the plan files that init depends on.  The plan
+        is initialized if the marker fingerprint matches the current files.
+
+        """
         try:
-            self._run(['apply', '-auto-approve'], with_state=True,
-                      with_vars=True, return_output=False)
+            with open(os.path.join(self.working_dir, '.terraform', TERRAFORM_CLIENT_INIT_MARKER_FILE)) as marker_file:
+                marker = json.load(marker_file)
+        except (OSError, ValueError):
+            return False
+        return isinstance(marker, dict) and marker.get(
+            'fingerprint') == self.init_fingerprint()
+
+    def init_fingerprint(self) -> str:
+        """ Fingerprint the plan files which terraform init depends on
+
+        init installs providers and modules declared in the root module files,
+        and pins providers in the dependency lock file, so we use the name,
+        mtime and size of those files.
+
+        """
+        entries = []
+        for name in sorted(os.listdir(self.working_dir)):
+            if name.endswith(('.tf', '.tf.json')) or name == '.terraform.lock.hcl':
+                file_stat = os.stat(os.path.join(self.working_dir, name))
+                entries.append([name, file_stat.st_mtime_ns, file_stat.st_size])
+        return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()
+
+    def _write_init_marker(self):
+        """ record that the plan is initialized @see is_initialized """
+        dot_terraform = os.path.join(self.working_dir, '.terraform')
+        os.makedirs(dot_terraform, exist_ok=True)
+        with open(os.path.join(dot_terraform, TERRAFORM_CLIENT_INIT_MARKER_FILE), 'w') as marker_file:
+            json.dump({
+                'fingerprint': self.init_fingerprint(),
+                'pid': os.getpid(),
+                'plugin_cache': self._plugin_cache_stats
+            }, marker_file)
+
+    async def plan(self, output_handler: Callable[[str, str], Any] = None):
+        """ Check a terraform plan
+
+        The plan is saved to the client plan file, along with a key for the
+        inputs that it was made from, so that a following apply can use it if
+        nothing has changed (@see plan_key)
+
+        """
+        plan_key = self.plan_key()
+        self._remove_saved_plan()
+        os.makedirs(os.path.dirname(os.path.abspath(self.plan_path)), exist_ok=True)
+        try:
+            await self._run(['plan'], ['-out={}'.format(self.plan_path)], with_state=True,
+                            with_vars=True, output_handler=output_handler)
+        except subprocess.CalledProcessError as e:
+            logger.error(
+                "Terraform client failed to run plan in %s: %s",
+                self.working_dir,
+                e.stderr)
+            raise Exception(
+                "Terraform client failed to run plan : {}".format(e)) from e
+
+        with open(self.plan_path + '.json', 'w') as key_file:
+            json.dump({'key': plan_key}, key_file)
+
+    async def apply(self, output_handler: Callable[[str, str], Any] = None, use_saved_plan: bool = True):
+        """ Apply a terraform plan
+
+        If a saved plan from .plan() is still valid, then it is applied
+        directly, instead of terraform planning again.
+
+        Parameters:
+        -----------
+
+        output_handler (Callable[[str, str], Any]) : handler for the command
+            output.  Defaults to the client output handler.
+
+        use_saved_plan (bool) : apply a valid saved plan if there is one
+
+        """
+        try:
+            if use_saved_plan and self.has_saved_plan():
+                logger.info("Applying saved terraform plan %s", self.plan_path)
+                # vars are baked into the saved plan, and can't be passed again
+                await self._run(['apply', '-auto-approve'], [self.plan_path], with_state=True,
+                                with_vars=False, output_handler=output_handler)
+            else:
+                await self._run(['apply', '-auto-approve'], with_state=True,
+                                with_vars=True, output_handler=output_handler)
         except subprocess.CalledProcessError as e:
             logger.error(
                 "Terraform client failed to run apply in %s: %s",
@@ -453,23 +869,81 @@ class TerraformClient:
                 e.stderr)
             raise Exception(
                 "Terraform client failed to run : {}".format(e)) from e
+        finally:
+            # any saved plan is stale once the state has been changed
+            self._remove_saved_plan()
 
-    def destroy(self):
-        """ Apply a terraform plan """
+    def has_saved_plan(self) -> bool:
+        """ Is there a saved plan which is valid for the current inputs """
         try:
-            self._run(['destroy', '-auto-approve'], with_state=True,
-                      with_vars=True, return_output=False)
+            with open(self.plan_path + '.json') as key_file:
+                saved_key = json.load(key_file).get('key')
+        except (OSError, ValueError, AttributeError):
+            return False
+        return os.path.exists(self.plan_path) and saved_key == self.plan_key()
+
+    def plan_key(self) -> str:
+        """ Key the inputs to a terraform plan
+
+        A saved plan can only be applied if it was made from the same vars,
+        plan files and state, so the key hashes the vars file contents, the
+        name, mtime and size of the files in the plan folder and the state
+        lineage and serial.
+
+        """
+        excluded = {self.state_path, self.state_path + '.backup', self.vars_path,
+                    self.plan_path, self.plan_path + '.json'}
+        """ files in the plan folder which we write ourselves """
+
+        files = []
+        for root, dirs, names in os.walk(self.working_dir):
+            dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                if path in excluded or (name.startswith('.') and name != '.terraform.lock.hcl'):
+                    continue
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append([os.path.relpath(path, self.working_dir),
+                              file_stat.st_mtime_ns, file_stat.st_size])
+
+        state = self.state() or {}
+        key = {
+            'vars': self.vars_hash(),
+            'files': files,
+            'state': [state.get('lineage'), state.get('serial')]
+        }
+        return hashlib.sha256(json.dumps(
+            key, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _remove_saved_plan(self):
+        """ remove any saved plan and its key """
+        for path in [self.plan_path, self.plan_path + '.json']:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def destroy(self, output_handler: Callable[[str, str], Any] = None):
+        """ Destroy terraform resources in state """
+        try:
+            await self._run(['destroy', '-auto-approve'], with_state=True,
+                            with_vars=True, output_handler=output_handler)
         except subprocess.CalledProcessError as e:
             logger.error(
-                "Terraform client failed to run init in %s: %s",
+                "Terraform client failed to run destroy in %s: %s",
                 self.working_dir,
-                e.output)
+                e.stderr)
             raise Exception("Terraform client failed to run destroy") from e
 
-    def output(self, name: str = ''):
+    async def output(self, name: str = ''):
         """ Retrieve terraform outputs
 
-        Run the terraform output command, to retrieve all or one of the outputs.
+        Outputs are read from the local state file if possible
+        (@see state_outputs) otherwise we run the terraform output command, to
+        retrieve all or one of the outputs.
         Outputs are returned always as json as it is the only way to machine
         parse outputs properly.
 
@@ -481,44 +955,206 @@ class TerraformClient:
 
 
         """
+        outputs = self.state_outputs()
+        if outputs is not None:
+            if not name:
+                return outputs
+            if name in outputs:
+                return outputs[name]['value']
+            raise Exception(
+                "Terraform client failed to retrieve output: no output '{}' in state".format(name))
+
         args = ['output', '-json']
         """ collect subprocess args to pass """
 
         try:
             if name:
-                output = self._run(
+                output = await self._run(
                     args, [name], with_vars=False, return_output=True)
             else:
-                output = self._run(args, with_vars=False, return_output=True)
+                output = await self._run(args, with_vars=False, return_output=True)
         except subprocess.CalledProcessError as e:
             logger.error(
-                "Terraform client failed to run init in %s: %s",
+                "Terraform client failed to run output in %s: %s",
                 self.working_dir,
-                e.output)
+                e.stderr)
             raise Exception(
                 "Terraform client failed to retrieve output") from e
 
         return json.loads(output)
 
+    async def stream(self, args: List[str], append_args: List[str] = [], with_state=True, with_vars=True,
+                     buffer: int = TERRAFORM_CLIENT_STREAM_BUFFER_LINES):
+        """ Run terraform and iterate over its output as it is produced
+
+        ```
+        async for stream, line in tf.stream(['apply', '-auto-approve']):
+            ...
+        ```
+
+        Parameters:
+        -----------
+
+        args, append_args, with_state, with_vars : @see _run
+
+        buffer (int) : maximum number of lines held for the consumer.  When
+            the buffer is full, terraform output is not read until the
+            consumer catches up.
+
+        Returns:
+        --------
+
+        Async iterator of (stream, line) tuples, where stream is 'stdout' or
+        'stderr'
+
+        Raises:
+        -------
+
+        A subprocess.CalledProcessError after the last line if terraform failed.
+        If the consumer stops iterating early, then terraform is killed.
+
+        """
+        queue = asyncio.Queue(maxsize=buffer)
+        finished = object()
+        """ queue marker for the end of the output """
+
+        async def run():
+            cancelled = False
+            try:
+                await self._run(args, append_args, with_state=with_state, with_vars=with_vars,
+                                output_handler=lambda stream, line: queue.put((stream, line)))
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # once cancelled, nobody reads the queue any more, and it may
+                # be full, so the end marker would never be put
+                if not cancelled:
+                    await queue.put(finished)
+
+        task = asyncio.ensure_future(run())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                yield item
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    def vars_hash(self) -> str:
+        """ Return a content hash of the vars file contents for the current vars
+
+        Callers can compare this against a previously kept hash to cheaply
+        detect if the terraform vars have changed.
+
+        """
+        return hashlib.sha256(self._vars_content()).hexdigest()
+
+    def _vars_content(self) -> bytes:
+        """ serialize the vars for the vars file """
+        return json.dumps(self.vars, sort_keys=True, indent=4).encode('utf-8')
+
     def _make_vars_file(self):
-        """ write the vars file """
+        """ write the vars file, if its contents would change
+
+        The file is only written if the serialized vars differ from what is
+        already in the file, so that the file mtime only changes when the vars
+        do.  The file is written to a temp file which is renamed over the vars
+        file, so that the file is never partially written.
+
+        """
         vars_path = self.vars_path
+        content = self._vars_content()
+        content_hash = hashlib.sha256(content).hexdigest()
 
         try:
-            os.makedirs(
-                os.path.dirname(
-                    os.path.abspath(vars_path)),
-                exist_ok=True)
-            with open(vars_path, 'w') as var_file:
-                json.dump(self.vars, var_file, sort_keys=True, indent=4)
+            vars_stat = os.stat(vars_path)
+            vars_key = (vars_stat.st_mtime_ns, vars_stat.st_size)
+            vars_mode = stat.S_IMODE(vars_stat.st_mode)
+        except FileNotFoundError:
+            vars_key = None
+            vars_mode = _new_file_mode()
+        """ vars file version, so that we know if we need to look at it """
+
+        if vars_key is not None:
+            if self._vars_file_cache != (vars_key, content_hash):
+                # we didn't write the current file, so check what is in it
+                try:
+                    with open(vars_path, 'rb') as var_file:
+                        file_hash = hashlib.sha256(var_file.read()).hexdigest()
+                except OSError:
+                    file_hash = None
+                self._vars_file_cache = (vars_key, file_hash)
+
+            if self._vars_file_cache[1] == content_hash:
+                logger.debug("Terraform vars file is unchanged: %s", vars_path)
+                return
+
+        try:
+            vars_dir = os.path.dirname(os.path.abspath(vars_path))
+            os.makedirs(vars_dir, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(
+                dir=vars_dir, prefix='.', suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'wb') as var_file:
+                    var_file.write(content)
+                # mkstemp files are private, so keep the mode of the file we
+                # replace, or give it the mode that open() would have
+                os.chmod(temp_path, vars_mode)
+                os.replace(temp_path, vars_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            vars_stat = os.stat(vars_path)
+            self._vars_file_cache = (
+                (vars_stat.st_mtime_ns, vars_stat.st_size), content_hash)
         except Exception as e:
             raise Exception(
                 "Could not create terraform vars file: {} : {}".format(
                     vars_path, e)) from e
 
-    def _run(self, args: List[str], append_args: List[str] = [
-    ], with_state=True, with_vars=True, return_output=False):
-        """ Run terraform """
+    async def _run(self, args: List[str], append_args: List[str] = [], with_state=True, with_vars=True,
+                   return_output=False, output_handler: Callable[[str, str], Any] = None):
+        """ Run terraform
+
+        Parameters:
+        -----------
+
+        args (List[str]) : terraform command and arguments
+
+        append_args (List[str]) : arguments added after the vars/state args
+
+        with_state (bool) : pass the state path to terraform
+
+        with_vars (bool) : write the vars file and pass it to terraform
+
+        return_output (bool) : capture stdout and return it instead of passing
+            it to the output handler
+
+        output_handler (Callable[[str, str], Any]) : handler for the command
+            output.  Defaults to the client output handler.
+
+        Returns:
+        --------
+
+        The captured stdout if return_output, otherwise None
+
+        Raises:
+        -------
+
+        A subprocess.CalledProcessError if terraform exits with an error, with
+        the last of the stderr output.
+
+        """
+        if output_handler is None:
+            output_handler = self.output_handler
 
         cmd = [self.terraform_bin]
         cmd += args
@@ -531,19 +1167,131 @@ class TerraformClient:
 
         cmd += append_args
 
+        captured = []
+        """ captured stdout lines if we are returning output """
+        stderr_tail = collections.deque(
+            maxlen=TERRAFORM_CLIENT_STDERR_TAIL_LINES)
+        """ last stderr lines, kept for failure reporting """
+
+        def stderr_handler(stream: str, line: str):
+            stderr_tail.append(line)
+            return output_handler(stream, line)
+
         if return_output:
             logger.debug(
                 "running terraform command with output capture: %s",
                 " ".join(cmd))
-            exec = subprocess.run(
-                cmd,
-                cwd=self.working_dir,
-                shell=False,
-                stdout=subprocess.PIPE)
-            exec.check_returncode()
-            return exec.stdout.decode('utf-8')
+            stdout_handler = (lambda stream, line: captured.append(line))
         else:
             logger.debug("running terraform command: %s", " ".join(cmd))
-            exec = subprocess.run(
-                cmd, cwd=self.working_dir, check=True, text=True)
-            exec.check_returncode()
+            stdout_handler = output_handler
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=self.working_dir,
+            env=self._env(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE)
+        try:
+            await asyncio.gather(
+                _pump_lines(process.stdout, 'stdout', stdout_handler),
+                _pump_lines(process.stderr, 'stderr', stderr_handler))
+            returncode = await process.wait()
+        except BaseException:
+            # we were cancelled or the handler failed, so don't leave terraform
+            # running unattended
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode,
+                cmd,
+                output='\n'.join(captured) if return_output else None,
+                stderr='\n'.join(stderr_tail))
+
+        if return_output:
+            return '\n'.join(captured)
+
+
+class TerraformClient(AsyncTerraformClient):
+    """ Shell client for running terraform using subprocess
+
+    Blocking wrappers around the AsyncTerraformClient commands, each of which
+    runs the command coroutine in a new event loop.  If they are called from
+    inside a running event loop, then the command runs in a worker thread, and
+    the calling loop is blocked until it completes; use AsyncTerraformClient
+    there to avoid that.
+
+    """
+
+    def init(self, output_handler: Callable[[str, str], Any] = None, force: bool = False):
+        """ run terraform init @see AsyncTerraformClient.init """
+        return _run_sync(super().init(output_handler=output_handler, force=force))
+
+    def plan(self, output_handler: Callable[[str, str], Any] = None):
+        """ Check a terraform plan @see AsyncTerraformClient.plan """
+        return _run_sync(super().plan(output_handler=output_handler))
+
+    def apply(self, output_handler: Callable[[str, str], Any] = None, use_saved_plan: bool = True):
+        """ Apply a terraform plan @see AsyncTerraformClient.apply """
+        return _run_sync(super().apply(output_handler=output_handler, use_saved_plan=use_saved_plan))
+
+    def destroy(self, output_handler: Callable[[str, str], Any] = None):
+        """ Destroy terraform resources @see AsyncTerraformClient.destroy """
+        return _run_sync(super().destroy(output_handler=output_handler))
+
+    def output(self, name: str = ''):
+        """ Retrieve terraform outputs @see AsyncTerraformClient.output """
+        return _run_sync(super().output(name=name))
+
+
+def _new_file_mode() -> int:
+    """ the mode that open() gives a new file, under the process umask """
+    # the umask can only be read by setting it, so put it straight back
+    umask = os.umask(0o077)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _run_sync(coroutine):
+    """ Run a coroutine to completion from blocking code
+
+    asyncio.run() can't be used when an event loop is already running in this
+    thread, so then the coroutine gets its own loop in a worker thread (where
+    any output handler is also called).
+
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+async def _pump_lines(reader: asyncio.StreamReader, stream: str,
+                      handler: Callable[[str, str], Any]):
+    """ Read a subprocess pipe, passing each line to a handler as it arrives """
+    pending = b''
+    while True:
+        chunk = await reader.read(TERRAFORM_CLIENT_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            await _handle_line(handler, stream, line)
+    if pending:
+        await _handle_line(handler, stream, pending)
+
+
+async def _handle_line(handler: Callable[[str, str], Any],
+                       stream: str, line: bytes):
+    """ decode a line and pass it to the handler, awaiting it if needed """
+    result = handler(stream, line.decode('utf-8', errors='replace').rstrip('\r'))
+    if inspect.isawaitable(result):
+        await result
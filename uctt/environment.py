@@ -10,12 +10,15 @@ mix a bunch of plugin objects of different types together and manage them.
 
 """
 import logging
+import functools
 import random
 import string
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Tuple
 
 from configerus.config import Config
 from configerus.loaded import Loaded, LOADED_KEY_ROOT
+from configerus.plugin import Type as ConfigerusType
 from configerus.validator import ValidationError
 
 from .plugin import (
@@ -32,6 +35,7 @@ from .plugin import (
 from .fixtures import (
     Fixtures,
     Fixture,
+    sort_instance_list,
     UCTT_FIXTURES_CONFIG_FIXTURE_KEY,
     UCTT_FIXTURES_CONFIG_FIXTURES_LABEL)
 
@@ -46,6 +50,25 @@ DEFAULT_PLUGIN_PRIORITY = 70
 FIXTURE_VALIDATION_TARGET_FORMAT_STRING = 'jsonschema:{key}'
 
 
+class FixturesConstructionError(Exception):
+    """ One or more fixtures failed when building a set of fixtures together """
+
+    def __init__(self, errors: Dict[str, Exception]):
+        """
+
+        Parameters:
+        -----------
+
+        errors (Dict[str, Exception]) : the exception raised for each fixture
+            that failed, keyed by instance_id
+
+        """
+        self.errors = errors
+        """ exceptions keyed by fixture instance_id """
+        super().__init__("{} fixture(s) could not be created: {}".format(len(errors), "; ".join(
+            "[{}] {}".format(instance_id, error) for instance_id, error in errors.items())))
+
+
 class Environment:
     """ A testing environment, usually composed of a config and plugins """
 
@@ -65,6 +88,10 @@ class Environment:
         self.fixtures = Fixtures()
         """ fixtures/plugins that can interact with the environment """
         self.default_plugin_priority = DEFAULT_PLUGIN_PRIORITY
+        self.lazy_fixtures = False
+        """ default for building fixture plugins on first access @see add_fixture """
+        self.fixture_workers = 1
+        """ default number of threads used to build sets of fixtures """
 
     def plugin_priority(self, delta: int = 0):
         """ Return a default pluging priority with a delta """
@@ -77,7 +104,8 @@ class Environment:
     """
 
     def add_fixtures_from_typeconfig(
-            self, label: str, base: Any = LOADED_KEY_ROOT, validator: str = '') -> Fixtures:
+            self, label: str, base: Any = LOADED_KEY_ROOT, validator: str = '', exception_if_missing: bool = False,
+            lazy: bool = None, workers: int = None) -> Fixtures:
         """ Create multiple different fixtures from a structured config source
 
         This approach to creating fixtures keeps a tree:
@@ -104,9 +132,16 @@ class Environment:
         validator (str) : optionally use a configerus validator on the instance
             config/dict before a plugin is created.
 
-        arguments (Dict[str, Any]) : A Dict of named arguments to pass to the
-            plugin constructor.  Constructors should be able to work without
-            requiring the arguments, but these tend to be pivotal for them.
+        exception_if_missing (bool) : raise a KeyError if the label/base could
+            not be loaded, instead of returning an empty Fixtures.
+
+        lazy (bool) : build the plugins only when they are first accessed.
+            Defaults to the environment lazy_fixtures setting.
+            @see add_fixture
+
+        workers (int) : number of threads to use to build the fixtures.
+            Defaults to the environment fixture_workers setting.
+            @see _add_fixtures_from_builders
 
         Returns:
         --------
@@ -122,41 +157,39 @@ class Environment:
         the module that contains the factory method with a decorator.
 
         """
-        fixtures = Fixtures()
-        """ plugin set which will be used to create new plugins """
-
         try:
             plugin_config = self.config.load(label)
             plugin_type_list = plugin_config.get(
                 base, exception_if_missing=True)
         except KeyError as e:
             if exception_if_missing:
-                return KeyError(
-                    'Could not load any config for plugin generation')
+                raise KeyError(
+                    'Could not load any config for plugin generation') from e
                 # there is not config so we can ignore this
             else:
-                return fixtures
+                return Fixtures()
 
+        builders = []
+        """ (instance_id, fixture builder) pairs for each fixture """
         # Upper/Outer layer defines plugin type
         for type, plugin_list in plugin_type_list.items():
+            validated = self._validate_fixture_list(plugin_list)
             # Lower/Inner layer is a list of plugins to create of that type
             for instance_id in plugin_list.keys():
-                # This fixture gets effectively added to 2 different Fixtures object.
-                # 1. we manually add it to our Fixtures object for this function call
-                # 2. the add_fixture_from_config() adds it to the fixture for this
-                #    environment object.
-                fixture = self.add_fixture_from_config(
-                    label=label,
-                    base=[base, instance_id],
+                builders.append((instance_id, functools.partial(
+                    self._fixture_from_loadedconfig,
+                    loaded=plugin_config,
+                    base=[base, type, instance_id],
                     type=type,
                     instance_id=instance_id,
-                    validator=validator)
-                fixtures.add_fixture(fixture)
+                    validator=validator,
+                    validated=instance_id in validated,
+                    lazy=lazy)))
 
-        return fixtures
+        return self._add_fixtures_from_builders(builders, workers=workers)
 
     def add_fixtures_from_config(self, label: str = UCTT_FIXTURES_CONFIG_FIXTURES_LABEL, base: Any = LOADED_KEY_ROOT, type: Type = None, validator: str = '',
-                                 exception_if_missing: bool = False, arguments: Dict[str, Any] = {}) -> Fixtures:
+                                 exception_if_missing: bool = False, arguments: Dict[str, Any] = {}, lazy: bool = None, workers: int = None) -> Fixtures:
         """ Create plugins from some config
 
         This method will interpret some config values as being usable to build a Dict
@@ -188,6 +221,14 @@ class Environment:
             plugin constructor.  Constructors should be able to work without
             requiring the arguments, but these tend to be pivotal for them.
 
+        lazy (bool) : build the plugins only when they are first accessed.
+            Defaults to the environment lazy_fixtures setting.
+            @see add_fixture
+
+        workers (int) : number of threads to use to build the fixtures.
+            Defaults to the environment fixture_workers setting.
+            @see _add_fixtures_from_builders
+
         Returns:
         --------
 
@@ -202,9 +243,6 @@ class Environment:
         the module that contains the factory method with a decorator.
 
         """
-        fixtures = Fixtures()
-        """ plugin set which will be used to create new plugins """
-
         try:
             plugin_config = self.config.load(label)
             plugin_list = plugin_config.get(base, exception_if_missing=True)
@@ -214,26 +252,26 @@ class Environment:
                     'Could not load any config for plugin generation') from e
                 # there is not config so we can ignore this
             else:
-                return fixtures
-
-        for instance_id in plugin_list.keys():
-            # This fixture gets effectively added to 2 different Fixtures object.
-            # 1. we manually add it to our Fixtures object for this function call
-            # 2. the add_fixture_from_config() adds it to the fixture for this
-            #    environment object.
-            fixture = self.add_fixture_from_config(
-                label=label,
-                base=[base, instance_id],
-                type=type,
-                instance_id=instance_id,
-                validator=validator,
-                arguments=arguments)
-            fixtures.add_fixture(fixture)
+                return Fixtures()
 
-        return fixtures
+        validated = self._validate_fixture_list(plugin_list)
+
+        builders = [(instance_id, functools.partial(
+            self._fixture_from_loadedconfig,
+            loaded=plugin_config,
+            base=[base, instance_id],
+            type=type,
+            instance_id=instance_id,
+            validator=validator,
+            validated=instance_id in validated,
+            arguments=arguments,
+            lazy=lazy)) for instance_id in plugin_list.keys()]
+        """ (instance_id, fixture builder) pairs for each fixture """
+
+        return self._add_fixtures_from_builders(builders, workers=workers)
 
     def add_fixtures_from_dict(self, plugin_list: Dict[str, Dict[str, Any]], type: Type = None,
-                               validator: str = '', arguments: Dict[str, Any] = {}) -> Fixtures:
+                               validator: str = '', arguments: Dict[str, Any] = {}, lazy: bool = None, workers: int = None) -> Fixtures:
         """ Create a set of plugins from Dict information
 
         The passed dict should be a key=>details map of plugins, which will be turned
@@ -260,36 +298,165 @@ class Environment:
             plugin constructor.  Constructors should be able to work without
             requiring the arguments, but these tend to be pivotal for them.
 
+        lazy (bool) : build the plugins only when they are first accessed.
+            Defaults to the environment lazy_fixtures setting.
+            @see add_fixture
+
+        workers (int) : number of threads to use to build the fixtures.
+            Defaults to the environment fixture_workers setting.
+            @see _add_fixtures_from_builders
+
         Returns:
         --------
 
         A Fixtures object with the plugin objects created
 
         """
-        fixtures = Fixtures()
-
         if not isinstance(plugin_list, dict):
             raise ValueError(
                 'Did not receive a good dict of config to make plugins from: %s',
                 plugin_list)
 
-        for instance_id, plugin_dict in plugin_list.items():
-            # This fixture gets effectively added to 2 different Fixtures object.
-            # 1. we manually add it to our Fixtures object for this function call
-            # 2. the add_fixture_from_config() adds it to the fixture for this
-            #    environment object.
-            fixture = self.add_fixture_from_dict(
-                plugin_dict=plugin_dict,
-                type=type,
-                instance_id=instance_id,
-                validator=validator,
-                arguments=arguments)
-            fixtures.add_fixture(fixture)
+        builders = [(instance_id, functools.partial(
+            self._fixture_from_dict,
+            plugin_dict=plugin_dict,
+            type=type,
+            instance_id=instance_id,
+            validator=validator,
+            arguments=arguments,
+            lazy=lazy)) for instance_id, plugin_dict in plugin_list.items()]
+        """ (instance_id, fixture builder) pairs for each fixture """
+
+        return self._add_fixtures_from_builders(builders, workers=workers)
+
+    def _validate_fixture_list(
+            self, plugin_list: Dict[str, Dict[str, Any]]) -> List[str]:
+        """ Validate a Dict of fixture configs against the fixture schema at once
+
+        Each fixture config which does not declare its own validators would be
+        validated against the default fixture target as it is built.  If all of
+        the config validator plugins can validate in batches (@see
+        uctt.validation.CachedJsonSchemaValidatorPlugin) then we validate all of
+        those configs in one pass instead, so that the builders can skip it.
+
+        Parameters:
+        -----------
+
+        plugin_list (Dict[str, Dict[str, Any]]) : formatted fixture configs
+            keyed by instance_id
+
+        Returns:
+        --------
+
+        List of instance_ids which were validated against the default fixture
+        target.  Empty if batch validation is not possible.
+
+        Raises:
+        -------
+
+        A configerus.validate.ValidationError if any of the configs failed
+        validation.
+
+        """
+        validators = self.config.plugins.get_plugins(
+            type=ConfigerusType.VALIDATOR, exception_if_missing=False)
+        if not validators or not all(hasattr(validator, 'validate_all')
+                                     for validator in validators):
+            return []
+
+        batch = {instance_id: plugin_config for instance_id, plugin_config in plugin_list.items()
+                 if isinstance(plugin_config, dict) and not plugin_config.get(UCTT_PLUGIN_CONFIG_KEY_VALIDATORS)}
+        validate_target = FIXTURE_VALIDATION_TARGET_FORMAT_STRING.format(
+            key=UCTT_FIXTURES_CONFIG_FIXTURE_KEY)
+
+        try:
+            for validator in validators:
+                validator.validate_all(validate_target, batch)
+        except ValidationError as e:
+            raise e
+        except Exception as e:
+            raise ValidationError(
+                "Config validation failed: {}".format(e)) from e
+
+        return list(batch.keys())
+
+    def _add_fixtures_from_builders(
+            self, builders: List[Tuple[str, Callable[[], Fixture]]], workers: int = None) -> Fixtures:
+        """ Build a number of fixtures and add them to the environment
+
+        With one worker, each fixture is built and added to the environment in
+        order, so a plugin constructor can rely on earlier fixtures.
+
+        With more workers, the fixtures are built concurrently in a thread pool,
+        which helps when plugin constructors are I/O bound.  The fixtures are
+        only added to the environment once they have all been built, and then
+        in priority order (declaration order for equal priorities) so that the
+        result does not depend on thread timing.  Plugins built concurrently
+        cannot rely on each other during construction.
+
+        Parameters:
+        -----------
+
+        builders (List[Tuple[str, Callable]]) : (instance_id, builder) pairs,
+            where each builder returns a new Fixture which has not yet been
+            added to the environment.
+
+        workers (int) : number of threads to use.  Defaults to the environment
+            fixture_workers setting.
+
+        Returns:
+        --------
+
+        A Fixtures object with the new fixtures.  The fixtures have also been
+        added to the environment.
+
+        Raises:
+        -------
+
+        With one worker, any exception raised building a fixture.
+
+        With more workers, a FixturesConstructionError with the exception for
+        every fixture that failed.  In that case none of the fixtures are added.
+
+        """
+        if workers is None:
+            workers = self.fixture_workers
+
+        fixtures = Fixtures()
+        """ plugin set which will be used to create new plugins """
+
+        if workers <= 1 or len(builders) <= 1:
+            for instance_id, builder in builders:
+                # This fixture gets effectively added to 2 different Fixtures object.
+                # 1. we manually add it to our Fixtures object for this function call
+                # 2. we add it to the fixtures for this environment object.
+                fixture = builder()
+                self.fixtures.add_fixture(fixture)
+                fixtures.add_fixture(fixture)
+            return fixtures
 
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(instance_id, executor.submit(builder))
+                       for instance_id, builder in builders]
+
+        built = []
+        errors = {}
+        for instance_id, future in futures:
+            try:
+                built.append(future.result())
+            except Exception as e:
+                errors[instance_id] = e
+        if errors:
+            raise FixturesConstructionError(errors) from next(
+                iter(errors.values()))
+
+        for fixture in sort_instance_list(built):
+            self.fixtures.add_fixture(fixture)
+            fixtures.add_fixture(fixture)
         return fixtures
 
     def add_fixture_from_config(self, label: str, base: Any = LOADED_KEY_ROOT, type: Type = None,
-                                instance_id: str = '', priority: int = -1, validator: str = '', arguments: Dict[str, Any] = {}) -> Fixture:
+                                instance_id: str = '', priority: int = -1, validator: str = '', arguments: Dict[str, Any] = {}, lazy: bool = None) -> Fixture:
         """ Create a plugin from some config
 
         This method will interpret some config values as being usable to build plugin
@@ -324,6 +491,10 @@ class Environment:
         validator (str) : optionally use a configerus validator on the entire .get()
             for the instance config.
 
+        lazy (bool) : build the plugin only when it is first accessed.
+            Defaults to the environment lazy_fixtures setting.
+            @see add_fixture
+
         Returns:
         --------
 
@@ -356,10 +527,10 @@ class Environment:
         """ loaded configuration for the plugin """
 
         return self.add_fixture_from_loadedconfig(loaded=plugin_loaded, base=base, type=type,
-                                                  instance_id=instance_id, priority=priority, validator=validator, arguments=arguments)
+                                                  instance_id=instance_id, priority=priority, validator=validator, arguments=arguments, lazy=lazy)
 
     def add_fixture_from_dict(self, plugin_dict: Dict[str, Any], type: Type = None,
-                              instance_id: str = '', validator: str = '', arguments: Dict[str, Any] = {}) -> Fixture:
+                              instance_id: str = '', validator: str = '', arguments: Dict[str, Any] = {}, lazy: bool = None) -> Fixture:
         """ Create a single plugin from a Dict of information for it
 
         Create a new plugin from a map/dict of settings for the needed parameters.
@@ -385,6 +556,10 @@ class Environment:
         validator (str) : optionally use a configerus validator on the entire .get()
             for the instance config.
 
+        lazy (bool) : build the plugin only when it is first accessed.
+            Defaults to the environment lazy_fixtures setting.
+            @see add_fixture
+
         Return:
         -------
 
@@ -394,6 +569,16 @@ class Environment:
         so that the consumer can act on it separately without haveing to
         search for it.
 
+        """
+        return self.fixtures.add_fixture(self._fixture_from_dict(
+            plugin_dict=plugin_dict, type=type, instance_id=instance_id, validator=validator, arguments=arguments, lazy=lazy))
+
+    def _fixture_from_dict(self, plugin_dict: Dict[str, Any], type: Type = None,
+                           instance_id: str = '', validator: str = '', arguments: Dict[str, Any] = {}, lazy: bool = None) -> Fixture:
+        """ Create a single fixture from a Dict without adding it
+
+        @see add_fixture_from_dict
+
         """
         # Create a mock configerus.loaded.Loaded object, not attached to anything
         # and use it for config retrieval.  This gives us formatting, validation
@@ -406,11 +591,11 @@ class Environment:
         base = LOADED_KEY_ROOT
         """ to keep this function similar to add_fixture_from_config we use an empty .get() base """
 
-        return self.add_fixture_from_loadedconfig(
-            loaded=mock_config_loaded, base=base, type=type, instance_id=instance_id, validator=validator, arguments=arguments)
+        return self._fixture_from_loadedconfig(
+            loaded=mock_config_loaded, base=base, type=type, instance_id=instance_id, validator=validator, arguments=arguments, lazy=lazy)
 
     def add_fixture_from_loadedconfig(self, loaded: Loaded, base: Any = LOADED_KEY_ROOT, type: Type = None,
-                                      instance_id: str = '', priority: int = -1, validator: str = '', arguments: Dict[str, Any] = {}) -> Fixture:
+                                      instance_id: str = '', priority: int = -1, validator: str = '', arguments: Dict[str, Any] = {}, lazy: bool = None) -> Fixture:
         """ Create a plugin from loaded config
 
         This method will interpret some config values as being usable to build plugin.
@@ -455,6 +640,10 @@ class Environment:
         validator (str) : optionally use a configerus validator on the entire .get()
             for the instance config.
 
+        lazy (bool) : build the plugin only when it is first accessed.
+            Defaults to the environment lazy_fixtures setting.
+            @see add_fixture
+
         Returns:
         --------
 
@@ -479,25 +668,42 @@ class Environment:
         A configerus.validate.ValidationError will be raised if a validation
         target was passed and validation failed.
 
+        """
+        return self.fixtures.add_fixture(self._fixture_from_loadedconfig(
+            loaded=loaded, base=base, type=type, instance_id=instance_id, priority=priority, validator=validator, arguments=arguments, lazy=lazy))
+
+    def _fixture_from_loadedconfig(self, loaded: Loaded, base: Any = LOADED_KEY_ROOT, type: Type = None,
+                                   instance_id: str = '', priority: int = -1, validator: str = '', arguments: Dict[str, Any] = {}, lazy: bool = None,
+                                   validated: bool = False) -> Fixture:
+        """ Create a fixture from loaded config without adding it
+
+        @see add_fixture_from_loadedconfig
+
+        validated (bool) : the config has already been validated against the
+            default fixture target @see _validate_fixture_list
+
         """
         logger.debug(
             'Construct config plugin [{}][{}]'.format(
                 type, instance_id))
 
-        # it might be expensive to retrieve all this but we do it to catch early
-        # faults in config.
+        # Retrieve the plugin config once.  The whole base is formatted by the
+        # .get() (the deep formatter descends into the dict) so all of the
+        # subkeys can be taken from it without walking the config tree again.
         plugin_base = loaded.get(base)
         if plugin_base is None:
             raise ValueError(
                 "Cannot build plugin as provided config was empty.")
+        if not isinstance(plugin_base, dict):
+            raise ValueError(
+                "Cannot build plugin as provided config is not a dict : {}".format(plugin_base))
 
-        validators = [
+        validators = [] if validated else [
             FIXTURE_VALIDATION_TARGET_FORMAT_STRING.format(
                 key=UCTT_FIXTURES_CONFIG_FIXTURE_KEY)]
-        config_validators = loaded.get(
-            [base, UCTT_PLUGIN_CONFIG_KEY_VALIDATORS])
+        config_validators = plugin_base.get(UCTT_PLUGIN_CONFIG_KEY_VALIDATORS)
         if config_validators:
-            validators = config_validators
+            validators = list(config_validators)
         if validator:
             validators.append(validator)
         if len(validators):
@@ -509,52 +715,49 @@ class Environment:
                 raise e
 
         if type is None:
-            type = loaded.get([base, UCTT_PLUGIN_CONFIG_KEY_TYPE])
+            type = plugin_base.get(UCTT_PLUGIN_CONFIG_KEY_TYPE)
         if isinstance(type, str):
             # If a string type was passed in, ask the Type enum to convert it
             type = Type.from_string(type)
         if not type:
             raise ValueError(
-                "Could not find a plugin type when trying to create a plugin : {}".format(loaded.get(base)))
+                "Could not find a plugin type when trying to create a plugin : {}".format(plugin_base))
 
-        plugin_id = loaded.get([base, UCTT_PLUGIN_CONFIG_KEY_PLUGINID])
+        plugin_id = plugin_base.get(UCTT_PLUGIN_CONFIG_KEY_PLUGINID)
         if not plugin_id:
             raise ValueError(
-                "Could not find a plugin_id when trying to create a '{}' plugin from config: {}".format(type, loaded.get(base)))
+                "Could not find a plugin_id when trying to create a '{}' plugin from config: {}".format(type, plugin_base))
 
         # if no instance_id was passed, try to load one or just make one up
         if not instance_id:
-            instance_id = loaded.get(
-                [base, UCTT_PLUGIN_CONFIG_KEY_INSTANCEID])
+            instance_id = plugin_base.get(UCTT_PLUGIN_CONFIG_KEY_INSTANCEID)
             if not instance_id:
                 instance_id = '{}-{}-{}'.format(type.value, plugin_id, ''.join(
                     random.choice(string.ascii_lowercase) for i in range(10)))
 
         if priority < 0:
-            priority = loaded.get([base, UCTT_PLUGIN_CONFIG_KEY_PRIORITY])
+            priority = plugin_base.get(UCTT_PLUGIN_CONFIG_KEY_PRIORITY)
         if not priority:
             priority = self.plugin_priority()
             """ instance priority - this is actually a stupid way to get it """
 
         # If arguments were given then pass them on
-        config_arguments = loaded.get([base, UCTT_PLUGIN_CONFIG_KEY_ARGUMENTS])
+        config_arguments = plugin_base.get(UCTT_PLUGIN_CONFIG_KEY_ARGUMENTS)
         if config_arguments is not None:
             arguments = arguments.copy()
             arguments.update(config_arguments)
 
         # Use the factory to make the .fixtures.Fixture
-        fixture = self.add_fixture(
+        return self._new_fixture(
             type=type,
             plugin_id=plugin_id,
             instance_id=instance_id,
             priority=priority,
-            arguments=arguments)
-        plugin = fixture.plugin
-
-        return fixture
+            arguments=arguments,
+            lazy=lazy)
 
     def add_fixture(self, type: Type, plugin_id: str,
-                    instance_id: str, priority: int, arguments: Dict[str, Any] = {}) -> Fixture:
+                    instance_id: str, priority: int, arguments: Dict[str, Any] = {}, lazy: bool = None) -> Fixture:
         """ Create a new plugin from parameters
 
         Parameters:
@@ -578,6 +781,11 @@ class Environment:
         arguments (Dict[str, Any]) : Arguments which should be passed to the
             plugin constructor after environment and instance_id
 
+        lazy (bool) : if True then the plugin is not created now, but rather the
+            first time that the fixture .plugin is accessed.  This makes it cheap
+            to declare fixtures which are expensive to build but rarely used.
+            If None, then the environment lazy_fixtures setting is used.
+
         Return:
         -------
 
@@ -593,12 +801,41 @@ class Environment:
         NotImplementedError if you asked for an unregistered plugin_id/type
 
         """
+        return self.fixtures.add_fixture(self._new_fixture(
+            type=type, plugin_id=plugin_id, instance_id=instance_id, priority=priority, arguments=arguments, lazy=lazy))
+
+    def _new_fixture(self, type: Type, plugin_id: str,
+                     instance_id: str, priority: int, arguments: Dict[str, Any] = {}, lazy: bool = None) -> Fixture:
+        """ Create a new fixture from parameters without adding it
+
+        @see add_fixture
+
+        """
+        if lazy is None:
+            lazy = self.lazy_fixtures
+
         fac = Factory(type, plugin_id)
+        if lazy:
+            if not fac.is_registered():
+                raise NotImplementedError(
+                    "UCTT Plugin instance '{}:{}' has not been registered.".format(
+                        type.value, plugin_id))
+
+            def plugin_builder():
+                return fac.create(self, instance_id, **arguments)
+
+            return Fixture(
+                plugin=None,
+                plugin_builder=plugin_builder,
+                type=type,
+                plugin_id=plugin_id,
+                instance_id=instance_id,
+                priority=priority)
+
         plugin = fac.create(self, instance_id, **arguments)
-        fixture = self.fixtures.new_fixture(
+        return Fixture(
             plugin=plugin,
             type=type,
             plugin_id=plugin_id,
             instance_id=instance_id,
             priority=priority)
-        return fixture
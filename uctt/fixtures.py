@@ -4,7 +4,10 @@ A set of plugin instances kept as a managed set, we call these fixtures
 
 """
 import logging
-from typing import Dict, List, Any
+import bisect
+import itertools
+import threading
+from typing import Dict, List, Any, Callable
 
 from .plugin import (UCTTPlugin, Type, UCTT_PLUGIN_CONFIG_KEY_PLUGINID,
                      UCTT_PLUGIN_CONFIG_KEY_INSTANCEID, UCTT_PLUGIN_CONFIG_KEY_TYPE,
@@ -35,13 +38,15 @@ class Fixture:
     """ A plugin wrapper struct that keep metadata about the plugin in a set """
 
     def __init__(self, plugin: object, type: Type,
-                 plugin_id: str, instance_id: str, priority: int):
+                 plugin_id: str, instance_id: str, priority: int,
+                 plugin_builder: Callable[[], object] = None):
         """
 
         Parameters:
         -----------
 
-        fixture : the fixture plugin instance
+        fixture : the fixture plugin instance.  Can be None if a plugin_builder
+            is passed, in which case the plugin is built on first access.
 
         Filtering parameters:
 
@@ -49,12 +54,43 @@ class Fixture:
         plugin_id (str) : registry plugin_id
         instance_id (str) : plugin instance identifier
 
+        Lazy construction:
+
+        plugin_builder (Callable) : optional no-argument callable which returns
+            the plugin instance.  If passed without a plugin, then the callable
+            is run the first time that .plugin is accessed, so plugins which are
+            never used are never built.
+
         """
         self.type = type
         self.plugin_id = plugin_id
         self.instance_id = instance_id
         self.priority = priority
-        self.plugin = plugin
+
+        self._plugin = plugin
+        self._plugin_builder = plugin_builder if plugin is None else None
+        self._plugin_lock = threading.Lock()
+
+    @property
+    def plugin(self) -> object:
+        """ Return the fixture plugin instance, building it if needed """
+        if self._plugin_builder is not None:
+            with self._plugin_lock:
+                # check again in case another thread built it while we waited
+                if self._plugin_builder is not None:
+                    self._plugin = self._plugin_builder()
+                    self._plugin_builder = None
+        return self._plugin
+
+    @plugin.setter
+    def plugin(self, plugin: object):
+        """ Replace the fixture plugin instance """
+        self._plugin = plugin
+        self._plugin_builder = None
+
+    def is_built(self) -> bool:
+        """ Has the fixture plugin been built yet (always True if not lazy) """
+        return self._plugin_builder is None
 
 
 class Fixtures:
@@ -67,6 +103,31 @@ class Fixtures:
 
     def __init__(self):
         self.fixtures = []
+        """ all of the fixtures in the set, in the order that they were added """
+        self._index = {}
+        """ priority sorted fixture lists keyed by (type, plugin_id, instance_id)
+
+        Every fixture is indexed under each combination of its own metadata
+        values and the "no filter" values, so that any combination of filter
+        arguments can be matched with a single dict lookup.
+
+        Each list is kept sorted as fixtures are added, holding
+        (sort key, insertion sequence, fixture) tuples, so that the highest
+        priority match is always the first item and fixtures with equal
+        priority stay in the order that they were added.
+        """
+        self._sequence = itertools.count()
+        """ insertion counter used to keep equal priority fixtures stable """
+        self._sorted = None
+        """ cached priority sorted list of all fixtures, reset on any add """
+        self._lock = threading.Lock()
+        """ fixtures can be added from parallel plugin construction threads """
+        self.version = 0
+        """ change counter, incremented whenever a fixture is added
+
+        Consumers which keep views derived from the set can compare this to
+        know if the set has changed since the view was made.
+        """
 
     def __len__(self) -> int:
         """ Return how many plugin instances we have """
@@ -104,10 +165,12 @@ class Fixtures:
         merge_from (Fixtures) : fixture instance source
 
         """
-        self.fixtures += merge_from.fixtures
+        for fixture in merge_from.fixtures:
+            self.add_fixture(fixture)
 
     def new_fixture(self, plugin: object, type: Type,
-                    plugin_id: str, instance_id: str, priority: int):
+                    plugin_id: str, instance_id: str, priority: int,
+                    plugin_builder: Callable[[], object] = None):
         """ Add a new fixture by providing the plugin instance and the metadata
 
         Create a new Fixture from the passed arguments and add it to the Fixtures set
@@ -123,15 +186,20 @@ class Fixtures:
         plugin_id (str) : registry plugin_id
         instance_id (str) : plugin instance identifier
 
+        Lazy construction:
+
+        plugin_builder (Callable) : optional callable used to build the plugin
+            on first access, if plugin is None.  @see Fixture
+
         """
         fixture = Fixture(
             type=type,
             plugin_id=plugin_id,
             instance_id=instance_id,
             priority=priority,
-            plugin=plugin)
-        self.fixtures.append(fixture)
-        return fixture
+            plugin=plugin,
+            plugin_builder=plugin_builder)
+        return self.add_fixture(fixture)
 
     def add_fixture(self, fixture: Fixture):
         """ Add an existing fixture
@@ -142,12 +210,18 @@ class Fixtures:
         fixture (Fixture) : existing fixture to add
 
         """
-        self.fixtures.append(fixture)
+        with self._lock:
+            self.fixtures.append(fixture)
+            self._index_fixture(fixture)
+            self._sorted = None
+            self.version += 1
         return fixture
 
     def to_list(self):
-        """ retrieve this fixtures as a list """
-        return sort_instance_list(self.fixtures)
+        """ retrieve this fixtures as a list, sorted by priority """
+        if self._sorted is None:
+            self._sorted = self._filter_instances()
+        return list(self._sorted)
 
     def count(self, type: Type = None, plugin_id: str = '',
               instance_id: str = ''):
@@ -235,13 +309,11 @@ class Fixtures:
         KeyError if exception_if_missing is True and no matching fixture was found
 
         """
-        instances = self.get_fixtures(
-            type=type,
-            plugin_id=plugin_id,
-            instance_id=instance_id).to_list()
+        entries = self._index.get(
+            _index_key(type=type, plugin_id=plugin_id, instance_id=instance_id))
 
-        if len(instances):
-            return instances[0]
+        if entries:
+            return entries[0][2]
         if exception_if_missing:
             raise KeyError(
                 "Could not find any matching fixture instances [type:{type}][plugin_id:{plugin_id}][instance_id:{instance_id}]".format(
@@ -270,10 +342,10 @@ class Fixtures:
         possibly empty.
 
         """
-        instances = self.get_fixtures(
+        instances = self._filter_instances(
             type=type,
             plugin_id=plugin_id,
-            instance_id=instance_id).to_list()
+            instance_id=instance_id)
         return [instance.plugin for instance in instances]
 
     def get_fixtures(self, type: Type = None, plugin_id: str = '',
@@ -327,35 +399,61 @@ class Fixtures:
         Returns:
         --------
 
-        An unsorted List of Fixture structs that matched the arguments,
+        A priority sorted List of Fixture structs that matched the arguments,
         possibly empty.
 
-        Raises:
-        -------
+        """
+        return [entry[2] for entry in self._index.get(
+            _index_key(type=type, plugin_id=plugin_id, instance_id=instance_id), [])]
 
-        KeyError if exception_if_missing is True and no matching fixture was found
+    def _index_fixture(self, fixture: Fixture):
+        """ Add a fixture to the filter index
+
+        The fixture is added under every filter key that would match it, which
+        is every combination of its own type/plugin_id/instance_id and the
+        matching "no filter" value.
+
+        The fixture priority is read once here, so a fixture priority should
+        be set before the fixture is added to a set.
+
+        Parameters:
+        -----------
+
+        fixture (Fixture) : fixture which has just been added to the set
 
         """
-        matched_instances = []
-        for plugin_instance in self.fixtures:
-            # Could have one-lined this into a lambda but it would be
-            # unreadable
+        keys = set()
+        for type in [None, fixture.type]:
+            for plugin_id in ['', fixture.plugin_id]:
+                for instance_id in ['', fixture.instance_id]:
+                    keys.add(_index_key(type=type, plugin_id=plugin_id,
+                                        instance_id=instance_id))
+
+        entry = (_sort_key(fixture), next(self._sequence), fixture)
+        for key in keys:
+            bisect.insort(self._index.setdefault(key, []), entry)
+
 
-            if plugin_id and not plugin_instance.plugin_id == plugin_id:
-                continue
-            elif instance_id and not plugin_instance.instance_id == instance_id:
-                continue
-            elif type and not type == plugin_instance.type:
-                continue
+def _index_key(type: Type = None, plugin_id: str = '',
+               instance_id: str = '') -> tuple:
+    """ Normalize filter arguments into a Fixtures index key
+
+    Empty filter values all mean "don't filter on this", so they are collapsed
+    to the same key value.
+
+    """
+    return (type if type else None, plugin_id if plugin_id else '',
+            instance_id if instance_id else '')
 
-            matched_instances.append(plugin_instance)
 
-        return matched_instances
+def _sort_key(fixture: Fixture) -> float:
+    """ Sort key which orders fixtures from highest to lowest priority """
+    return 1 / fixture.priority if fixture.priority else 0
 
 
 def sort_instance_list(list: List[Fixture]) -> List[Fixture]:
     """ Order a list of objects with a priority value from highest to lowest """
-    return sorted(list, key=lambda i: 1 / i.priority if i.priority else 0)
+    return sorted(list, key=_sort_key)
 
 
 class UCCTFixturesPlugin:
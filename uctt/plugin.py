@@ -8,6 +8,7 @@ UCTT Plugin definition and management
 
 """
 import logging
+import functools
 from enum import Enum, unique
 
 logger = logging.getLogger('uctt.plugin')
@@ -169,6 +170,7 @@ class Factory():
         Decorated construction function(config: Config)
 
         """
+        @functools.wraps(func)
         def wrapper(environment: object, instance_id: str, *args, **kwargs):
             logger.debug(
                 "plugin factory exec: %s:%s",
@@ -189,6 +191,10 @@ class Factory():
         self.registry[self.type.value][self.plugin_id] = wrapper
         return wrapper
 
+    def is_registered(self) -> bool:
+        """ Has a factory function been registered for this type/plugin_id """
+        return self.plugin_id in self.registry.get(self.type.value, {})
+
     def create(self, environment: object, instance_id: str, *args, **kwargs):
         """ Get an instance of a plugin as created by the decorated
 
@@ -0,0 +1,333 @@
+"""
+
+Persistent UCTT registry cache
+
+Discovering UCTT bootstraps means scanning the metadata of every installed
+distribution, and running them usually means importing every contrib package
+along with any third party SDKs that they use.  Most of that work produces the
+same result every time, so we keep a manifest on disk of what was found: the
+uctt.bootstrap entry_points, and which module registered each plugin factory.
+
+When the manifest is valid, bootstraps which only register plugin factories
+(@see registration_only) are not imported at all.  Their factories are added
+to the Factory registry as DeferredFactory placeholders, which import the real
+module the first time that the plugin is created.
+
+The manifest is invalidated if the python installation changes (the
+site-packages directories are modified) or if any of the module files which it
+recorded are modified.
+
+"""
+import importlib
+import json
+import logging
+import os
+import site
+import sys
+import sysconfig
+import tempfile
+from typing import Dict, Any
+
+from .plugin import Factory
+
+logger = logging.getLogger('uctt.registry')
+
+UCTT_REGISTRY_CACHE_PATH_ENV = 'UCTT_REGISTRY_CACHE'
+""" ENV variable to set the manifest path. Set it empty to disable caching """
+UCTT_REGISTRY_CACHE_DEFAULT_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join('~', '.cache')),
+    'uctt',
+    'registry.json')
+""" Default path for the registry manifest file, when enabled """
+UCTT_REGISTRY_MANIFEST_VERSION = 1
+""" Manifest format version, any manifest with another version is discarded """
+
+
+def registration_only(func):
+    """ Decorator for bootstrap functions which only register plugin factories
+
+    A bootstrap decorated with this declares that running it has no effect on
+    the environment, and that its only purpose is to import the module so that
+    the plugin factory decorators run.  Such a bootstrap can be skipped when
+    the registry manifest already knows which factories the module registers.
+
+    """
+    func.uctt_registration_only = True
+    return func
+
+
+_registry_cache_enabled = False
+""" Use the default manifest path when the ENV variable is not set """
+
+
+def enable_registry_cache(enabled: bool = True):
+    """ Opt in to the registry manifest at its default path
+
+    Library use doesn't write to the user cache dir unless asked to; the
+    ucttc cli opts in.  The UCTT_REGISTRY_CACHE ENV variable always takes
+    precedence.
+
+    """
+    global _registry_cache_enabled
+    _registry_cache_enabled = enabled
+
+
+def registry_cache_path() -> str:
+    """ Return the path to the registry manifest, or '' if caching is disabled """
+    path = os.environ.get(UCTT_REGISTRY_CACHE_PATH_ENV)
+    if path is None and _registry_cache_enabled:
+        path = UCTT_REGISTRY_CACHE_DEFAULT_PATH
+    return os.path.expanduser(path) if path else ''
+
+
+class DeferredFactory:
+    """ Placeholder plugin factory which imports the real factory when called
+
+    The real factory is registered by the decorator when the module is
+    imported, replacing this placeholder in the Factory registry.
+
+    """
+
+    def __init__(self, type_value: str, plugin_id: str, module: str):
+        """
+
+        Parameters:
+        -----------
+
+        type_value (str) : plugin Type value for the factory
+
+        plugin_id (str) : plugin_id for the factory
+
+        module (str) : name of the module that registers the real factory
+
+        """
+        self.type_value = type_value
+        self.plugin_id = plugin_id
+        self.module = module
+
+    def __call__(self, environment: object, instance_id: str, *args, **kwargs):
+        """ Import the module with the real factory and run that factory """
+        logger.debug(
+            "Importing deferred plugin factory %s:%s from %s",
+            self.type_value,
+            self.plugin_id,
+            self.module)
+        importlib.import_module(self.module)
+
+        factory = Factory.registry.get(
+            self.type_value, {}).get(self.plugin_id)
+        if factory is None or factory is self:
+            raise NotImplementedError(
+                "UCTT Plugin instance '{}:{}' was not registered by module '{}'.".format(
+                    self.type_value, self.plugin_id, self.module))
+
+        return factory(environment=environment,
+                       instance_id=instance_id, *args, **kwargs)
+
+
+class RegistryManifest:
+    """ On disk record of the UCTT bootstraps and plugin factories """
+
+    def __init__(self, path: str):
+        """
+
+        Parameters:
+        -----------
+
+        path (str) : path to the manifest json file
+
+        """
+        self.path = path
+        """ manifest json file path """
+        self.data = self._empty()
+        """ manifest contents """
+        self.changed = False
+        """ has the manifest changed since it was loaded/saved """
+
+    def _empty(self) -> Dict[str, Any]:
+        """ Return an empty manifest keyed to the current installation """
+        return {
+            'version': UCTT_REGISTRY_MANIFEST_VERSION,
+            'python': sys.version,
+            'fingerprint': installation_fingerprint(),
+            'entrypoints': None,
+            'bootstraps': {},
+            'factories': {},
+            'files': {}
+        }
+
+    def load(self) -> bool:
+        """ Load the manifest from disk, discarding it if it is no longer valid
+
+        Returns:
+        --------
+
+        True if a valid manifest was loaded.
+
+        """
+        try:
+            with open(self.path) as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            logger.debug("No usable registry manifest at %s", self.path)
+            return False
+
+        empty = self._empty()
+        if not isinstance(data, dict) or any(
+                data.get(key) != empty[key] for key in ['version', 'python', 'fingerprint']):
+            logger.debug("Registry manifest is for a different installation")
+            return False
+
+        for path, mtime in data.get('files', {}).items():
+            if _mtime(path) != mtime:
+                logger.debug(
+                    "Registry manifest is stale as %s has changed", path)
+                return False
+
+        self.data = data
+        self.changed = False
+        return True
+
+    def invalidate(self):
+        """ Forget everything recorded in the manifest """
+        self.data = self._empty()
+        self.changed = True
+
+    def save(self):
+        """ Write the manifest to disk, if it changed
+
+        The file is written to a temp file and then renamed, so that parallel
+        processes never read a partial manifest.  Failing to write the manifest
+        is not an error, as it is only a cache.
+
+        """
+        if not self.changed:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.path), suffix='.tmp')
+            with os.fdopen(handle, 'w') as temp_file:
+                json.dump(self.data, temp_file, sort_keys=True)
+            os.replace(temp_path, self.path)
+            self.changed = False
+        except OSError as e:
+            logger.warning(
+                "Could not write uctt registry manifest %s : %s", self.path, e)
+
+    """ Entrypoints """
+
+    def entrypoints(self) -> Dict[str, str]:
+        """ Return the recorded bootstrap entry_point values, or None """
+        return self.data['entrypoints']
+
+    def set_entrypoints(self, entrypoints: Dict[str, str]):
+        """ Record the bootstrap entry_point values keyed by name """
+        self.data['entrypoints'] = entrypoints
+        self.changed = True
+
+    """ Bootstraps """
+
+    def is_registration_only(self, bootstrap_id: str) -> bool:
+        """ Is the bootstrap known to only register plugin factories """
+        return self.data['bootstraps'].get(
+            bootstrap_id, {}).get('registration_only', False)
+
+    def record_bootstrap(self, bootstrap_id: str, value: str, function: Any):
+        """ Record a loaded bootstrap and any factories registered so far
+
+        Parameters:
+        -----------
+
+        bootstrap_id (str) : bootstrap entry_point name
+
+        value (str) : bootstrap entry_point value (module:attr)
+
+        function (Callable) : the loaded bootstrap function
+
+        """
+        self.data['bootstraps'][bootstrap_id] = {
+            'value': value,
+            'registration_only': getattr(function, 'uctt_registration_only', False)
+        }
+        self._record_module_file(getattr(function, '__module__', ''))
+        self.record_factories()
+        self.changed = True
+
+    def defer_bootstrap(self, bootstrap_id: str):
+        """ Register deferred factories for a registration only bootstrap
+
+        Every recorded factory from the bootstrap module, or from any module
+        inside the bootstrap package, is added to the Factory registry as a
+        DeferredFactory, unless a real factory is already registered.
+
+        """
+        module = self.data['bootstraps'][bootstrap_id]['value'].split(':')[
+            0].strip()
+
+        for type_value, factories in self.data['factories'].items():
+            for plugin_id, factory_module in factories.items():
+                if factory_module == module or factory_module.startswith(
+                        module + '.'):
+                    Factory.registry.setdefault(type_value, {}).setdefault(
+                        plugin_id, DeferredFactory(type_value, plugin_id, factory_module))
+
+    """ Factories """
+
+    def record_factories(self):
+        """ Record the module for factories which come from bootstrap packages
+
+        Only factories registered by a recorded bootstrap module, or a module
+        inside a bootstrap package, are recorded, as those are the only ones
+        that can be deferred.
+
+        """
+        packages = [bootstrap['value'].split(':')[0].strip()
+                    for bootstrap in self.data['bootstraps'].values()]
+
+        for type_value, factories in Factory.registry.items():
+            for plugin_id, factory in factories.items():
+                if isinstance(factory, DeferredFactory):
+                    continue
+                module = getattr(factory, '__module__', '')
+                if not any(module == package or module.startswith(
+                        package + '.') for package in packages):
+                    continue
+
+                recorded = self.data['factories'].setdefault(type_value, {})
+                if recorded.get(plugin_id) != module:
+                    recorded[plugin_id] = module
+                    self._record_module_file(module)
+                    self.changed = True
+
+    def _record_module_file(self, module: str):
+        """ Record the file mtime for a module so that changes invalidate us """
+        path = getattr(sys.modules.get(module), '__file__', None)
+        if path:
+            self.data['files'][path] = _mtime(path)
+
+
+def installation_fingerprint() -> Dict[str, int]:
+    """ Identify the state of the installed distributions
+
+    Installing, upgrading or removing a distribution adds or removes its
+    metadata directory in site-packages, which changes the directory mtime, so
+    we use the site-packages mtimes as a cheap fingerprint of what is
+    installed.
+
+    """
+    paths = [sysconfig.get_paths()['purelib'],
+             sysconfig.get_paths()['platlib']]
+    if site.ENABLE_USER_SITE:
+        paths.append(site.getusersitepackages())
+
+    return {path: _mtime(path) for path in sorted(set(paths))}
+
+
+def _mtime(path: str) -> int:
+    """ return a path mtime in ns, or 0 if the path does not exist """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
@@ -0,0 +1,29 @@
+"""
+
+Shared pytest setup.
+
+Keep the registry manifest in a temporary dir for the test session, so that
+test results don't depend on a manifest left by an earlier run, and the test
+suite doesn't write to the user cache dir.
+
+"""
+import os
+import tempfile
+
+import pytest
+
+from uctt.registry import UCTT_REGISTRY_CACHE_PATH_ENV
+
+
+@pytest.fixture(scope='session', autouse=True)
+def registry_cache():
+    """ point the registry manifest at a temporary file for the session """
+    previous = os.environ.get(UCTT_REGISTRY_CACHE_PATH_ENV)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ[UCTT_REGISTRY_CACHE_PATH_ENV] = os.path.join(
+            temp_dir, 'registry.json')
+        yield
+    if previous is None:
+        del os.environ[UCTT_REGISTRY_CACHE_PATH_ENV]
+    else:
+        os.environ[UCTT_REGISTRY_CACHE_PATH_ENV] = previous
@@ -0,0 +1,200 @@
+"""
+
+Combo provisioner testing.
+
+Here we combine dummy provisioners as backends of a combo provisioner, and
+replace their operations with recording functions so that we can check the
+order and concurrency that the combo provisioner runs them with.
+
+"""
+import logging
+import threading
+import time
+import unittest
+
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+
+from uctt import new_environment, environment_names, get_environment
+from uctt.environment import Environment
+from uctt.plugin import Type
+from uctt.fixtures import Fixtures
+from uctt.contrib.dummy import UCTT_PLUGIN_ID_DUMMY
+from uctt.contrib.common import UCTT_PLUGIN_ID_PROVISIONER_COMBO
+from uctt.contrib.common.combo_provisioner import ComboProvisionerError
+
+logger = logging.getLogger("test_combo")
+logger.setLevel(logging.INFO)
+
+""" TESTS """
+
+
+class ComboProvisioner(unittest.TestCase):
+
+    def _combo(self, name: str, backends, **combo_config):
+        """ make a combo provisioner over recording dummy backends
+
+        Returns:
+        --------
+
+        (combo provisioner plugin, list of (operation, instance_id, event) calls)
+
+        """
+        if not name in environment_names():
+            new_environment(name=name, additional_uctt_bootstraps=['uctt_dummy'])
+        environment = get_environment(name=name)
+
+        combo_config['backends'] = backends
+        environment.config.add_source(PLUGIN_ID_SOURCE_DICT, priority=80).set_data({
+            name: combo_config
+        })
+
+        calls = []
+        calls_lock = threading.Lock()
+        for backend in backends:
+            plugin = environment.add_fixture(
+                type=Type.PROVISIONER,
+                plugin_id=UCTT_PLUGIN_ID_DUMMY,
+                instance_id=backend['instance_id'],
+                priority=backend.get('priority', 70)).plugin
+
+            for operation in ['prepare', 'apply', 'destroy']:
+                def record(operation=operation, instance_id=backend['instance_id']):
+                    with calls_lock:
+                        calls.append((operation, instance_id, 'start'))
+                    time.sleep(0.1)
+                    if instance_id.startswith('fail'):
+                        raise RuntimeError('{} failed'.format(instance_id))
+                    with calls_lock:
+                        calls.append((operation, instance_id, 'end'))
+                setattr(plugin, operation, record)
+
+        combo = environment.add_fixture(
+            type=Type.PROVISIONER,
+            plugin_id=UCTT_PLUGIN_ID_PROVISIONER_COMBO,
+            instance_id='combo',
+            priority=10,
+            arguments={'label': name}).plugin
+        return combo, calls
+
+    def test_sequential_priority_order(self):
+        """ by default backends run one at a time, low to high priority """
+        combo, calls = self._combo('test_combo_sequential', [
+            {'instance_id': 'high', 'priority': 80},
+            {'instance_id': 'low', 'priority': 60}])
+
+        combo.apply()
+        combo.destroy()
+        self.assertEqual([call for call in calls if call[2] == 'start'], [
+            ('apply', 'low', 'start'),
+            ('apply', 'high', 'start'),
+            ('destroy', 'high', 'start'),
+            ('destroy', 'low', 'start')])
+
+    def test_concurrent_waves(self):
+        """ independent backends run together, dependents wait """
+        combo, calls = self._combo('test_combo_waves', [
+            {'instance_id': 'one'},
+            {'instance_id': 'two'},
+            {'instance_id': 'three', 'depends_on': ['one', 'two']}], concurrency=4)
+
+        self.assertEqual(combo.info()['waves'], [['one', 'two'], ['three']])
+
+        combo.apply()
+        starts = [call[1] for call in calls[:2]]
+        self.assertEqual(sorted(starts), ['one', 'two'])
+        self.assertEqual(calls[-2:], [('apply', 'three', 'start'),
+                                      ('apply', 'three', 'end')])
+        self.assertIn('apply', combo.timings['three'])
+
+        del calls[:]
+        combo.destroy()
+        self.assertEqual(calls[:2], [('destroy', 'three', 'start'),
+                                     ('destroy', 'three', 'end')])
+
+    def test_failures(self):
+        """ failures stop the run, or are collected """
+        backends = [
+            {'instance_id': 'fail1'},
+            {'instance_id': 'ok'},
+            {'instance_id': 'after', 'depends_on': ['fail1']},
+            {'instance_id': 'fail2', 'depends_on': ['ok']}]
+
+        combo, calls = self._combo(
+            'test_combo_fail_fast', backends, concurrency=2)
+        with self.assertRaises(ComboProvisionerError) as context:
+            combo.apply()
+        self.assertEqual(list(context.exception.errors), ['fail1'])
+        self.assertNotIn('fail2', [call[1] for call in calls])
+
+        combo, calls = self._combo(
+            'test_combo_collect', backends, concurrency=2, fail_fast=False)
+        with self.assertRaises(ComboProvisionerError) as context:
+            combo.apply()
+        self.assertEqual(sorted(context.exception.errors), ['fail1', 'fail2'])
+        self.assertNotIn('after', [call[1] for call in calls])
+
+    def test_circular_dependencies(self):
+        """ circular backend dependencies are caught """
+        with self.assertRaises(ValueError):
+            self._combo('test_combo_circular', [
+                {'instance_id': 'one', 'depends_on': ['two']},
+                {'instance_id': 'two', 'depends_on': ['one']}])
+
+    def test_merged_fixture_view(self):
+        """ backend fixtures are merged, and the view follows backend changes """
+        combo, calls = self._combo('test_combo_view', [
+            {'instance_id': 'low', 'priority': 60},
+            {'instance_id': 'high', 'priority': 80}])
+        environment = combo.environment
+        low = environment.fixtures.get_plugin(instance_id='low')
+        high = environment.fixtures.get_plugin(instance_id='high')
+
+        self.assertEqual(len(combo.get_fixtures()), 0)
+        self.assertIsNone(combo.get_fixture(
+            type=Type.CLIENT, exception_if_missing=False))
+
+        low.fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                                 plugin_id='one', instance_id='low-client', priority=90)
+        self.assertEqual(combo.get_fixture(
+            type=Type.CLIENT).instance_id, 'low-client')
+
+        # the higher priority backend wins, regardless of fixture priority
+        high.fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                                  plugin_id='one', instance_id='high-client', priority=50)
+        self.assertEqual(combo.get_fixture(
+            type=Type.CLIENT).instance_id, 'high-client')
+        self.assertEqual([fixture.instance_id for fixture in combo.get_fixtures(type=Type.CLIENT).to_list()],
+                         ['low-client', 'high-client'])
+        self.assertIs(combo._merged_view(), combo._merged_view())
+
+        # replacing a backend fixture set also changes the view
+        high.fixtures = Fixtures()
+        self.assertEqual(combo.get_fixture(
+            type=Type.CLIENT).instance_id, 'low-client')
+
+    def test_view_rebuild_during_lookup(self):
+        """ a lookup which races a view rebuild doesn't cache into the new view """
+        combo, calls = self._combo('test_combo_view_race', [
+            {'instance_id': 'low', 'priority': 60},
+            {'instance_id': 'high', 'priority': 80}])
+        low = combo.environment.fixtures.get_plugin(instance_id='low')
+
+        backend_get_fixture = low.get_fixture
+        raced = []
+
+        def racing_get_fixture(**kwargs):
+            # looked up against the backend fixtures before they change
+            fixture = backend_get_fixture(**kwargs)
+            if not raced:
+                raced.append(True)
+                low.fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                                         plugin_id='one', instance_id='low-client', priority=90)
+                # as if another thread rebuilt the view during our lookup
+                combo._merged_view()
+            return fixture
+        low.get_fixture = racing_get_fixture
+
+        self.assertIsNone(combo.get_fixture(
+            type=Type.CLIENT, exception_if_missing=False))
+        self.assertEqual(combo.get_fixture(
+            type=Type.CLIENT).instance_id, 'low-client')
@@ -10,16 +10,18 @@ Here we test the overall toolbox workflows using dummy plugins.
 """
 import logging
 import unittest
+from unittest import mock
 
 from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
 # UCTT components we will need to access the toolbox
-from uctt import new_environment, environment_names, get_environment
+from uctt import (new_environment, environment_names, get_environment, bootstrap,
+                  bootstrap_entrypoints, invalidate_bootstrap_cache, load_bootstraps)
 from uctt.plugin import Type, Factory
 # We import this so that we don't need to guess on plugin_ids, but not needed
 from uctt.contrib.dummy import UCTT_PLUGIN_ID_DUMMY
 
 # Imports used for type hinting
-from uctt.environment import Environment
+from uctt.environment import Environment, FixturesConstructionError
 from uctt.fixtures import Fixtures
 # imports used only for config creation for testing
 from uctt.provisioner import UCTT_PROVISIONER_CONFIG_PROVISIONERS_LABEL, UCTT_PROVISIONER_CONFIG_PROVISIONER_LABEL
@@ -38,6 +40,38 @@ logger.setLevel(logging.INFO)
 """ TESTS """
 
 
+class Bootstrapping(unittest.TestCase):
+
+    def test_bootstrap_entrypoints_cache(self):
+        """ entry_points are scanned once, and rescanned on invalidation """
+        entrypoints = bootstrap_entrypoints()
+        self.assertIn('uctt_dummy', entrypoints)
+        self.assertIs(bootstrap_entrypoints(), entrypoints)
+
+        invalidate_bootstrap_cache()
+        self.assertIsNot(bootstrap_entrypoints(), entrypoints)
+
+    def test_load_bootstraps(self):
+        """ bootstraps are loaded together, and missing ones are caught early """
+        functions = load_bootstraps(['uctt_validation', 'uctt_dummy'])
+        self.assertEqual(list(functions), ['uctt_validation', 'uctt_dummy'])
+        self.assertTrue(callable(functions['uctt_dummy']))
+
+        with self.assertRaises(KeyError):
+            load_bootstraps(['uctt_dummy', 'does.not.exist'])
+
+    def test_repeated_bootstraps(self):
+        """ a repeated id is loaded once, but run each time it is requested """
+        self.assertEqual(list(load_bootstraps(['uctt_dummy', 'uctt_dummy'])), ['uctt_dummy'])
+
+        runs = []
+        functions = {'one': lambda environment: runs.append('one'),
+                     'two': lambda environment: runs.append('two')}
+        with mock.patch('uctt.load_bootstraps', return_value=functions):
+            bootstrap(None, ['one', 'two', 'one'])
+        self.assertEqual(runs, ['one', 'two', 'one'])
+
+
 class PluginConstruction(unittest.TestCase):
 
     def _dummy_environment(self, name: str) -> Environment:
@@ -188,3 +222,99 @@ class PluginConstruction(unittest.TestCase):
         self.assertEqual(len(wls), 3)
         self.assertEqual(wls[0].instance_id, 'work2')
         self.assertEqual(wls[2].instance_id, 'work1')
+
+    def test_4_lazy_fixtures(self):
+        """ test that lazy fixtures are only built when first accessed """
+        environment = self._dummy_environment('test_4')
+
+        plugin_dict = {
+            'plugin_id': UCTT_PLUGIN_ID_DUMMY,
+            'arguments': {
+                'fixtures': {
+                    'lazy_output': {
+                        'type': Type.OUTPUT.value,
+                        'plugin_id': 'text',
+                        'arguments': {
+                            'text': "lazy output"
+                        }
+                    }
+                }
+            }
+        }
+
+        fixture = environment.add_fixture_from_dict(
+            type=Type.CLIENT, plugin_dict=plugin_dict, instance_id='lazy', lazy=True)
+
+        self.assertFalse(fixture.is_built())
+        # the dummy plugin builds its own fixtures on construction
+        self.assertIsNone(environment.fixtures.get_fixture(
+            instance_id='lazy_output', exception_if_missing=False))
+
+        client = environment.fixtures.get_plugin(instance_id='lazy')
+        self.assertIsInstance(client, DummyClientPlugin)
+        self.assertTrue(fixture.is_built())
+        self.assertIs(fixture.plugin, client)
+        self.assertEqual(client.get_output(
+            instance_id='lazy_output').get_output(), "lazy output")
+
+        with self.assertRaises(NotImplementedError):
+            environment.add_fixture(type=Type.CLIENT, plugin_id='does.not.exist',
+                                    instance_id='lazy_missing', priority=70, lazy=True)
+
+    def test_5_parallel_fixtures(self):
+        """ test building fixtures concurrently """
+        environment = self._dummy_environment('test_5')
+
+        plugins_dict = {}
+        for index in range(20):
+            plugins_dict['par{}'.format(index)] = {
+                'type': Type.WORKLOAD.value,
+                'plugin_id': UCTT_PLUGIN_ID_DUMMY,
+                'priority': 50 + (index % 3)
+            }
+
+        workloads = environment.add_fixtures_from_dict(
+            plugin_list=plugins_dict, workers=4)
+
+        self.assertEqual(len(workloads), 20)
+        self.assertEqual(environment.fixtures.count(type=Type.WORKLOAD), 20)
+        # fixtures are added in priority order, then declaration order
+        expected = sorted(plugins_dict.keys(), key=lambda instance_id: (
+            -plugins_dict[instance_id]['priority'], int(instance_id[3:])))
+        self.assertEqual([fixture.instance_id for fixture in environment.fixtures.fixtures],
+                         expected)
+
+        # all errors are collected, and nothing is added
+        plugins_dict['bad1'] = {'type': Type.WORKLOAD.value,
+                                'plugin_id': 'does.not.exist'}
+        plugins_dict['bad2'] = {'type': Type.WORKLOAD.value}
+        with self.assertRaises(FixturesConstructionError) as context:
+            environment.add_fixtures_from_dict(
+                plugin_list=plugins_dict, workers=4)
+        self.assertEqual(list(context.exception.errors), ['bad1', 'bad2'])
+        self.assertEqual(environment.fixtures.count(type=Type.WORKLOAD), 20)
+
+    def test_6_formatted_config(self):
+        """ plugin config values are formatted when building from config """
+        environment = self._dummy_environment('test_6')
+
+        environment.config.add_source(PLUGIN_ID_SOURCE_DICT, priority=80).set_data({
+            'variables': {
+                'plugin_id': UCTT_PLUGIN_ID_DUMMY,
+                'priority': 65
+            },
+            UCTT_WORKLOAD_CONFIG_WORKLOADS_LABEL: {
+                'formatted': {
+                    'plugin_id': '{variables:plugin_id}',
+                    'priority': '{variables:priority}'
+                }
+            }
+        })
+
+        workloads = environment.add_fixtures_from_config(
+            type=Type.WORKLOAD, label=UCTT_WORKLOAD_CONFIG_WORKLOADS_LABEL)
+
+        fixture = workloads.get_fixture(instance_id='formatted')
+        self.assertEqual(fixture.plugin_id, UCTT_PLUGIN_ID_DUMMY)
+        self.assertEqual(fixture.priority, 65)
+        self.assertIsInstance(fixture.plugin, DummyWorkloadPlugin)
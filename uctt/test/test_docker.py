@@ -0,0 +1,544 @@
+"""
+
+Docker workload testing.
+
+We don't want to depend on a docker daemon (or the docker SDK), so here we
+test the docker run workload against a stand-in docker client, which records
+the containers that it runs and removes.  The docker client plugin api client
+pool is tested against a stand-in docker SDK module.
+
+"""
+import asyncio
+import importlib
+import itertools
+import logging
+import re
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+
+from uctt import new_environment, environment_names, get_environment
+from uctt.plugin import Type
+from uctt.fixtures import Fixtures
+from uctt.contrib.docker import UCTT_PLUGIN_ID_DOCKER_CLIENT
+from uctt.contrib.docker.run_workload import DockerRunWorkloadPlugin, DockerRunWorkloadError, image_repository_tag
+
+logger = logging.getLogger("test_docker")
+logger.setLevel(logging.INFO)
+
+
+class FakeLogStream:
+    """ stand-in for a followed docker log stream, which blocks until closed """
+
+    def __init__(self):
+        self.closed = threading.Event()
+        self.sent = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.sent:
+            self.sent = True
+            return b'first\n'
+        self.closed.wait(5)
+        raise StopIteration()
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeContainer:
+    """ stand-in for a docker container handle """
+
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+
+    def remove(self, force: bool = False):
+        self.client.track('remove', self.name)
+
+    def logs(self, stream: bool = False, follow: bool = False, **kwargs):
+        if self.client.log_stream is not None:
+            return self.client.log_stream
+        # chunks don't line up with lines, or with multi-byte characters
+        return iter([b'one\ntw', b'o\nthr\xc3', b'\xa9e\n', b'four'])
+
+    def stats(self, stream: bool = True, decode: bool = False):
+        def stat(total_usage: int, system_cpu_usage: int, usage: int):
+            return {
+                'read': str(total_usage),
+                'cpu_stats': {'cpu_usage': {'total_usage': total_usage}, 'system_cpu_usage': system_cpu_usage, 'online_cpus': 2},
+                'precpu_stats': {'cpu_usage': {'total_usage': 0}, 'system_cpu_usage': 0},
+                'memory_stats': {'usage': usage, 'limit': 1000, 'stats': {'inactive_file': 100}},
+                'blkio_stats': {'io_service_bytes_recursive': [{'op': 'Read', 'value': 10}, {'op': 'Write', 'value': 20}]},
+                'networks': {'eth0': {'rx_bytes': 1, 'tx_bytes': 2}, 'eth1': {'rx_bytes': 3, 'tx_bytes': 4}}
+            }
+        results = [stat(10, 100, 300), stat(20, 100, 600), stat(30, 100, 900)]
+        return iter(results) if stream else results[0]
+
+
+class FakeImage:
+    """ stand-in for a docker image """
+
+    def __init__(self, name: str):
+        self.id = 'sha256:id-{}'.format(name)
+        repository = re.split('[:@]', name)[0]
+        self.attrs = {'RepoDigests': ['{}@sha256:digest-{}'.format(repository, repository)]}
+
+
+class ImageNotFound(Exception):
+    """ stand-in for docker.errors.ImageNotFound """
+    status_code = 404
+
+
+class FakeImages:
+    """ stand-in for the docker client images collection """
+
+    def __init__(self, client):
+        self.client = client
+        self.local = set()
+
+    def get(self, name: str):
+        if name not in self.local:
+            raise ImageNotFound(name)
+        return FakeImage(name)
+
+    def pull(self, repository: str, tag: str = None):
+        if tag is None:
+            raise ValueError('pulling every tag of {}'.format(repository))
+        name = '{}{}{}'.format(repository, '@' if tag.startswith('sha256:') else ':', tag)
+        self.client.track('pull', name)
+        self.local.add(name)
+        return FakeImage(name)
+
+
+class FakeContainers:
+    """ stand-in for the docker client containers collection """
+
+    def __init__(self, client):
+        self.client = client
+
+    def run(self, image: str, name: str = '', **kwargs):
+        if name in self.client.fail:
+            raise RuntimeError('{} failed'.format(name))
+        self.client.track('run', name)
+        self.client.images_run.append(image)
+        return FakeContainer(self.client, name)
+
+
+class FakeDockerClient:
+    """ stand-in for the docker client plugin, which tracks concurrency """
+
+    def __init__(self):
+        self.containers = FakeContainers(self)
+        self.images = FakeImages(self)
+        self.images_run = []
+        self.log_stream = None
+        self.fail = set()
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def track(self, operation: str, name: str):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+            self.calls.append((operation, name))
+
+
+class FakeAPIClient:
+    """ stand-in for a docker SDK APIClient """
+
+    def __init__(self, environment, version: str, max_pool_size: int):
+        self.environment = environment
+        self.max_pool_size = max_pool_size
+        self.negotiated = version == 'auto'
+        self.api_version = '1.41' if self.negotiated else version
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSDKDockerClient:
+    """ stand-in for the docker SDK DockerClient, which records from_env calls """
+
+    created = []
+    gate = None
+    """ optional callable run in from_env, to hold up creation in tests """
+
+    def __init__(self, api):
+        self.api = api
+
+    def version(self):
+        return {'ApiVersion': self.api.api_version}
+
+    @classmethod
+    def from_env(cls, environment, version: str, max_pool_size: int):
+        if cls.gate is not None:
+            cls.gate(environment)
+        api = FakeAPIClient(environment, version, max_pool_size)
+        cls.created.append(api)
+        return cls(api)
+
+
+def fake_docker_sdk():
+    """ stand-in docker SDK modules, for patching into sys.modules """
+    docker = types.ModuleType('docker')
+    constants = types.ModuleType('docker.constants')
+    constants.DEFAULT_MAX_POOL_SIZE = 10
+    docker.constants = constants
+    docker.APIClient = FakeAPIClient
+    docker.DockerClient = FakeSDKDockerClient
+    return {'docker': docker, 'docker.constants': constants}
+
+
+""" TESTS """
+
+
+class DockerRunWorkload(unittest.TestCase):
+
+    def _workload(self, name: str, workload_config):
+        """ make a docker run workload using a stand-in docker client """
+        if not name in environment_names():
+            new_environment(name=name)
+        environment = get_environment(name=name)
+        environment.config.add_source(PLUGIN_ID_SOURCE_DICT, priority=80).set_data({
+            'docker': {'workload': {'run': workload_config}}
+        })
+
+        client = FakeDockerClient()
+        fixtures = Fixtures()
+        fixtures.new_fixture(plugin=client, type=Type.CLIENT,
+                             plugin_id=UCTT_PLUGIN_ID_DOCKER_CLIENT, instance_id='docker', priority=50)
+
+        workload = DockerRunWorkloadPlugin(environment, name)
+        workload.set_fixtures(fixtures)
+        return workload, client
+
+    def test_single_run(self):
+        """ without replicas, one container is run as before """
+        workload, client = self._workload('test_docker_single', {
+            'run': {'image': 'test', 'name': 'one'}})
+
+        container = workload.apply()
+        self.assertEqual(container.name, 'one')
+        workload.destroy()
+        self.assertEqual(client.calls, [('run', 'one'), ('remove', 'one')])
+
+    def test_replicas(self):
+        """ replicas are run and removed concurrently """
+        workload, client = self._workload('test_docker_replicas', {
+            'run': {'image': 'test', 'name': 'replica'},
+            'replicas': 10,
+            'concurrency': 4})
+
+        containers = workload.apply()
+        self.assertEqual([container.name for container in containers],
+                         ['replica-{}'.format(index) for index in range(10)])
+        self.assertEqual(client.max_active, 4)
+
+        client.max_active = 0
+        workload.destroy()
+        self.assertEqual(len([call for call in client.calls if call[0] == 'remove']), 10)
+        self.assertEqual(client.max_active, 4)
+        self.assertEqual(workload.containers, [])
+
+    def test_replica_failure(self):
+        """ replica failures are collected, and the rest can be destroyed """
+        workload, client = self._workload('test_docker_failure', {
+            'run': {'image': 'test', 'name': 'replica'},
+            'replicas': 3})
+        client.fail.add('replica-1')
+
+        with self.assertRaises(DockerRunWorkloadError) as context:
+            workload.apply()
+        self.assertEqual(list(context.exception.errors), [1])
+        self.assertEqual([container.name for container in workload.containers],
+                         ['replica-0', 'replica-2'])
+        workload.destroy()
+        self.assertEqual(workload.containers, [])
+
+    def test_log_stream(self):
+        """ logs are streamed as lines and retained in a ring buffer """
+        workload, client = self._workload('test_docker_logs', {
+            'run': {'image': 'test', 'name': 'logs', 'detach': True},
+            'retention': 2})
+        workload.apply()
+
+        self.assertEqual(list(workload.logs()), ['one', 'two', 'thr\u00e9e', 'four'])
+        self.assertEqual(list(workload.log_lines[0]), ['thr\u00e9e', 'four'])
+
+        async def consume():
+            return [line async for line in workload.alogs(follow=False)]
+        self.assertEqual(asyncio.run(consume()), [
+                         'one', 'two', 'thr\u00e9e', 'four'])
+
+        with self.assertRaises(ValueError):
+            next(workload.logs(index=1))
+
+    def test_log_stream_cancel(self):
+        """ cancelling an async log consumer closes the blocked docker stream """
+        workload, client = self._workload('test_docker_logs_cancel', {
+            'run': {'image': 'test', 'name': 'logs', 'detach': True}})
+        workload.apply()
+        client.log_stream = FakeLogStream()
+
+        async def consume():
+            lines = []
+
+            async def read():
+                async for line in workload.alogs():
+                    lines.append(line)
+
+            task = asyncio.get_running_loop().create_task(read())
+            while not lines:
+                await asyncio.sleep(0.01)
+            # the reader thread is now blocked on the stream
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return lines
+
+        started = time.monotonic()
+        self.assertEqual(asyncio.run(consume()), ['first'])
+        self.assertTrue(client.log_stream.closed.is_set())
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_stats_stream(self):
+        """ stats are reduced to samples, retained and exported """
+        workload, client = self._workload('test_docker_stats', {
+            'run': {'image': 'test', 'name': 'stats', 'detach': True},
+            'retention': 2,
+            'export_stats': True})
+        workload.apply()
+
+        stream = workload.stats()
+        samples = [next(stream)]
+        # nothing is exported until the stream ends
+        self.assertIsNone(workload.get_output(
+            instance_id='test_docker_stats-stats', exception_if_missing=False))
+        samples.extend(stream)
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(samples[0]['cpu_percent'], 20.0)
+        self.assertEqual(samples[0]['memory_usage'], 200)
+        self.assertEqual(samples[0]['memory_percent'], 20.0)
+        self.assertEqual(samples[0]['io_write_bytes'], 20)
+        self.assertEqual(samples[0]['net_rx_bytes'], 4)
+        self.assertEqual(len(workload.stats_samples[0]), 2)
+
+        output = workload.get_output(instance_id='test_docker_stats-stats')
+        self.assertEqual(output.get_output('latest.0.cpu_percent'), 60.0)
+        self.assertEqual(len(output.get_output('samples.0')), 2)
+
+        # with an interval, samples are also exported while streaming
+        workload.loaded_config.get(['workload.run'])['export_interval'] = 1
+        with mock.patch('uctt.contrib.docker.run_workload.time.monotonic', side_effect=itertools.count(0, 2)):
+            stream = workload.stats()
+            next(stream)
+            self.assertEqual(output.get_output('latest.0.cpu_percent'), 20.0)
+            stream.close()
+
+        async def consume():
+            return [sample async for sample in workload.astats(follow=False)]
+        self.assertEqual(asyncio.run(consume())[0]['cpu_percent'], 20.0)
+        self.assertEqual(output.get_output('latest.0.cpu_percent'), 20.0)
+
+    def test_prepare_images(self):
+        """ prepare pulls images in parallel, verifies them, and apply runs them """
+        workload, client = self._workload('test_docker_prepare', {
+            'run': {'image': 'one:1', 'name': 'prepare'},
+            'images': ['two', 'three'],
+            'digests': {'two': 'sha256:digest-two'}})
+        client.images.local.add('three')
+
+        workload.prepare()
+        self.assertEqual(sorted(call[1] for call in client.calls if call[0] == 'pull'),
+                         ['one:1', 'two:latest'])
+        self.assertEqual(client.max_active, 2)
+        self.assertFalse(workload.images['three']['pulled'])
+        self.assertIn('seconds', workload.images['one:1'])
+
+        del client.calls[:]
+        workload.apply()
+        self.assertEqual(client.calls, [('run', 'prepare')])
+        self.assertEqual(client.images_run, ['sha256:id-one:1'])
+
+        # a digest mismatch fails the pull
+        workload, client = self._workload('test_docker_prepare_digest', {
+            'run': {'image': 'one'},
+            'digests': {'one': 'sha256:other'}})
+        with self.assertRaises(DockerRunWorkloadError) as context:
+            workload.prepare()
+        self.assertEqual(list(context.exception.errors), ['one'])
+
+        # images referenced by digest are pulled by digest, and verified
+        workload, client = self._workload('test_docker_prepare_by_digest', {
+            'run': {'image': 'four@sha256:digest-four'}})
+        workload.prepare()
+        self.assertEqual(client.calls, [('pull', 'four@sha256:digest-four')])
+
+    def test_image_repository_tag(self):
+        """ image names are split into a repository and an explicit tag """
+        self.assertEqual(image_repository_tag('busybox'), ('busybox', 'latest'))
+        self.assertEqual(image_repository_tag('busybox:1.36'), ('busybox', '1.36'))
+        self.assertEqual(image_repository_tag('registry:5000/team/app'),
+                         ('registry:5000/team/app', 'latest'))
+        self.assertEqual(image_repository_tag('registry:5000/team/app:v2'),
+                         ('registry:5000/team/app', 'v2'))
+        self.assertEqual(image_repository_tag('app@sha256:abc'), ('app', 'sha256:abc'))
+
+
+class DockerClientPool(unittest.TestCase):
+
+    def setUp(self):
+        """ import the docker client module against a stand-in docker SDK """
+        patcher = mock.patch.dict(sys.modules, fake_docker_sdk())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop('uctt.contrib.docker.client', None)
+        self.client = importlib.import_module('uctt.contrib.docker.client')
+        self.addCleanup(self._forget_client_module)
+        FakeSDKDockerClient.created = []
+        FakeSDKDockerClient.gate = None
+        self.addCleanup(setattr, FakeSDKDockerClient, 'gate', None)
+
+    def _forget_client_module(self):
+        """ don't leave the stand-in backed module on the package """
+        package = sys.modules['uctt.contrib.docker']
+        if 'client' in vars(package):
+            delattr(package, 'client')
+
+    def _plugin(self, **kwargs):
+        """ make a docker client plugin """
+        name = 'test_docker_client_pool'
+        if not name in environment_names():
+            new_environment(name=name)
+        args = {'host': 'unix:///var/run/docker.sock', 'cert_path': ''}
+        args.update(kwargs)
+        return self.client.DockerClientPlugin(get_environment(name=name), 'docker', **args)
+
+    def test_keying(self):
+        """ api clients are pooled on host, cert_path, tls_verify and version """
+        args = {'host': 'tcp://one:2376', 'cert_path': '/certs', 'tls_verify': '1', 'version': 'auto'}
+        api = self.client.shared_api_client(**args)
+        self.assertIs(self.client.shared_api_client(**args), api)
+        self.assertEqual(api.environment['DOCKER_HOST'], 'tcp://one:2376')
+
+        for key, value in [('host', 'tcp://two:2376'), ('cert_path', '/other'),
+                           ('tls_verify', '0'), ('version', '1.40')]:
+            other = dict(args, **{key: value})
+            self.assertIsNot(self.client.shared_api_client(**other), api, key)
+        self.assertEqual(len(FakeSDKDockerClient.created), 5)
+
+    def test_plugin_reuse(self):
+        """ plugins for the same daemon share one api client, which close() keeps """
+        one = self._plugin()
+        two = self._plugin()
+        self.assertIs(one.api, two.api)
+        self.assertEqual(len(FakeSDKDockerClient.created), 1)
+
+        one.close()
+        self.assertFalse(two.api.closed)
+        self.assertIsNot(self._plugin(tls_verify=False).api, one.api)
+
+    def test_pinned_version(self):
+        """ a pinned version is handed to the SDK, which skips negotiation """
+        pinned = self._plugin(version='1.40')
+        self.assertFalse(pinned.api.negotiated)
+        self.assertEqual(pinned.api_version_pin, '1.40')
+        # the DockerClient version() method isn't hidden by the pin
+        self.assertEqual(pinned.version(), {'ApiVersion': '1.40'})
+        self.assertEqual(pinned.info()['docker']['api_version'], '1.40')
+
+        negotiated = self._plugin()
+        self.assertTrue(negotiated.api.negotiated)
+        self.assertIsNot(negotiated.api, pinned.api)
+
+    def test_pool_size(self):
+        """ the first plugin decides the pool size, later sizes only warn """
+        self.assertEqual(self._plugin().api.max_pool_size, 10)
+        self.client.close_api_clients()
+
+        plugin = self._plugin(pool_size=32)
+        self.assertEqual(plugin.api.max_pool_size, 32)
+        with self.assertLogs('uctt.contrib.docker.client', level='WARNING'):
+            self.assertIs(self._plugin(pool_size=4).api, plugin.api)
+        self.assertEqual(plugin.api.max_pool_size, 32)
+
+    def test_unshared(self):
+        """ unshared plugins get and close their own api client """
+        shared = self._plugin()
+        one = self._plugin(shared=False)
+        two = self._plugin(shared=False)
+        self.assertIsNot(one.api, shared.api)
+        self.assertIsNot(one.api, two.api)
+
+        one.close()
+        self.assertTrue(one.api.closed)
+        self.assertFalse(two.api.closed)
+        self.assertFalse(shared.api.closed)
+        self.assertIs(self._plugin().api, shared.api)
+
+    def test_close_api_clients(self):
+        """ closing the pool closes every pooled client and forgets it """
+        one = self._plugin()
+        two = self._plugin(host='tcp://two:2376')
+        self.client.close_api_clients()
+        self.assertTrue(one.api.closed)
+        self.assertTrue(two.api.closed)
+
+        three = self._plugin()
+        self.assertIsNot(three.api, one.api)
+        self.assertFalse(three.api.closed)
+
+    def test_slow_daemon(self):
+        """ a slow client creation doesn't hold up clients for other daemons """
+        release = threading.Event()
+
+        def gate(environment):
+            if environment['DOCKER_HOST'] == 'tcp://slow:2376':
+                release.wait(5)
+        FakeSDKDockerClient.gate = gate
+
+        slow = {}
+        thread = threading.Thread(target=lambda: slow.update(
+            api=self.client.shared_api_client('tcp://slow:2376', '', '1', 'auto')))
+        thread.start()
+        try:
+            fast = self.client.shared_api_client('tcp://fast:2376', '', '1', 'auto')
+            self.assertEqual(fast.environment['DOCKER_HOST'], 'tcp://fast:2376')
+            self.assertNotIn('api', slow)
+        finally:
+            release.set()
+            thread.join()
+        self.assertIs(self.client.shared_api_client('tcp://slow:2376', '', '1', 'auto'), slow['api'])
+
+    def test_creation_race(self):
+        """ concurrent creation for one key pools one client and closes the other """
+        barrier = threading.Barrier(2, timeout=5)
+        FakeSDKDockerClient.gate = lambda environment: barrier.wait()
+
+        apis = []
+        threads = [threading.Thread(target=lambda: apis.append(
+            self.client.shared_api_client('tcp://one:2376', '', '1', 'auto'))) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIs(apis[0], apis[1])
+        self.assertFalse(apis[0].closed)
+        self.assertEqual(len(FakeSDKDockerClient.created), 2)
+        self.assertEqual([api.closed for api in FakeSDKDockerClient.created].count(True), 1)
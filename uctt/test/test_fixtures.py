@@ -0,0 +1,106 @@
+"""
+
+Fixtures set testing.
+
+The Fixtures object doesn't need an environment or any real plugins, so here we
+test its filtering and sorting mechanics directly using placeholder plugin
+objects.
+
+"""
+import logging
+import unittest
+
+from uctt.plugin import Type
+from uctt.fixtures import Fixtures
+
+logger = logging.getLogger("test_fixtures")
+logger.setLevel(logging.INFO)
+
+""" TESTS """
+
+
+class FixturesFiltering(unittest.TestCase):
+
+    def _fixtures(self) -> Fixtures:
+        """ Create a Fixtures set with a mix of types/plugin_ids/instance_ids """
+        fixtures = Fixtures()
+        fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                             plugin_id='one', instance_id='cl1', priority=50)
+        fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                             plugin_id='two', instance_id='cl2', priority=70)
+        fixtures.new_fixture(plugin=object(), type=Type.OUTPUT,
+                             plugin_id='one', instance_id='out1', priority=60)
+        fixtures.new_fixture(plugin=object(), type=Type.OUTPUT,
+                             plugin_id='one', instance_id='cl1', priority=40)
+        return fixtures
+
+    def test_filter_combinations(self):
+        """ every combination of filter arguments matches as expected """
+        fixtures = self._fixtures()
+
+        self.assertEqual(fixtures.count(), 4)
+        self.assertEqual(fixtures.count(type=Type.CLIENT), 2)
+        self.assertEqual(fixtures.count(plugin_id='one'), 3)
+        self.assertEqual(fixtures.count(instance_id='cl1'), 2)
+        self.assertEqual(fixtures.count(
+            type=Type.OUTPUT, plugin_id='one'), 2)
+        self.assertEqual(fixtures.count(
+            type=Type.CLIENT, instance_id='cl1'), 1)
+        self.assertEqual(fixtures.count(
+            plugin_id='one', instance_id='cl1'), 2)
+        self.assertEqual(fixtures.count(
+            type=Type.OUTPUT, plugin_id='one', instance_id='cl1'), 1)
+        self.assertEqual(fixtures.count(type=Type.WORKLOAD), 0)
+        self.assertEqual(fixtures.count(
+            type=Type.CLIENT, plugin_id='one', instance_id='out1'), 0)
+
+    def test_get_fixture_priority(self):
+        """ the highest priority match is returned """
+        fixtures = self._fixtures()
+
+        self.assertEqual(fixtures.get_fixture().instance_id, 'cl2')
+        self.assertEqual(fixtures.get_fixture(
+            plugin_id='one').instance_id, 'out1')
+        self.assertEqual(fixtures.get_fixture(
+            instance_id='cl1').type, Type.CLIENT)
+
+        with self.assertRaises(KeyError):
+            fixtures.get_fixture(type=Type.WORKLOAD)
+        self.assertIsNone(fixtures.get_fixture(
+            type=Type.WORKLOAD, exception_if_missing=False))
+
+    def test_merge_fixtures(self):
+        """ merged fixtures are filterable in the merged set """
+        fixtures = self._fixtures()
+
+        merge_from = Fixtures()
+        merge_from.new_fixture(plugin=object(), type=Type.WORKLOAD,
+                               plugin_id='one', instance_id='work1', priority=90)
+        fixtures.merge_fixtures(merge_from)
+
+        self.assertEqual(len(fixtures), 5)
+        self.assertEqual(fixtures.count(plugin_id='one'), 4)
+        self.assertEqual(fixtures.get_fixture(
+            plugin_id='one').instance_id, 'work1')
+        self.assertEqual(fixtures['work1'],
+                         merge_from.get_plugin(instance_id='work1'))
+
+    def test_priority_order(self):
+        """ fixtures are kept in priority order, stable for equal priorities """
+        fixtures = self._fixtures()
+
+        self.assertEqual([fixture.instance_id for fixture in fixtures.to_list()],
+                         ['cl2', 'out1', 'cl1', 'cl1'])
+
+        # adding a fixture must invalidate any previously sorted list
+        fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                             plugin_id='three', instance_id='cl3', priority=70)
+        fixtures.new_fixture(plugin=object(), type=Type.CLIENT,
+                             plugin_id='four', instance_id='cl4', priority=95)
+
+        self.assertEqual([fixture.instance_id for fixture in fixtures.to_list()],
+                         ['cl4', 'cl2', 'cl3', 'out1', 'cl1', 'cl1'])
+        self.assertEqual([fixture.instance_id for fixture in fixtures.get_fixtures(type=Type.CLIENT).to_list()],
+                         ['cl4', 'cl2', 'cl3', 'cl1'])
+        self.assertEqual(fixtures.get_fixture(
+            type=Type.CLIENT, plugin_id='three').instance_id, 'cl3')
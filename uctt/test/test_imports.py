@@ -0,0 +1,75 @@
+"""
+
+Import time testing.
+
+Creating an environment runs all of the default bootstraps, which import the
+contrib packages.  The contrib packages should not import their heavy third
+party SDKs until a plugin which needs them is created, so here we use
+python -X importtime to check what an environment startup imports.
+
+"""
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+logger = logging.getLogger("test_imports")
+logger.setLevel(logging.INFO)
+
+DEFERRED_SDK_MODULES = [
+    'docker',
+    'kubernetes'
+]
+""" Third party SDKs which should not be imported by new_environment() """
+
+""" TESTS """
+
+
+class ImportTime(unittest.TestCase):
+
+    def _importtime(self, code: str):
+        """ Run python code in a subprocess and return the imported modules
+
+        Returns:
+        --------
+
+        Dict of cumulative import time in microseconds keyed by module name
+
+        """
+        env = os.environ.copy()
+        # disable the registry cache so that all of the bootstraps really run
+        env['UCTT_REGISTRY_CACHE'] = ''
+
+        exec = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              env=env, stderr=subprocess.PIPE, text=True)
+        self.assertEqual(exec.returncode, 0, exec.stderr)
+
+        modules = {}
+        for line in exec.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            fields = line[len('import time:'):].split('|')
+            try:
+                modules[fields[2].strip()] = int(fields[1])
+            except (IndexError, ValueError):
+                # the header line
+                continue
+        return modules
+
+    def test_new_environment_imports(self):
+        """ new_environment() runs the contrib bootstraps without their SDKs """
+        modules = self._importtime(
+            "import uctt; uctt.new_environment()")
+
+        # make sure that the contrib bootstraps actually ran
+        self.assertIn('uctt.contrib.docker.run_workload', modules)
+        self.assertIn('uctt.contrib.kubernetes.client', modules)
+
+        for sdk in DEFERRED_SDK_MODULES:
+            imported = [module for module in modules if module ==
+                        sdk or module.startswith(sdk + '.')]
+            self.assertEqual(imported, [],
+                             "new_environment() imported {}".format(sdk))
+
+        logger.info("uctt import time: %sus", modules.get('uctt'))
@@ -0,0 +1,674 @@
+"""
+
+Kubernetes workload testing.
+
+We don't want to depend on a cluster (or the kubernetes SDK), so here we test
+the manifest set workload against a stand-in kubernetes client plugin, whose
+dynamic client records the api calls made.  The kubernetes client plugin is
+tested against a stand-in kubernetes SDK module.
+
+"""
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+
+from uctt import new_environment, environment_names, get_environment
+from uctt.plugin import Type
+from uctt.fixtures import Fixtures
+from uctt.contrib.kubernetes import UCTT_PLUGIN_ID_KUBERNETES_CLIENT
+from uctt.contrib.kubernetes.client import KubernetesClientPlugin
+from uctt.contrib.kubernetes.deployment_workload import KubernetesDeploymentWorkloadPlugin, deployment_ready
+from uctt.contrib.kubernetes.informer import Informer
+from uctt.contrib.kubernetes.manifest_workload import KubernetesManifestsWorkloadPlugin, KubernetesManifestsWorkloadError, load_manifests, manifest_levels
+
+logger = logging.getLogger("test_kubernetes")
+logger.setLevel(logging.INFO)
+
+MANIFESTS = """
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+---
+apiVersion: v1
+kind: List
+items:
+- apiVersion: v1
+  kind: ConfigMap
+  metadata:
+    name: one
+- apiVersion: v1
+  kind: ConfigMap
+  metadata:
+    name: two
+"""
+""" a multi document manifest file """
+
+
+class ApiException(Exception):
+    """ stand-in for kubernetes.client.rest.ApiException """
+    status = 500
+
+
+class NotFound(ApiException):
+    """ stand-in for a kubernetes 404 ApiException """
+    status = 404
+
+
+class FakeResource:
+    """ stand-in for a dynamic client api resource """
+
+    def __init__(self, dynamic, kind: str):
+        self.dynamic = dynamic
+        self.kind = kind
+        self.namespaced = kind != 'Namespace'
+
+    def path(self, name: str = None, namespace: str = None):
+        return '/{}/{}/{}'.format(namespace, self.kind, name)
+
+    def delete(self, name: str, namespace: str = None, body=None):
+        if name in self.dynamic.missing:
+            raise NotFound(name)
+        return self.dynamic.track('delete', self.path(name, namespace))
+
+
+class FakeResources:
+
+    def __init__(self, dynamic):
+        self.dynamic = dynamic
+
+    def get(self, api_version: str, kind: str):
+        return FakeResource(self.dynamic, kind)
+
+
+class FakeApiClient:
+
+    def __init__(self, dynamic):
+        self.dynamic = dynamic
+
+    def call_api(self, path, method, query_params=None, header_params=None, body=None, **kwargs):
+        if 'fail' in path:
+            raise RuntimeError('{} failed'.format(path))
+        self.dynamic.headers = header_params
+        return self.dynamic.track(method, path, json.loads(body))
+
+
+class FakeDynamicClient:
+    """ stand-in dynamic client, which tracks calls and concurrency """
+
+    def __init__(self):
+        self.resources = FakeResources(self)
+        self.client = FakeApiClient(self)
+        self.calls = []
+        self.missing = set()
+        self.delays = {}
+        """ seconds that calls take, by path, to change completion order """
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def track(self, method: str, path: str, body=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delays.get(path, 0.05))
+        with self.lock:
+            self.active -= 1
+            self.calls.append((method, path))
+        return body
+
+
+class FakeKubernetesClient:
+
+    def __init__(self):
+        self.dynamic = FakeDynamicClient()
+
+    def get_dynamic_client(self):
+        return self.dynamic
+
+
+def kube_object(name: str, namespace: str = 'default', labels=None, version: str = '1'):
+    """ stand-in for a kubernetes SDK model object """
+    return SimpleNamespace(metadata=SimpleNamespace(
+        name=name, namespace=namespace, labels=labels, resource_version=version))
+
+
+class Gone(ApiException):
+    """ stand-in for a kubernetes 410 ApiException """
+    status = 410
+
+
+class FakeWatch:
+    """ stand-in for kubernetes.watch.Watch, which streams queued events """
+
+    def __init__(self, events: queue.Queue, calls: list):
+        self.events = events
+        self.calls = calls
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def stream(self, function, resource_version: str = '', timeout_seconds: int = None, **kwargs):
+        self.calls.append(('watch', resource_version))
+        # like the API server, end the stream after timeout_seconds
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+        while not self.stopped:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            try:
+                event = self.events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if isinstance(event, Exception):
+                raise event
+            if event is None:
+                # server ended the stream
+                return
+            yield event
+
+
+class FakeResponse:
+    """ stand-in for a watch http response """
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeResponseWatch:
+    """ stand-in for kubernetes.watch.Watch, which blocks reading the response
+
+    Like the SDK watch, stop() doesn't end a blocked read; only closing the
+    response does.
+
+    """
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+
+    def stop(self):
+        pass
+
+    def stream(self, function, **kwargs):
+        response = function(watch=True, **kwargs)
+        while not (response.closed.is_set() or self.release.is_set()):
+            time.sleep(0.01)
+        raise ConnectionError("Connection broken: response closed")
+        yield
+
+
+def kube_deployment(version: str, generation: int = 1, observed: int = 1,
+                    available: int = 0, updated: int = 0, replicas: int = 2):
+    """ stand-in for a kubernetes V1Deployment """
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name='web', namespace='default', labels=None, generation=generation, resource_version=version),
+        spec=SimpleNamespace(replicas=replicas),
+        status=SimpleNamespace(observed_generation=observed, available_replicas=available, updated_replicas=updated))
+
+
+class FakeAppsApi:
+    """ stand-in AppsV1Api, which returns queued deployment reads """
+
+    def __init__(self, reads: list, calls: list):
+        self.reads = reads
+        self.calls = calls
+
+    def read_namespaced_deployment(self, name: str, namespace: str):
+        self.calls.append(('read', '{}/{}'.format(namespace, name)))
+        return self.reads.pop(0)
+
+    def list_namespaced_deployment(self, **kwargs):
+        raise NotImplementedError("only used through the watch")
+
+
+class FakeAppsClient:
+    """ stand-in kubernetes client plugin, for the deployment workload """
+
+    def __init__(self, apps: FakeAppsApi):
+        self.apps = apps
+
+    def get_AppsV1Api_client(self):
+        return self.apps
+
+
+class FakeConfiguration:
+    """ stand-in for kubernetes.client.Configuration """
+
+    def __init__(self):
+        self.connection_pool_maxsize = 4
+        self.config_file = None
+
+
+class FakeSDKApiClient:
+    """ stand-in for kubernetes.client.ApiClient """
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+        # the SDK sizes the urllib3 pool when the api client is built
+        self.pool_maxsize = configuration.connection_pool_maxsize
+
+
+class FakeTypedApi:
+    """ stand-in for a typed kubernetes api (CoreV1Api, DynamicClient ...) """
+
+    def __init__(self, api_client):
+        self.api_client = api_client
+
+
+def load_kube_config(config_file: str, client_configuration):
+    """ stand-in for kubernetes.config.load_kube_config """
+    client_configuration.config_file = config_file
+
+
+def fake_kubernetes_sdk(watch_factory=None):
+    """ stand-in kubernetes SDK module, for patching into sys.modules """
+    kubernetes = types.ModuleType('kubernetes')
+    kubernetes.client = SimpleNamespace(
+        Configuration=FakeConfiguration, ApiClient=FakeSDKApiClient,
+        CoreV1Api=type('CoreV1Api', (FakeTypedApi,), {}),
+        AppsV1Api=type('AppsV1Api', (FakeTypedApi,), {}),
+        rest=SimpleNamespace(ApiException=ApiException))
+    kubernetes.config = SimpleNamespace(load_kube_config=load_kube_config)
+    kubernetes.dynamic = SimpleNamespace(
+        DynamicClient=type('DynamicClient', (FakeTypedApi,), {}))
+    kubernetes.watch = SimpleNamespace(Watch=watch_factory)
+    return kubernetes
+
+
+""" TESTS """
+
+
+class KubernetesManifestsWorkload(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.temp_dir.name, 'stack.yaml'), 'w') as manifest_file:
+            manifest_file.write(MANIFESTS)
+        with open(os.path.join(self.temp_dir.name, 'ignored.txt'), 'w') as other_file:
+            other_file.write('not a manifest')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _workload(self, name: str, workload_config):
+        """ make a manifest workload using a stand-in kubernetes client """
+        if not name in environment_names():
+            new_environment(name=name)
+        environment = get_environment(name=name)
+        environment.config.add_source(PLUGIN_ID_SOURCE_DICT, priority=80).set_data({
+            'kubernetes': {'workload': {'manifests': workload_config}}
+        })
+
+        client = FakeKubernetesClient()
+        fixtures = Fixtures()
+        fixtures.new_fixture(plugin=client, type=Type.CLIENT,
+                             plugin_id=UCTT_PLUGIN_ID_KUBERNETES_CLIENT, instance_id='kubernetes', priority=50)
+
+        workload = KubernetesManifestsWorkloadPlugin(environment, name)
+        workload.set_fixtures(fixtures)
+        return workload, client.dynamic
+
+    def test_levels(self):
+        """ manifests are loaded from a directory and ordered by kind """
+        manifests = load_manifests(self.temp_dir.name)
+        self.assertEqual(len(manifests), 4)
+
+        levels = manifest_levels(manifests + [
+            {'kind': 'Namespace', 'metadata': {'name': 'test'}},
+            {'kind': 'MyResource', 'metadata': {'name': 'custom'}}])
+        self.assertEqual([[manifest['kind'] for manifest in level] for level in levels], [
+            ['Namespace'], ['ConfigMap', 'ConfigMap'], ['Service'], ['Deployment'], ['MyResource']])
+
+    def test_apply_destroy(self):
+        """ levels are applied concurrently in order, and deleted in reverse """
+        workload, dynamic = self._workload('test_kubernetes_manifests', {
+            'namespace': 'test',
+            'path': self.temp_dir.name,
+            'manifests': [{'apiVersion': 'v1', 'kind': 'Namespace', 'metadata': {'name': 'test'}}]})
+
+        applied = workload.apply()
+        self.assertEqual(len(applied), 5)
+        self.assertEqual(dynamic.headers['Content-Type'],
+                         'application/apply-patch+yaml')
+        paths = [path for method, path in dynamic.calls]
+        self.assertEqual(paths[0], '/None/Namespace/test')
+        self.assertEqual(sorted(paths[1:3]), [
+                         '/test/ConfigMap/one', '/test/ConfigMap/two'])
+        self.assertEqual(paths[3:], ['/test/Service/web', '/test/Deployment/web'])
+        self.assertEqual(dynamic.max_active, 2)
+
+        del dynamic.calls[:]
+        dynamic.missing.add('web')
+        workload.destroy()
+        paths = [path for method, path in dynamic.calls]
+        self.assertEqual(sorted(paths[:2]), [
+                         '/test/ConfigMap/one', '/test/ConfigMap/two'])
+        self.assertEqual(paths[2:], ['/None/Namespace/test'])
+
+    def test_apply_failure(self):
+        """ a failed level stops the later levels """
+        workload, dynamic = self._workload('test_kubernetes_manifests_failure', {
+            'manifests': [
+                {'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': {'name': 'fail'}},
+                {'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': {'name': 'ok'}},
+                {'apiVersion': 'apps/v1', 'kind': 'Deployment', 'metadata': {'name': 'web'}}]})
+
+        with self.assertRaises(KubernetesManifestsWorkloadError) as context:
+            workload.apply()
+        self.assertEqual(list(context.exception.errors), ['ConfigMap/fail'])
+        self.assertEqual(dynamic.calls, [('PATCH', '/default/ConfigMap/ok')])
+        self.assertEqual([manifest['metadata']['name'] for manifest in workload.applied], ['ok'])
+
+    def test_applied_order(self):
+        """ applied objects are kept in manifest order, not completion order """
+        workload, dynamic = self._workload('test_kubernetes_manifests_order', {
+            'namespace': 'test',
+            'path': self.temp_dir.name})
+        dynamic.delays['/test/ConfigMap/one'] = 0.2
+
+        workload.apply()
+        self.assertEqual([path for method, path in dynamic.calls][:2],
+                         ['/test/ConfigMap/two', '/test/ConfigMap/one'])
+        expected = [manifest for level in manifest_levels(workload.manifests())
+                    for manifest in level]
+        self.assertEqual(workload.applied, expected)
+
+
+class KubernetesInformer(unittest.TestCase):
+
+    def _wait_for(self, check):
+        """ wait for the informer thread to catch up """
+        for index in range(100):
+            if check():
+                return
+            time.sleep(0.02)
+        self.fail("informer did not catch up")
+
+    def test_informer(self):
+        """ the informer lists, follows the watch, and relists when gone """
+        events = queue.Queue()
+        calls = []
+        lists = [
+            SimpleNamespace(items=[kube_object('one', labels={'app': 'web'}), kube_object('two', 'other')],
+                            metadata=SimpleNamespace(resource_version='10')),
+            SimpleNamespace(items=[kube_object('three', labels={'app': 'web'})],
+                            metadata=SimpleNamespace(resource_version='20'))]
+
+        def list_function(**kwargs):
+            calls.append(('list', kwargs))
+            return lists.pop(0)
+
+        informer = Informer(list_function=list_function, list_kwargs={'label_selector': 'a=b'},
+                            watch_factory=lambda: FakeWatch(events, calls))
+        informer.start()
+        try:
+            self.assertTrue(informer.wait_synced(5))
+            self.assertEqual(informer.get('one', 'default').metadata.name, 'one')
+            self.assertEqual([obj.metadata.name for obj in informer.list(namespace='other')], ['two'])
+
+            events.put({'type': 'MODIFIED', 'object': kube_object('two', 'other', {'app': 'web'}, '11')})
+            events.put({'type': 'DELETED', 'object': kube_object('one', version='12')})
+            self._wait_for(lambda: informer.resource_version == '12')
+            self.assertIsNone(informer.get('one', 'default'))
+            self.assertEqual([obj.metadata.name for obj in informer.list(labels={'app': 'web'})], ['two'])
+
+            # an ended stream resumes from the last version
+            events.put(None)
+            self._wait_for(lambda: ('watch', '12') in calls[-1:])
+
+            # an expired version relists
+            events.put(Gone())
+            self._wait_for(lambda: informer.resource_version == '20')
+            self.assertEqual([obj.metadata.name for obj in informer.list()], ['three'])
+            self.assertEqual(calls[0], ('list', {'label_selector': 'a=b'}))
+            self.assertEqual(calls[-1], ('watch', '20'))
+        finally:
+            informer.stop()
+
+    def _blocked_informer(self, release: threading.Event, close: bool = True):
+        """ start an informer whose watch is blocked reading a response """
+        responses = []
+
+        def list_function(watch: bool = False, **kwargs):
+            if watch:
+                response = FakeResponse()
+                if not close:
+                    # e.g. a read which closing doesn't interrupt
+                    response.close = lambda: None
+                responses.append(response)
+                return response
+            return SimpleNamespace(items=[], metadata=SimpleNamespace(resource_version='1'))
+
+        informer = Informer(list_function=list_function,
+                            watch_factory=lambda: FakeResponseWatch(release))
+        informer.start()
+        self.assertTrue(informer.wait_synced(5))
+        self._wait_for(lambda: responses)
+        return informer, responses
+
+    def test_stop(self):
+        """ stop closes the watch response, which ends the thread """
+        informer, responses = self._blocked_informer(threading.Event())
+        thread = informer._thread
+
+        started = time.monotonic()
+        informer.stop(timeout=5)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(responses[0].closed.is_set())
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(informer._thread)
+
+    def test_stop_timeout(self):
+        """ a thread which doesn't stop in time is kept, not forgotten """
+        release = threading.Event()
+        informer, responses = self._blocked_informer(release, close=False)
+        thread = informer._thread
+
+        with self.assertLogs('uctt.contrib.kubernetes.informer', level='WARNING'):
+            informer.stop(timeout=0.1)
+        self.assertIs(informer._thread, thread)
+        self.assertTrue(thread.is_alive())
+
+        release.set()
+        informer.stop(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(informer._thread)
+
+
+class KubernetesClient(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(sys.modules, {'kubernetes': fake_kubernetes_sdk()})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _client(self, **kwargs):
+        """ make a kubernetes client plugin against the stand-in SDK """
+        name = 'test_kubernetes_client'
+        if not name in environment_names():
+            new_environment(name=name)
+        return KubernetesClientPlugin(get_environment(name=name), 'kubernetes',
+                                      kube_config_file='/kubeconfig', **kwargs)
+
+    def test_cached_apis(self):
+        """ typed api clients are created once, and share the api client """
+        client = self._client()
+        core = client.get_CoreV1Api_client()
+        self.assertIs(client.get_CoreV1Api_client(), core)
+        self.assertIs(client.get_api('CoreV1Api'), core)
+
+        apps = client.get_AppsV1Api_client()
+        self.assertIs(client.get_AppsV1Api_client(), apps)
+        self.assertEqual(type(apps).__name__, 'AppsV1Api')
+        dynamic = client.get_dynamic_client()
+        self.assertIs(client.get_dynamic_client(), dynamic)
+
+        for api in [core, apps, dynamic]:
+            self.assertIs(api.api_client, client.api_client)
+        self.assertEqual(client.configuration.config_file, '/kubeconfig')
+
+    def test_set_api_client(self):
+        """ an assigned api client replaces the cached typed api clients """
+        for per_thread in [False, True]:
+            client = self._client(per_thread=per_thread)
+            core = client.get_CoreV1Api_client()
+
+            configured = FakeSDKApiClient(FakeConfiguration())
+            client.api_client = configured
+            self.assertIs(client.api_client, configured)
+            self.assertIsNot(client.get_CoreV1Api_client(), core)
+            self.assertIs(client.get_CoreV1Api_client().api_client, configured)
+
+    def test_connection_pool_maxsize(self):
+        """ the pool size is configured before the api client is built """
+        client = self._client(connection_pool_maxsize=32)
+        self.assertEqual(client.api_client.pool_maxsize, 32)
+        self.assertEqual(client.info()['kubernetes']['connection_pool_maxsize'], 32)
+
+        default = self._client()
+        self.assertEqual(default.api_client.pool_maxsize, 4)
+        self.assertEqual(default.connection_pool_maxsize, 4)
+
+    def test_per_thread(self):
+        """ per_thread clients are separate per thread, and cached in a thread """
+        client = self._client(per_thread=True, connection_pool_maxsize=2)
+        core = client.get_CoreV1Api_client()
+        self.assertIs(client.get_CoreV1Api_client(), core)
+        self.assertIs(core.api_client, client.api_client)
+
+        other = {}
+
+        def use_client():
+            other['core'] = client.get_CoreV1Api_client()
+            other['again'] = client.get_CoreV1Api_client()
+            other['api_client'] = client.api_client
+
+        thread = threading.Thread(target=use_client)
+        thread.start()
+        thread.join()
+
+        self.assertIs(other['core'], other['again'])
+        self.assertIs(other['core'].api_client, other['api_client'])
+        self.assertIsNot(other['core'], core)
+        self.assertIsNot(other['api_client'], client.api_client)
+        self.assertEqual(other['api_client'].pool_maxsize, 2)
+
+
+class KubernetesDeploymentWorkload(unittest.TestCase):
+
+    def setUp(self):
+        self.events = queue.Queue()
+        self.calls = []
+        patcher = mock.patch.dict(sys.modules, {'kubernetes': fake_kubernetes_sdk(
+            watch_factory=lambda: FakeWatch(self.events, self.calls))})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _workload(self, reads: list):
+        """ make a deployment workload using a stand-in AppsV1Api """
+        name = 'test_kubernetes_deployment'
+        if not name in environment_names():
+            new_environment(name=name)
+            get_environment(name=name).config.add_source(PLUGIN_ID_SOURCE_DICT, priority=80).set_data({
+                'kubernetes': {'workload': {'deployment': {
+                    'namespace': 'default',
+                    'body': {'metadata': {'name': 'web'}}}}}
+            })
+
+        fixtures = Fixtures()
+        fixtures.new_fixture(plugin=FakeAppsClient(FakeAppsApi(reads, self.calls)), type=Type.CLIENT,
+                             plugin_id=UCTT_PLUGIN_ID_KUBERNETES_CLIENT, instance_id='kubernetes', priority=50)
+
+        workload = KubernetesDeploymentWorkloadPlugin(get_environment(name=name), name)
+        workload.set_fixtures(fixtures)
+        return workload
+
+    def test_deployment_ready(self):
+        """ ready needs the latest generation observed, and all replicas updated and available """
+        self.assertTrue(deployment_ready(kube_deployment('1', available=2, updated=2)))
+        self.assertFalse(deployment_ready(kube_deployment('1', available=2, updated=1)))
+        self.assertFalse(deployment_ready(kube_deployment('1', available=1, updated=2)))
+        # replicas from an older spec
+        self.assertFalse(deployment_ready(kube_deployment(
+            '1', generation=2, observed=1, available=2, updated=2)))
+
+        no_status = kube_deployment('1')
+        no_status.status = None
+        self.assertFalse(deployment_ready(no_status))
+        default_replicas = kube_deployment('1', available=1, updated=1, replicas=None)
+        self.assertTrue(deployment_ready(default_replicas))
+
+    def test_ready_read(self):
+        """ an already ready deployment doesn't open a watch """
+        ready = kube_deployment('1', available=2, updated=2)
+        self.assertIs(self._workload([ready]).wait_ready(), ready)
+        self.assertEqual(self.calls, [('read', 'default/web')])
+
+    def test_resume(self):
+        """ an ended watch resumes from the last seen resourceVersion """
+        workload = self._workload([kube_deployment('1')])
+        ready = kube_deployment('4', generation=2, observed=2, available=2, updated=2)
+        self.events.put({'type': 'MODIFIED', 'object': kube_deployment('2', available=1, updated=2)})
+        self.events.put(None)
+        # all replicas, but not for the latest generation
+        self.events.put({'type': 'MODIFIED', 'object': kube_deployment(
+            '3', generation=2, observed=1, available=2, updated=2)})
+        self.events.put({'type': 'MODIFIED', 'object': ready})
+
+        self.assertIs(workload.wait_ready(timeout=10), ready)
+        self.assertEqual(self.calls, [
+            ('read', 'default/web'), ('watch', '1'), ('watch', '2')])
+
+    def test_gone(self):
+        """ an expired resourceVersion re-reads the deployment """
+        workload = self._workload([kube_deployment('1'), kube_deployment('5')])
+        ready = kube_deployment('6', available=2, updated=2)
+        self.events.put(Gone())
+        self.events.put({'type': 'MODIFIED', 'object': ready})
+
+        self.assertIs(workload.wait_ready(timeout=10), ready)
+        self.assertEqual(self.calls, [
+            ('read', 'default/web'), ('watch', '1'), ('read', 'default/web'), ('watch', '5')])
+
+    def test_other_api_error(self):
+        """ watch errors other than an expired version are raised """
+        workload = self._workload([kube_deployment('1')])
+        self.events.put(NotFound())
+        with self.assertRaises(NotFound):
+            workload.wait_ready(timeout=10)
+
+    def test_deleted(self):
+        """ a deleted deployment stops the wait """
+        workload = self._workload([kube_deployment('1')])
+        self.events.put({'type': 'DELETED', 'object': kube_deployment('2')})
+        with self.assertRaises(RuntimeError):
+            workload.wait_ready(timeout=10)
+
+    def test_timeout(self):
+        """ a deployment which never becomes ready times out """
+        workload = self._workload([kube_deployment('1')])
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            workload.wait_ready(timeout=1)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(self.calls, [('read', 'default/web'), ('watch', '1')])
@@ -0,0 +1,101 @@
+"""
+
+Registry manifest testing.
+
+Test the persistent registry manifest using a temporary manifest file, so that
+we don't interact with the user registry cache.
+
+"""
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from uctt import new_environment, environment_names, get_environment
+from uctt.plugin import Type
+from uctt.registry import RegistryManifest, DeferredFactory, registry_cache_path, enable_registry_cache, UCTT_REGISTRY_CACHE_PATH_ENV, UCTT_REGISTRY_CACHE_DEFAULT_PATH
+
+import uctt.contrib.dummy
+from uctt.contrib.dummy.client import DummyClientPlugin
+
+logger = logging.getLogger("test_registry")
+logger.setLevel(logging.INFO)
+
+""" TESTS """
+
+
+class RegistryManifestCache(unittest.TestCase):
+
+    def setUp(self):
+        """ give each test a temporary manifest path """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'registry.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_manifest_roundtrip(self):
+        """ a recorded bootstrap is known to be registration only when reloaded """
+        manifest = RegistryManifest(self.path)
+        self.assertFalse(manifest.load())
+
+        manifest.record_bootstrap(
+            'uctt_dummy',
+            'uctt.contrib.dummy:bootstrap',
+            uctt.contrib.dummy.bootstrap)
+        manifest.save()
+
+        reloaded = RegistryManifest(self.path)
+        self.assertTrue(reloaded.load())
+        self.assertTrue(reloaded.is_registration_only('uctt_dummy'))
+        self.assertEqual(
+            reloaded.data['factories'][Type.CLIENT.value]['dummy'], 'uctt.contrib.dummy')
+
+    def test_manifest_stale_file(self):
+        """ changing a recorded file invalidates the manifest """
+        watched = os.path.join(self.temp_dir.name, 'watched.py')
+        with open(watched, 'w') as watched_file:
+            watched_file.write('')
+
+        manifest = RegistryManifest(self.path)
+        manifest.data['files'][watched] = os.stat(watched).st_mtime_ns
+        manifest.changed = True
+        manifest.save()
+        self.assertTrue(RegistryManifest(self.path).load())
+
+        os.utime(watched, ns=(0, 0))
+        self.assertFalse(RegistryManifest(self.path).load())
+
+    def test_deferred_factory(self):
+        """ a deferred factory runs the real factory from its module """
+        if not 'test_registry' in environment_names():
+            new_environment(
+                name='test_registry',
+                additional_uctt_bootstraps=['uctt_dummy'])
+        environment = get_environment(name='test_registry')
+
+        factory = DeferredFactory(
+            Type.CLIENT.value, 'dummy', 'uctt.contrib.dummy')
+        self.assertIsInstance(factory(environment, 'deferred'),
+                              DummyClientPlugin)
+
+        with self.assertRaises(NotImplementedError):
+            DeferredFactory(Type.CLIENT.value, 'does.not.exist',
+                            'uctt.contrib.dummy')(environment, 'deferred')
+
+    def test_cache_opt_in(self):
+        """ the default manifest path is only used once enabled """
+        with mock.patch.dict(os.environ):
+            os.environ.pop(UCTT_REGISTRY_CACHE_PATH_ENV, None)
+            self.assertEqual(registry_cache_path(), '')
+            try:
+                enable_registry_cache()
+                self.assertEqual(registry_cache_path(), os.path.expanduser(
+                    UCTT_REGISTRY_CACHE_DEFAULT_PATH))
+
+                # the ENV variable always wins
+                os.environ[UCTT_REGISTRY_CACHE_PATH_ENV] = ''
+                self.assertEqual(registry_cache_path(), '')
+            finally:
+                enable_registry_cache(False)
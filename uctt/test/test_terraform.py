@@ -0,0 +1,291 @@
+"""
+
+Terraform client testing.
+
+We don't want to depend on a terraform binary, so here we test the terraform
+client against a stand-in executable, which records its arguments and prints
+some output for each command.
+
+"""
+import asyncio
+import json
+import logging
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from uctt.contrib.terraform.provisioner import AsyncTerraformClient, TerraformClient
+
+logger = logging.getLogger("test_terraform")
+logger.setLevel(logging.INFO)
+
+FAKE_TERRAFORM = """#!{python}
+import json
+import os
+import sys
+import time
+
+with open(os.path.join(os.path.dirname(__file__), 'calls.log'), 'a') as log:
+    log.write(' '.join(sys.argv[1:]) + '\\n')
+
+command = sys.argv[1]
+if command == 'init':
+    time.sleep(0.3)
+    cache = os.environ.get('TF_PLUGIN_CACHE_DIR')
+    if cache and os.path.exists(os.path.join(cache, 'null')):
+        print('- Using hashicorp/null v3.1.0 from the shared cache directory')
+    else:
+        print('- Installing hashicorp/null v3.1.0...')
+        if cache:
+            open(os.path.join(cache, 'null'), 'w').close()
+for arg in sys.argv[2:]:
+    if arg.startswith('-out='):
+        open(arg[len('-out='):], 'w').close()
+if command == 'output':
+    print(json.dumps({{'name': {{'sensitive': False, 'type': 'string', 'value': 'value'}}}}, indent=2))
+elif command == 'hang':
+    with open(os.path.join(os.path.dirname(__file__), 'hang.pid'), 'w') as pid_file:
+        pid_file.write(str(os.getpid()))
+    for index in range(10):
+        print('hang {{}}'.format(index), flush=True)
+    time.sleep(30)
+elif command == 'fail':
+    print('something went wrong', file=sys.stderr)
+    sys.exit(3)
+else:
+    for index in range(5):
+        print('{{}} {{}}'.format(command, index), flush=True)
+    print('{{}} done'.format(command), file=sys.stderr)
+"""
+""" python stand-in for the terraform binary """
+
+""" TESTS """
+
+
+class TerraformClientTest(unittest.TestCase):
+
+    def setUp(self):
+        """ create a plan dir with the stand-in terraform executable """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+
+        # keep the stand-in out of the plan files, so that its call log
+        # doesn't change the plan folder contents
+        self.bin_path = os.path.join(self.path, '.bin')
+        os.makedirs(self.bin_path)
+        self.terraform_bin = os.path.join(self.bin_path, 'terraform')
+        with open(self.terraform_bin, 'w') as bin_file:
+            bin_file.write(FAKE_TERRAFORM.format(python=sys.executable))
+        os.chmod(self.terraform_bin, stat.S_IRWXU)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _client(self, cls=TerraformClient, **kwargs):
+        """ make a client using the stand-in terraform """
+        client = cls(
+            working_dir=self.path,
+            state_path=os.path.join(self.path, 'state', 'terraform.tfstate'),
+            vars_path=os.path.join(self.path, 'vars.tfvars.json'),
+            variables={'one': 1},
+            **kwargs)
+        client.terraform_bin = self.terraform_bin
+        return client
+
+    def _calls(self):
+        """ return the argument lists the stand-in terraform was run with """
+        with open(os.path.join(self.bin_path, 'calls.log')) as log:
+            return [line.split() for line in log.read().splitlines()]
+
+    def test_sync_wrappers(self):
+        """ the blocking client streams output to its handler """
+        lines = []
+        client = self._client(
+            output_handler=lambda stream, line: lines.append((stream, line)))
+
+        client.apply()
+        self.assertEqual([line for stream, line in lines if stream == 'stdout'],
+                         ['apply {}'.format(index) for index in range(5)])
+        self.assertIn(('stderr', 'apply done'), lines)
+        self.assertEqual(self._calls()[0][:2], ['apply', '-auto-approve'])
+
+    def test_sync_wrappers_in_loop(self):
+        """ the blocking client also works from inside a running event loop """
+        client = self._client()
+
+        async def from_loop():
+            client.apply()
+            return client.output()
+
+        self.assertEqual(asyncio.run(from_loop()), {})
+        self.assertEqual(self._calls()[0][:2], ['apply', '-auto-approve'])
+
+    def test_async_stream(self):
+        """ the async client can be iterated and reports failures """
+        client = self._client(cls=AsyncTerraformClient)
+
+        async def consume():
+            return [item async for item in client.stream(['plan'], buffer=1)]
+
+        lines = asyncio.run(consume())
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[0], ('stdout', 'plan 0'))
+
+        async def fail():
+            async for item in client.stream(['fail'], with_vars=False):
+                pass
+
+        with self.assertRaises(subprocess.CalledProcessError) as context:
+            asyncio.run(fail())
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertIn('something went wrong', context.exception.stderr)
+
+    def test_async_stream_early_exit(self):
+        """ a consumer which stops early, with the buffer full, kills terraform """
+        client = self._client(cls=AsyncTerraformClient)
+
+        async def first_line():
+            lines = client.stream(['hang'], with_vars=False, buffer=2)
+            async for item in lines:
+                break
+            # let terraform fill the buffer
+            await asyncio.sleep(0.5)
+            closing = asyncio.ensure_future(lines.aclose())
+            done, pending = await asyncio.wait([closing], timeout=5)
+            self.assertIn(closing, done, "stream did not close")
+            return item
+
+        self.assertEqual(asyncio.run(first_line()), ('stdout', 'hang 0'))
+        with open(os.path.join(self.bin_path, 'hang.pid')) as pid_file:
+            pid = int(pid_file.read())
+        with self.assertRaises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_state_outputs(self):
+        """ outputs come from the local state file, cached on its mtime/size """
+        client = self._client()
+        self.assertEqual(client.output(), {})
+
+        state_path = client.state_path
+        os.makedirs(os.path.dirname(state_path))
+        with open(state_path, 'w') as state_file:
+            json.dump({'version': 4, 'serial': 1, 'outputs': {
+                'name': {'value': 'from state', 'type': 'string'}}}, state_file)
+
+        self.assertEqual(client.output(name='name'), 'from state')
+        self.assertEqual(client.output()['name']['sensitive'], False)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.bin_path, 'calls.log')))
+
+        with open(state_path, 'w') as state_file:
+            json.dump({'version': 4, 'serial': 2, 'outputs': {
+                'name': {'value': 'changed state', 'type': 'string'}}}, state_file)
+        self.assertEqual(client.output(name='name'), 'changed state')
+
+        # unknown state formats fall back to running terraform
+        with open(state_path, 'w') as state_file:
+            json.dump({'version': 99}, state_file)
+        self.assertEqual(client.output()['name']['value'], 'value')
+        self.assertEqual(self._calls()[0][:2], ['output', '-json'])
+
+    def test_vars_file(self):
+        """ the vars file is only written when the vars change """
+        client = self._client()
+        client.apply()
+        vars_stat = os.stat(client.vars_path)
+        vars_hash = client.vars_hash()
+
+        with open(client.vars_path) as vars_file:
+            self.assertEqual(json.load(vars_file), {'one': 1})
+
+        client.destroy()
+        self.assertEqual(os.stat(client.vars_path).st_mtime_ns,
+                         vars_stat.st_mtime_ns)
+        # a new client doesn't rewrite a file with matching contents
+        self._client().apply()
+        self.assertEqual(os.stat(client.vars_path).st_mtime_ns,
+                         vars_stat.st_mtime_ns)
+
+        client.vars['two'] = 2
+        self.assertNotEqual(client.vars_hash(), vars_hash)
+        client.apply()
+        with open(client.vars_path) as vars_file:
+            self.assertEqual(json.load(vars_file), {'one': 1, 'two': 2})
+
+    def test_vars_file_mode(self):
+        """ a new vars file follows the umask, and a rewrite keeps the file mode """
+        client = self._client()
+        umask = os.umask(0o027)
+        try:
+            client.apply()
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(client.vars_path).st_mode), 0o640)
+
+        os.chmod(client.vars_path, 0o600)
+        client.vars['secret'] = 'value'
+        client.apply()
+        self.assertEqual(stat.S_IMODE(os.stat(client.vars_path).st_mode), 0o600)
+
+    def test_init_lock(self):
+        """ parallel jobs sharing a plan run init once """
+        with open(os.path.join(self.path, 'main.tf'), 'w') as plan_file:
+            plan_file.write('')
+
+        threads = [threading.Thread(target=self._client().init)
+                   for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._calls(), [['init']])
+        self.assertTrue(self._client().is_initialized())
+
+        # changing the plan requires a new init
+        with open(os.path.join(self.path, 'other.tf'), 'w') as plan_file:
+            plan_file.write('')
+        client = self._client()
+        self.assertFalse(client.is_initialized())
+        client.init()
+        self.assertEqual(self._calls(), [['init'], ['init']])
+
+    def test_plugin_cache(self):
+        """ plans share the plugin cache and report hits and misses """
+        cache = os.path.join(self.path, 'plugin-cache')
+
+        first = self._client(plugin_cache_dir=cache)
+        first.init()
+        self.assertEqual(first.plugin_cache_stats(), {
+            'path': cache, 'hits': 0, 'misses': 1, 'reused': 0})
+
+        first.init(force=True)
+        self.assertEqual(first.plugin_cache_stats()['hits'], 1)
+        # a new client reports the stats from the plan init marker
+        self.assertEqual(self._client(
+            plugin_cache_dir=cache).plugin_cache_stats()['hits'], 1)
+        self.assertEqual(self._client().plugin_cache_stats(), {'path': ''})
+
+    def test_saved_plan(self):
+        """ apply uses the plan saved by plan if it is still valid """
+        with open(os.path.join(self.path, 'main.tf'), 'w') as plan_file:
+            plan_file.write('')
+        client = self._client()
+
+        client.plan()
+        self.assertTrue(client.has_saved_plan())
+        client.apply()
+        self.assertEqual(self._calls()[1], [
+            'apply', '-auto-approve', '-state={}'.format(client.state_path), client.plan_path])
+        self.assertFalse(client.has_saved_plan())
+
+        # changing the vars invalidates the saved plan
+        client.plan()
+        client.vars['two'] = 2
+        self.assertFalse(client.has_saved_plan())
+        client.apply()
+        self.assertIn('-var-file={}'.format(client.vars_path), self._calls()[3])
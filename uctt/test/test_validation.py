@@ -0,0 +1,87 @@
+"""
+
+Validation testing.
+
+Test the cached jsonschema validator which the uctt_validation bootstrap adds
+to environment config objects, and the batch validation of fixture configs.
+
+"""
+import logging
+import unittest
+
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+from configerus.plugin import Type as ConfigerusType
+from configerus.validator import ValidationError
+
+from uctt import new_environment, environment_names, get_environment
+from uctt.environment import Environment
+from uctt.plugin import Type
+from uctt.validation import CachedJsonSchemaValidatorPlugin
+from uctt.workload import UCTT_WORKLOAD_CONFIG_WORKLOADS_LABEL
+
+from uctt.contrib.dummy import UCTT_PLUGIN_ID_DUMMY
+
+logger = logging.getLogger("test_validation")
+logger.setLevel(logging.INFO)
+
+FIXTURE_TARGET = 'jsonschema:fixture'
+""" validation target for the core fixture schema """
+
+""" TESTS """
+
+
+class CachedValidation(unittest.TestCase):
+
+    def _environment(self, name: str) -> Environment:
+        """ Create an environment object with the dummy plugins """
+        if not name in environment_names():
+            new_environment(
+                name=name,
+                additional_uctt_bootstraps=['uctt_dummy'])
+
+        return get_environment(name=name)
+
+    def _validator(self, environment: Environment) -> CachedJsonSchemaValidatorPlugin:
+        """ find the jsonschema validator plugin on the environment config """
+        validators = environment.config.plugins.get_plugins(
+            type=ConfigerusType.VALIDATOR, plugin_id='jsonschema')
+        self.assertEqual(len(validators), 1)
+        return validators[0]
+
+    def test_compiled_cache(self):
+        """ compiled validators are reused until the schema config reloads """
+        environment = self._environment('test_validation_cache')
+        validator = self._validator(environment)
+        self.assertIsInstance(validator, CachedJsonSchemaValidatorPlugin)
+
+        environment.config.validate(
+            {'plugin_id': 'one'}, validate_target=FIXTURE_TARGET)
+        compiled = validator.compiled_validator(FIXTURE_TARGET)
+        self.assertIs(validator.compiled_validator(FIXTURE_TARGET), compiled)
+
+        with self.assertRaises(ValidationError):
+            environment.config.validate(
+                {'priority': 50}, validate_target=FIXTURE_TARGET)
+
+        # adding a config source reloads config, which recompiles
+        environment.config.add_source(PLUGIN_ID_SOURCE_DICT).set_data({})
+        self.assertIsNot(validator.compiled_validator(FIXTURE_TARGET), compiled)
+
+    def test_batch_fixture_validation(self):
+        """ fixture configs are validated together, reporting every failure """
+        environment = self._environment('test_validation_batch')
+
+        environment.config.add_source(PLUGIN_ID_SOURCE_DICT, priority=80).set_data({
+            UCTT_WORKLOAD_CONFIG_WORKLOADS_LABEL: {
+                'good': {'plugin_id': UCTT_PLUGIN_ID_DUMMY},
+                'bad1': {'priority': 50},
+                'bad2': {'plugin_id': UCTT_PLUGIN_ID_DUMMY, 'priority': 500}
+            }
+        })
+
+        with self.assertRaises(ValidationError) as context:
+            environment.add_fixtures_from_config(
+                type=Type.WORKLOAD, label=UCTT_WORKLOAD_CONFIG_WORKLOADS_LABEL)
+        self.assertIn('[bad1]', str(context.exception))
+        self.assertIn('[bad2]', str(context.exception))
+        self.assertEqual(environment.fixtures.count(type=Type.WORKLOAD), 0)
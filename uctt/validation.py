@@ -9,19 +9,179 @@ Validation patters are added via UCTT bootstrapping, which will load the
 bootstrapping function in this module.  The bootstrapping function will add
 config for validation of core components.
 
+The bootstrapping function also swaps the configerus jsonschema validator for
+one which keeps the compiled jsonschema validators, as the configerus plugin
+fetches, checks and compiles the schema for every validation, which dominates
+the time taken to build large fixture sets.
+
 """
+import logging
+from typing import Any, Dict
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
+from configerus.config import Config
+from configerus.plugin import Type as ConfigerusType
+from configerus.validator import ValidationError
 from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
-from configerus.contrib.jsonschema.validate import PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL
+from configerus.contrib.jsonschema import PLUGIN_ID_VALIDATE_JSONSCHEMA
+from configerus.contrib.jsonschema.validate import PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL, JsonSchemaValidatorPlugin
 
 from .environment import Environment
 
 from .plugin import UCTT_PLUGIN_CONFIG_KEY_PLUGIN, UCTT_PLUGIN_VALIDATION_JSONSCHEMA
 from .fixtures import UCTT_FIXTURES_CONFIG_FIXTURE_KEY, UCTT_FIXTURE_VALIDATION_JSONSCHEMA
 
+logger = logging.getLogger('uctt.validation')
+
 UCTT_VALIDATION_CONFIG_SOURCE_INSTANCE_ID = 'uctt_core_validation'
 
 
+class CachedJsonSchemaValidatorPlugin(JsonSchemaValidatorPlugin):
+    """ configerus jsonschema validator which keeps compiled schema validators
+
+    Validation targets are interpreted in the same way as the configerus
+    jsonschema validator, but the compiled validator for a config target is
+    kept and reused until the jsonschema config label is reloaded, which
+    configerus does whenever a config source is added.
+
+    """
+
+    def __init__(self, config: Config, instance_id: str):
+        """ """
+        super().__init__(config, instance_id)
+        self.compiled = {}
+        """ (schema Loaded, compiled validator) tuples keyed by config target """
+
+    def validate(self, validate_target: Any, data):
+        """ Validate a structure using a compiled jsonschema validator
+
+        @see configerus.contrib.jsonschema.validate.JsonSchemaValidatorPlugin
+
+        Raises:
+        -------
+
+        If a jsonchema schema was identified in the validate target, then a
+        jsonschema validation error will be raised if the data is not valid.
+
+        """
+        validator = self.compiled_validator(validate_target)
+        if validator is None:
+            return
+
+        error = best_match(validator.iter_errors(data))
+        if error is not None:
+            raise error
+
+    def validate_all(self, validate_target: Any, data_list: Dict[str, Any]):
+        """ Validate every item in a Dict of structures in one pass
+
+        The schema is resolved once for the whole Dict, and every item is
+        validated, so that all of the invalid items are reported together.
+
+        Parameters:
+        -----------
+
+        validate_target (str|dict[str:dict]) : validation schema indicator
+            @see validate
+
+        data_list (Dict[str, Any]) : items to validate, keyed by an id used to
+            report failures
+
+        Raises:
+        -------
+
+        A configerus ValidationError listing every item which failed.
+
+        """
+        validator = self.compiled_validator(validate_target)
+        if validator is None:
+            return
+
+        errors = {}
+        for key, data in data_list.items():
+            error = best_match(validator.iter_errors(data))
+            if error is not None:
+                errors[key] = error
+
+        if errors:
+            raise ValidationError("Config validation failed: {}".format("; ".join(
+                "[{}] {}".format(key, error.message) for key, error in errors.items())))
+
+    def compiled_validator(self, validate_target: Any):
+        """ Return a compiled jsonschema validator for a validate target
+
+        Returns:
+        --------
+
+        A jsonschema validator object, or None if the target is not a jsonschema
+        target.
+
+        """
+        if isinstance(validate_target, str):
+            (method, validate_key) = validate_target.split(':')
+
+            if not method == PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL:
+                return None
+
+            try:
+                schema_config = self.config.load(
+                    PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL)
+                cached = self.compiled.get(validate_target)
+                if cached is not None and cached[0] is schema_config:
+                    return cached[1]
+
+                schema = schema_config.get(
+                    validate_key, exception_if_missing=True)
+
+            except Exception as e:
+                raise NotImplementedError("Could not access jsonschema validation schema from config target '{}:{}'".format(
+                    PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL, validate_key)) from e
+
+            validator = _compile(schema)
+            self.compiled[validate_target] = (schema_config, validator)
+            return validator
+
+        elif isinstance(validate_target, dict):
+            if not PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL in validate_target:
+                return None
+
+            schema = validate_target[PLUGIN_ID_VALIDATE_JSONSCHEMA_SCHEMA_CONFIG_LABEL]
+
+            if not isinstance(schema, dict):
+                raise ValueError(
+                    "JSONSCHEMA scheme was expected to be a dict: {}".format(schema))
+
+            return _compile(schema)
+
+        # Could not interpret validate target
+        return None
+
+
+def _compile(schema: Dict[str, Any]):
+    """ check a jsonschema schema and return a validator for it """
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def use_cached_jsonschema_validator(config: Config):
+    """ Replace configerus jsonschema validators with the caching validator
+
+    The plugin instances keep their instance_id and priority, only the plugin
+    object is swapped.
+
+    """
+    for instance in config.plugins.get_instances(
+            type=ConfigerusType.VALIDATOR, plugin_id=PLUGIN_ID_VALIDATE_JSONSCHEMA):
+        if not isinstance(instance.plugin, CachedJsonSchemaValidatorPlugin):
+            logger.debug(
+                "Using cached jsonschema validator for %s", instance.instance_id)
+            instance.plugin = CachedJsonSchemaValidatorPlugin(
+                config, instance.instance_id)
+
+
 def bootstrap(env: Environment):
     """ Add UTCC core validation definitions to an environment
 
@@ -52,3 +212,5 @@ def bootstrap(env: Environment):
             UCTT_FIXTURES_CONFIG_FIXTURE_KEY: UCTT_FIXTURE_VALIDATION_JSONSCHEMA
         }
     })
+
+    use_cached_jsonschema_validator(env.config)
@@ -7,6 +7,7 @@ UCTT Cli package
 import logging
 
 from uctt.plugin import Type, Factory
+from uctt.registry import registration_only
 from uctt.environment import Environment
 
 from .info import InfoCliPlugin
@@ -87,6 +88,7 @@ def uctt_plugin_factory_provisioner_config(
 """ SetupTools EntryPoint BootStrapping """
 
 
+@registration_only
 def bootstrap(environment: Environment):
     """ UCTT Bootstrapper - don't actually do anything """
     pass
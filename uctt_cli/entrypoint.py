@@ -10,6 +10,8 @@ import logging
 
 import fire
 
+from uctt.registry import enable_registry_cache
+
 from .base import Base
 
 logger = logging.getLogger('uctt.cli.entrypoint')
@@ -17,6 +19,8 @@ logger = logging.getLogger('uctt.cli.entrypoint')
 
 def main():
     """ Main entrypoint """
+    # the cli is run often, so keep the registry manifest between runs
+    enable_registry_cache()
     fire.Fire(Base)
 
 